@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: flat vs sharded output directory layout.
+
+Writes the same small PNG N times into a flat folder and into a ShardedLayout
+tree, then measures a full os.scandir listing and random os.stat lookups of
+each. Run it on the filesystem you generate into; results depend heavily on
+the filesystem (ext4, XFS, tmpfs, ...):
+
+    python benchmarks/bench_output_layout.py --files 1000000 --dir /data/bench
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator, ShardedLayout
+
+
+def write_files(root, count, data, layout=None):
+    """Write count files under root and return their paths."""
+    paths = []
+    for index in range(count):
+        name = f"qr_{index:08d}.png"
+        if layout is None:
+            path = os.path.join(root, name)
+        else:
+            path = os.path.join(root, layout.shard(name, index), name)
+        with open(path, "wb") as file:
+            file.write(data)
+        paths.append(path)
+    return paths
+
+
+def scan(root):
+    """Count every file below root with os.scandir."""
+    total = 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    total += 1
+    return total
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def run_layout(name, root, count, data, lookups, layout):
+    os.makedirs(root)
+    prepare_time = 0.0
+    if layout is not None:
+        prepare_time, _ = timed(layout.prepare, root)
+    write_time, paths = timed(write_files, root, count, data, layout)
+    scan_time, found = timed(scan, root)
+    assert found == count, (found, count)
+    sample = random.Random(0).sample(paths, min(lookups, count))
+    stat_time, _ = timed(lambda: [os.stat(path) for path in sample])
+    print(f"{name:<10} {prepare_time:>9.2f} {write_time:>9.2f} {count / write_time:>11,.0f} "
+          f"{scan_time:>9.2f} {stat_time / len(sample) * 1e6:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flat vs sharded output layout benchmark")
+    parser.add_argument("--files", type=int, default=1_000_000, help="Files per layout")
+    parser.add_argument("--lookups", type=int, default=10_000, help="Random os.stat calls")
+    parser.add_argument("--dir", default=None, help="Parent directory for the test trees")
+    parser.add_argument("--levels", type=int, default=2, help="Shard levels")
+    parser.add_argument("--width", type=int, default=2, help="Hex digits per level")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated trees")
+    args = parser.parse_args()
+
+    data = QRCodeGenerator(output_folder=None).generate_qr_bytes("https://example.com")
+    workdir = tempfile.mkdtemp(prefix="qr_layout_", dir=args.dir)
+    print(f"{args.files:,} files of {len(data)} bytes in {workdir}")
+    print(f"{'layout':<10} {'mkdirs s':>9} {'write s':>9} {'files/s':>11} "
+          f"{'scandir s':>9} {'stat us':>11}")
+    try:
+        run_layout("flat", os.path.join(workdir, "flat"), args.files, data, args.lookups, None)
+        layout = ShardedLayout("sequence", args.levels, args.width)
+        run_layout("sharded", os.path.join(workdir, "sharded"), args.files, data,
+                   args.lookups, layout)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
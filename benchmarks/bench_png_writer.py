@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Pillow PNG encoding vs the package's direct 1-bit PNG writer.
+
+Encodes a set of payloads once, then times only the PNG step for Pillow
+(rasterize + Image.save) and for render_png at several zlib levels and
+scanline filters, reporting the time and the average file size per image:
+
+    python benchmarks/bench_png_writer.py --count 500 --box-size 10
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator
+from qrcodegenpy_shankonduru.png import render_png
+from qrcodegenpy_shankonduru.raster import rasterize
+
+
+def pillow_png(matrix, box_size, border, compress_level):
+    buffer = io.BytesIO()
+    rasterize(matrix, box_size, border).save(buffer, format="PNG",
+                                             compress_level=compress_level)
+    return buffer.getvalue()
+
+
+def measure(encode, matrices):
+    """Return (microseconds per image, average bytes per image)."""
+    start = time.perf_counter()
+    total = sum(len(encode(matrix)) for matrix in matrices)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(matrices) * 1e6, total / len(matrices)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Pillow and the 1-bit PNG writer.")
+    parser.add_argument("--count", type=int, default=500, help="images per run (default: 500)")
+    parser.add_argument("--box-size", type=int, default=10, help="pixels per module (default: 10)")
+    parser.add_argument("--border", type=int, default=4, help="quiet zone modules (default: 4)")
+    parser.add_argument("--length", type=int, default=60,
+                        help="payload length in characters (default: 60)")
+    args = parser.parse_args()
+
+    generator = QRCodeGenerator(output_folder=None)
+    qr = generator._new_qr()
+    filler = "x" * max(args.length - 30, 0)
+    matrices = [generator._encode(qr, f"https://example.com/{index:08d}/{filler}")
+                for index in range(args.count)]
+    print(f"{args.count} images of {matrices[0].size} modules, box size {args.box_size}")
+    print(f"{'writer':<32}{'us/image':>10}{'bytes':>10}")
+
+    runs = [(f"pillow level {level}",
+             lambda matrix, level=level: pillow_png(matrix, args.box_size, args.border, level))
+            for level in (1, 6, 9)]
+    for level in (1, 6, 9):
+        for filter_type in ("auto", "none", "smallest"):
+            runs.append((f"builtin level {level} {filter_type}",
+                         lambda matrix, level=level, filter_type=filter_type: render_png(
+                             matrix, args.box_size, args.border,
+                             compress_level=level, filter_type=filter_type)))
+
+    for name, encode in runs:
+        microseconds, size = measure(encode, matrices)
+        print(f"{name:<32}{microseconds:>10.0f}{size:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
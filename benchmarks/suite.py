@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for QRCodeGenerator.
+
+Times every stage of producing a QR code for payloads from a short URL up to
+near-capacity text, plus end-to-end batch throughput:
+
+- encode: segmentation, version selection, Reed-Solomon and mask selection
+- mask: placement and mask selection only, from precomputed codewords
+- rasterize: module matrix to 1-bit bitmap
+- png_pillow / png_builtin: bitmap to PNG bytes with each writer
+- encode_batch: the grouped encoder of generate_qr_codes(), per code
+- batch / loop: generate_qr_codes() versus generate_qr_code() in a loop, both
+  writing the same PNG files to a temporary folder
+- startup: a fresh interpreter running qrgen --version, i.e. the import time
+  of the package and its command line
+- matrix_memory: a batch of version 20 matrices kept at once, as packed
+  ModuleMatrix objects, as qrcode's nested lists and as NumPy bool arrays;
+  the peak memory is what the whole batch holds
+
+Each benchmark reports operations per second, p50/p99 latency and the peak
+traced memory of one operation, and the speed-up of the batch paths over
+their one-at-a-time counterparts is printed after the table. Results are written as JSON and compared with
+a saved baseline; a benchmark whose throughput drops (or whose peak memory
+grows) by more than the threshold is a regression. Usually run through:
+
+    python run_tests.py --bench [--save-baseline] [--threshold 0.2]
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.20
+
+# Payloads from a short URL to text close to the capacity of version 40-L
+PAYLOADS = {
+    "short_url": "https://example.com/p/42",
+    "long_url": "https://shop.example.com/catalog/item?sku=ABC-12345&ref=newsletter"
+                "&utm_source=mail&utm_medium=email&utm_campaign=spring&session=" + "f" * 64,
+    "text_1k": ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 18)[:1000],
+    "near_capacity": ("The quick brown fox jumps over the lazy dog; " * 66)[:2900],
+}
+
+# Batch throughput is measured on this many distinct short payloads
+BATCH_SIZE = 200
+
+# Run by the startup benchmark in a fresh interpreter
+STARTUP_SCRIPT = "from qrcodegenpy_shankonduru.cli import cli; cli(['--version'])"
+
+# Version of the matrices whose memory is measured (97x97 modules)
+MATRIX_VERSION = 20
+
+# Batch benchmark -> the one-at-a-time benchmark it is compared with
+SPEEDUPS = {
+    "encode_batch/short_url": "encode/short_url",
+    "batch/short_url": "loop/short_url",
+}
+
+
+def _percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def measure(operation, iterations, warmup=3, per_call=1):
+    """
+    Time operation and return its statistics.
+
+    Args:
+        operation (callable): The work to time, called without arguments.
+        iterations (int): Timed calls.
+        warmup (int, optional): Untimed calls first. Defaults to 3.
+        per_call (int, optional): Operations done by one call, e.g. a batch size.
+
+    Returns:
+        dict: ops_per_sec, p50_ms, p99_ms (per operation), peak_kib and iterations.
+    """
+    for _ in range(warmup):
+        operation()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) / per_call)
+    samples.sort()
+
+    # Peak memory is traced on a separate call, since tracing slows everything down
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(1 / statistics.fmean(samples), 2),
+        "p50_ms": round(_percentile(samples, 0.50) * 1000, 4),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 4),
+        "peak_kib": round(peak / 1024, 1),
+        "iterations": iterations,
+    }
+
+
+def _benchmarks(iterations):
+    """Yield (name, details, operation, iterations, per_call) for every benchmark."""
+    from qrcodegenpy_shankonduru import QRCodeGenerator
+    from qrcodegenpy_shankonduru.masks import build_matrix
+    from qrcodegenpy_shankonduru.png import render_png
+    from qrcodegenpy_shankonduru.raster import rasterize
+
+    generator = QRCodeGenerator(output_folder=None)
+    qr = generator._new_qr()
+
+    for label, payload in PAYLOADS.items():
+        matrix = generator._encode(qr, payload)
+        details = {"payload_chars": len(payload), "version": qr.version}
+        # Slower stages of large codes get fewer iterations
+        count = max(10, iterations // max(1, qr.version // 4))
+
+        yield (f"encode/{label}", details,
+               lambda payload=payload: generator._encode(qr, payload), count, 1)
+
+        def select_mask(qr=qr, version=qr.version, data_list=qr.data_list,
+                        codewords=qr.data_cache):
+            qr.version, qr.data_list, qr.data_cache = version, data_list, codewords
+            build_matrix(qr)
+
+        yield f"mask/{label}", details, select_mask, count, 1
+
+        yield (f"rasterize/{label}", details,
+               lambda matrix=matrix: rasterize(matrix, 10, 4), count, 1)
+
+        image = rasterize(matrix, 10, 4)
+
+        def save_pillow(image=image):
+            image.save(io.BytesIO(), format="PNG")
+
+        yield f"png_pillow/{label}", details, save_pillow, count, 1
+        yield (f"png_builtin/{label}", details,
+               lambda matrix=matrix: render_png(matrix, 10, 4), count, 1)
+
+    payloads = [f"https://example.com/item/{index:06d}" for index in range(BATCH_SIZE)]
+    details = {"payload_chars": len(payloads[0]), "batch_size": BATCH_SIZE}
+    yield ("encode_batch/short_url", details,
+           lambda: generator._encode_batch(payloads), max(3, iterations // 20), BATCH_SIZE)
+
+    folder = tempfile.mkdtemp(prefix="qr_bench_")
+    try:
+        batch_generator = QRCodeGenerator("bench", folder, naming="counter")
+
+        def run_batch():
+            for result in batch_generator.generate_qr_codes(payloads):
+                if not result.ok:
+                    raise result.error
+
+        def run_loop():
+            for payload in payloads:
+                batch_generator.generate_qr_code(payload)
+
+        yield "batch/short_url", details, run_batch, max(3, iterations // 50), BATCH_SIZE
+        yield "loop/short_url", details, run_loop, max(3, iterations // 50), BATCH_SIZE
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    root = str(Path(__file__).parent.parent)
+    environment = dict(os.environ, QRGEN_NO_DAEMON="1")
+
+    def start_cli():
+        subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=root, env=environment,
+                       stdout=subprocess.DEVNULL, check=True)
+
+    yield "startup/version", {}, start_cli, max(3, iterations // 20), 1
+
+    # Each call keeps BATCH_SIZE matrices, so peak_kib is the memory they hold together
+    matrix_generator = QRCodeGenerator(output_folder=None, version=MATRIX_VERSION)
+    matrices = [code.modules for code in matrix_generator._encode_batch(payloads)]
+    details = {"version": MATRIX_VERSION, "matrices": BATCH_SIZE}
+    count = max(3, iterations // 20)
+    yield ("matrix_memory/packed", details,
+           lambda: [type(matrix)(matrix.size, matrix.packed) for matrix in matrices],
+           count, BATCH_SIZE)
+    yield ("matrix_memory/lists", details,
+           lambda: [matrix.to_lists() for matrix in matrices], count, BATCH_SIZE)
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        yield ("matrix_memory/numpy", details,
+               lambda: [matrix.to_array() for matrix in matrices], count, BATCH_SIZE)
+
+
+def run_suite(iterations=200, name_filter=None, progress=None):
+    """
+    Run the benchmarks and return the results document.
+
+    Args:
+        iterations (int, optional): Timed iterations for the fastest benchmarks;
+                                    slower ones use fewer. Defaults to 200.
+        name_filter (str, optional): Only run benchmarks whose name contains it.
+        progress (callable, optional): Called with (name, result) after each one.
+
+    Returns:
+        dict: {"meta": {...}, "results": {name: result}}.
+    """
+    results = {}
+    for name, details, operation, count, per_call in _benchmarks(iterations):
+        if name_filter and name_filter not in name:
+            continue
+        result = dict(details, **measure(operation, count, per_call=per_call))
+        results[name] = result
+        if progress is not None:
+            progress(name, result)
+
+    try:
+        import numpy  # noqa: F401
+        has_numpy = True
+    except ImportError:
+        has_numpy = False
+    import qrcodegenpy_shankonduru
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "package_version": qrcodegenpy_shankonduru.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": has_numpy,
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results with a baseline.
+
+    A benchmark regresses when its ops/sec falls, or its peak memory grows, by
+    more than threshold (a fraction) relative to the baseline. Benchmarks
+    missing from either side are ignored.
+
+    Returns:
+        list: One message per regression, empty when there is none.
+    """
+    regressions = []
+    previous = baseline.get("results", {})
+    for name, current in results.get("results", {}).items():
+        before = previous.get(name)
+        if before is None:
+            continue
+        if current["ops_per_sec"] < before["ops_per_sec"] * (1 - threshold):
+            change = 1 - current["ops_per_sec"] / before["ops_per_sec"]
+            regressions.append(f"{name}: {current['ops_per_sec']:.1f} ops/s vs "
+                               f"{before['ops_per_sec']:.1f} baseline ({change:.0%} slower)")
+        if before["peak_kib"] > 0 and current["peak_kib"] > before["peak_kib"] * (1 + threshold):
+            change = current["peak_kib"] / before["peak_kib"] - 1
+            regressions.append(f"{name}: peak {current['peak_kib']:.0f} KiB vs "
+                               f"{before['peak_kib']:.0f} KiB baseline ({change:.0%} more)")
+    return regressions
+
+
+def speedups(results):
+    """
+    Return the speed-up of each batch benchmark over its one-at-a-time counterpart.
+
+    Returns:
+        dict: Batch benchmark name -> ratio of ops/sec, for the pairs of SPEEDUPS
+              that are both in results.
+    """
+    measured = results.get("results", {})
+    return {batch: round(measured[batch]["ops_per_sec"] / measured[single]["ops_per_sec"], 2)
+            for batch, single in SPEEDUPS.items() if batch in measured and single in measured}
+
+
+def print_result(name, result):
+    print(f"{name:<28}{result['ops_per_sec']:>12,.1f}{result['p50_ms']:>11.3f}"
+          f"{result['p99_ms']:>11.3f}{result['peak_kib']:>11,.0f}")
+
+
+def main(argv=None):
+    """
+    Run the suite, write the results and check them against the baseline.
+
+    Returns:
+        int: 0 on success, 1 if a regression exceeds the threshold.
+    """
+    parser = argparse.ArgumentParser(description="QRCodeGenerator benchmark suite.")
+    parser.add_argument("--iterations", type=int, default=200,
+                        help="timed iterations of the fastest benchmarks (default: 200)")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="where to write the JSON results (default: bench_results.json)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                        help=f"baseline JSON to compare with (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown or memory growth as a fraction (default: 0.20)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<28}{'ops/s':>12}{'p50 ms':>11}{'p99 ms':>11}{'peak KiB':>11}")
+    results = run_suite(args.iterations, args.filter, progress=print_result)
+    for batch, ratio in speedups(results).items():
+        print(f"{batch} vs {SPEEDUPS[batch]}: {ratio:.2f}x")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%} versus {args.baseline}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"No regression beyond {args.threshold:.0%} versus {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
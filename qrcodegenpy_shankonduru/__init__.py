@@ -1,11 +1,59 @@
 """
 QR Code Generator Python Package
 A comprehensive QR Code Generator library with CLI, Streamlit UI, and robust testing
+
+The public names below are imported on first use, so that ``import
+qrcodegenpy_shankonduru`` (and the ``qrgen`` command line before it encodes
+anything) does not pay for loading qrcode, Pillow and NumPy.
 """
 
-from .qr_generator import QRCodeGenerator
+from importlib import import_module
 
 __version__ = "1.0.0"
 __author__ = "Shan Konduru"
 __email__ = "shankonduru@gmail.com"
-__all__ = ["QRCodeGenerator"]
\ No newline at end of file
+
+# Public name -> submodule defining it
+_LAZY_EXPORTS = {
+    "QRCodeGenerator": ".qr_generator",
+    "QRCodeResult": ".qr_generator",
+    "generate_bulk": ".bulk",
+    "read_payloads": ".bulk",
+    "read_table": ".bulk",
+    "BulkJob": ".bulk",
+    "CacheStats": ".cache",
+    "RenderCache": ".cache",
+    "ShardedLayout": ".layout",
+    "ModuleMatrix": ".matrix",
+    "build_payload": ".content",
+    "payloads_from_rows": ".content",
+    "MetricsCollector": ".metrics",
+    "StageTimings": ".metrics",
+    "TimestampNaming": ".naming",
+    "CounterNaming": ".naming",
+    "HashNaming": ".naming",
+    "KeyNaming": ".naming",
+    "DirectorySink": ".pipeline",
+    "run_pipeline": ".pipeline",
+    "AsyncQRCodeGenerator": ".aio",
+    "ArchiveSink": ".archive",
+    "ZipSink": ".archive",
+    "TarSink": ".archive",
+    "open_archive_sink": ".archive",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Cache it so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,211 @@
+"""
+Asyncio QR Code Generation Module
+
+This module exposes QRCodeGenerator to asyncio applications. Encoding and
+rendering are CPU-bound and file writes are blocking, so both are offloaded
+to executors and the event loop stays responsive. Concurrency can be bounded
+with a semaphore and every coroutine can be cancelled. The generator's cache
+and observer are used as in the synchronous API: the executor reports the
+stage timings of each render and the event loop passes them on.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .metrics import StageClock
+from .pipeline import _generator_settings
+from .qr_generator import QRCodeGenerator, QRCodeResult
+
+# Generators reused by process-pool workers, keyed by their settings, most
+# recently used last
+_process_generators = OrderedDict()
+
+# Generators kept by one worker process
+MAX_PROCESS_GENERATORS = 16
+
+
+def _render_with(generator, input_string, timed=False):
+    """
+    Encode and serialize input_string with generator (cache bypassed).
+
+    Returns:
+        tuple: (data, version, stages); stages is None unless timed.
+    """
+    clock = StageClock() if timed else None
+    qr = generator._new_qr()
+    generator._encode(qr, input_string, clock)
+    data = generator._serialize(qr.modules)
+    if clock is None:
+        return data, qr.version, None
+    clock.lap("render")
+    return data, qr.version, clock.stages
+
+
+def _render_in_process(output_folder, settings, input_string, timed=False):
+    """Process-pool entry point: render with a per-process generator."""
+    key = tuple(sorted(settings.items(), key=lambda item: item[0]))
+    generator = _process_generators.get(key)
+    if generator is None:
+        generator = QRCodeGenerator(output_folder=output_folder, **settings)
+        _process_generators[key] = generator
+        while len(_process_generators) > MAX_PROCESS_GENERATORS:
+            _process_generators.popitem(last=False)
+    else:
+        _process_generators.move_to_end(key)
+    return _render_with(generator, input_string, timed)
+
+
+def _write_file(path, data):
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+class AsyncQRCodeGenerator:
+    """
+    Asyncio front-end for QRCodeGenerator.
+
+    Attributes:
+        generator (QRCodeGenerator): Provides settings, naming, output folder and cache.
+        executor (concurrent.futures.Executor): Runs encoding and rendering; None
+                                                 uses the loop's default thread pool.
+        max_concurrency (int): Maximum renders in progress at once, or None.
+
+    Example:
+        >>> async def handler():
+        ...     generator = AsyncQRCodeGenerator(max_concurrency=8)
+        ...     png = await generator.generate_qr_bytes("https://example.com")
+        ...     results = await generator.generate_qr_codes(["a", "b", "c"])
+    """
+
+    def __init__(self, generator=None, executor=None, max_concurrency=None, **kwargs):
+        """
+        Initialize the async generator.
+
+        Args:
+            generator (QRCodeGenerator, optional): Generator to wrap. Defaults to a new
+                                                  QRCodeGenerator built from kwargs.
+            executor (Executor, optional): Thread or process pool for encoding.
+                                         Defaults to the loop's default executor.
+            max_concurrency (int, optional): Bound on concurrent renders. Defaults to None.
+            **kwargs: QRCodeGenerator options used when no generator is given.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1 (got {max_concurrency})")
+        self.generator = generator if generator is not None else QRCodeGenerator(**kwargs)
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    def _render_call(self, input_string, timed):
+        """Return the callable that renders input_string in the configured executor."""
+        if isinstance(self.executor, ProcessPoolExecutor):
+            return partial(_render_in_process, self.generator.output_folder,
+                           _generator_settings(self.generator), input_string, timed)
+        return partial(_render_with, self.generator, input_string, timed)
+
+    async def _render(self, input_string, clock=None):
+        """Return (data, version) of input_string; version is None for cache hits."""
+        generator = self.generator
+        if generator.cache is not None:
+            data = generator._cached(input_string, clock)
+            if data is not None:
+                return data, None
+
+        loop = asyncio.get_running_loop()
+        data, version, stages = await loop.run_in_executor(
+            self.executor, self._render_call(input_string, clock is not None))
+        if clock is not None:
+            # Measured in the executor; the time spent queued there is not a stage
+            for stage, seconds in stages.items():
+                clock.charge(stage, seconds)
+
+        if generator.cache is not None:
+            generator.cache.put(generator._cache_key(input_string, generator.image_format),
+                                data)
+        return data, version
+
+    async def _generate_bytes(self, input_string):
+        clock = self.generator._start_clock()
+        data, version = await self._render(input_string, clock)
+        if clock is not None:
+            self.generator._observe(clock, version, input_string)
+        return data
+
+    async def _bounded(self, function, input_string):
+        # The coroutine is only created once a slot is free, so cancelling a
+        # waiting call leaves nothing behind
+        if self._semaphore is None:
+            return await function(input_string)
+        async with self._semaphore:
+            return await function(input_string)
+
+    async def generate_qr_bytes(self, input_string):
+        """
+        Generate a QR code in memory without blocking the event loop.
+
+        Args:
+            input_string (str): The text or URL to encode in the QR code.
+
+        Returns:
+            bytes: The image in the generator's format (PNG by default).
+        """
+        return await self._bounded(self._generate_bytes, input_string)
+
+    async def _generate_and_save(self, input_string):
+        clock = self.generator._start_clock()
+        data, version = await self._render(input_string, clock)
+        full_path = self.generator._build_file_path(input_string)
+        # Blocking file I/O always goes to a thread, even with a process executor
+        await asyncio.get_running_loop().run_in_executor(None, _write_file, full_path, data)
+        if clock is not None:
+            clock.lap("save")
+            self.generator._observe(clock, version, input_string)
+        return full_path
+
+    async def generate_qr_code(self, input_string):
+        """
+        Generate a QR code and save it without blocking the event loop.
+
+        Args:
+            input_string (str): The text or URL to encode in the QR code.
+
+        Returns:
+            str: The full path of the saved image.
+        """
+        return await self._bounded(self._generate_and_save, input_string)
+
+    async def generate_qr_codes(self, input_strings):
+        """
+        Generate and save QR codes concurrently, gather-style.
+
+        Items run concurrently up to max_concurrency. A failing item is reported
+        in its result instead of cancelling the others; cancelling the call
+        cancels every pending item.
+
+        Args:
+            input_strings (iterable): Texts or URLs to encode.
+
+        Returns:
+            list: One QRCodeResult per input, in input order.
+        """
+        input_strings = list(input_strings)
+        outcomes = await asyncio.gather(
+            *(self.generate_qr_code(input_string) for input_string in input_strings),
+            return_exceptions=True,
+        )
+
+        results = []
+        for index, (input_string, outcome) in enumerate(zip(input_strings, outcomes)):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                results.append(QRCodeResult(index, input_string, None, outcome))
+            else:
+                results.append(QRCodeResult(index, input_string, outcome, None))
+        return results
@@ -0,0 +1,220 @@
+"""
+Archive Sink Module
+
+This module provides pipeline sinks that stream rendered images into a single
+ZIP or tar archive instead of one file per code. Members are written as they
+arrive, together with a manifest CSV mapping each payload to its member name,
+so a batch of any size produces one file on disk and memory stays bounded.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import csv
+import io
+import tarfile
+import tempfile
+import time
+import zipfile
+
+from .qr_generator import IMAGE_FORMATS
+
+# Name of the manifest member appended when the archive is closed
+MANIFEST_NAME = "manifest.csv"
+MANIFEST_HEADER = ("index", "payload", "member")
+
+# tarfile stream modes for each supported tar extension
+TAR_MODES = {
+    ".tar": "w|",
+    ".tar.gz": "w|gz",
+    ".tgz": "w|gz",
+    ".tar.bz2": "w|bz2",
+    ".tar.xz": "w|xz",
+}
+
+
+class ArchiveSink:
+    """
+    Base class for sinks writing every image as a member of one archive.
+
+    Member names are ``<file_prefix>_<index><extension>``, so they are unique
+    within a run and sort in input order. Manifest rows are spooled to a
+    temporary file and appended as ``manifest.csv`` when the sink is closed.
+
+    Attributes:
+        generator (QRCodeGenerator): Provides the file prefix and image format.
+        manifest (bool): Whether manifest.csv is written.
+    """
+
+    def __init__(self, generator, manifest=True):
+        """
+        Initialize the sink.
+
+        Args:
+            generator (QRCodeGenerator): Provides the file prefix and image format.
+            manifest (bool, optional): Write manifest.csv. Defaults to True.
+        """
+        self.generator = generator
+        self.manifest = manifest
+        self._extension = IMAGE_FORMATS[generator.image_format]
+        self._closed = False
+        self._manifest_file = None
+        self._manifest_writer = None
+        if manifest:
+            self._manifest_file = tempfile.TemporaryFile("w+", encoding="utf-8", newline="")
+            self._manifest_writer = csv.writer(self._manifest_file)
+            self._manifest_writer.writerow(MANIFEST_HEADER)
+
+    def member_name(self, index, payload):
+        """Return the archive member name for the item at index."""
+        return f"{self.generator.file_prefix}_{index:08d}{self._extension}"
+
+    def write(self, index, payload, data):
+        """Add data to the archive and return its member name."""
+        if self._closed:
+            raise ValueError("write to a closed archive sink")
+        name = self.member_name(index, payload)
+        self._add_member(name, data)
+        if self._manifest_writer is not None:
+            self._manifest_writer.writerow((index, payload, name))
+        return name
+
+    def close(self):
+        """Append the manifest and finish the archive."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._manifest_file is not None:
+                self._manifest_file.seek(0)
+                self._add_member(MANIFEST_NAME, self._manifest_file.read().encode("utf-8"))
+        finally:
+            if self._manifest_file is not None:
+                self._manifest_file.close()
+            self._close_archive()
+
+    def _add_member(self, name, data):
+        raise NotImplementedError
+
+    def _close_archive(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ZipSink(ArchiveSink):
+    """
+    Sink streaming images into a ZIP archive.
+
+    PNG and PDF members are stored uncompressed by default because the data is
+    already compressed; SVG members are deflated. ZIP64 is used automatically
+    past 65,535 members. The ZIP central directory holds one small record per
+    member until the archive is closed; the image data itself is not kept.
+
+    Example:
+        >>> generator = QRCodeGenerator("tag", None)
+        >>> for result in run_pipeline(payloads, generator, ZipSink("tags.zip", generator)):
+        ...     print(result.path)  # member name inside tags.zip
+    """
+
+    def __init__(self, target, generator, compression=None, manifest=True):
+        """
+        Initialize the sink and open the archive.
+
+        Args:
+            target: Path or writable binary file object (need not be seekable).
+            generator (QRCodeGenerator): Provides the file prefix and image format.
+            compression (int, optional): zipfile compression constant. Defaults to
+                                         ZIP_DEFLATED for SVG, ZIP_STORED otherwise.
+            manifest (bool, optional): Write manifest.csv. Defaults to True.
+        """
+        if compression is None:
+            compression = (zipfile.ZIP_DEFLATED if generator.image_format == "SVG"
+                           else zipfile.ZIP_STORED)
+        self._zip = zipfile.ZipFile(target, "w", compression=compression)
+        self._date_time = time.localtime()[:6]
+        super().__init__(generator, manifest)
+
+    def _add_member(self, name, data):
+        info = zipfile.ZipInfo(name, self._date_time)
+        info.compress_type = self._zip.compression
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, data)
+
+    def _close_archive(self):
+        self._zip.close()
+
+
+class TarSink(ArchiveSink):
+    """
+    Sink streaming images into a tar archive, optionally compressed.
+
+    The archive is written in stream mode, so memory use is constant and the
+    target may be a pipe.
+
+    Example:
+        >>> generator = QRCodeGenerator("tag", None)
+        >>> with TarSink("tags.tar.gz", generator, compression="gz") as sink:
+        ...     sink.write(0, "A-1", png_bytes)
+    """
+
+    def __init__(self, target, generator, compression="", manifest=True):
+        """
+        Initialize the sink and open the archive.
+
+        Args:
+            target: Path or writable binary file object.
+            generator (QRCodeGenerator): Provides the file prefix and image format.
+            compression (str, optional): "", "gz", "bz2" or "xz". Defaults to "".
+            manifest (bool, optional): Write manifest.csv. Defaults to True.
+        """
+        mode = f"w|{compression}"
+        if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+            self._tar = tarfile.open(target, mode)
+        else:
+            self._tar = tarfile.open(fileobj=target, mode=mode)
+        self._mtime = time.time()
+        super().__init__(generator, manifest)
+
+    def _add_member(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self._mtime
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+        # Members written in stream mode are never read back; dropping them keeps
+        # memory constant however many codes are archived
+        self._tar.members.clear()
+
+    def _close_archive(self):
+        self._tar.close()
+
+
+def open_archive_sink(path, generator, manifest=True):
+    """
+    Open a ZipSink or TarSink depending on the extension of path.
+
+    Args:
+        path (str): Archive path ending in .zip, .tar, .tar.gz, .tgz, .tar.bz2 or .tar.xz.
+        generator (QRCodeGenerator): Provides the file prefix and image format.
+        manifest (bool, optional): Write manifest.csv. Defaults to True.
+
+    Returns:
+        ArchiveSink: The open sink.
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    lower = str(path).lower()
+    if lower.endswith(".zip"):
+        return ZipSink(path, generator, manifest=manifest)
+    for extension, mode in TAR_MODES.items():
+        if lower.endswith(extension):
+            return TarSink(path, generator, mode[2:], manifest=manifest)
+    raise ValueError(f"Unsupported archive type: {path} "
+                     f"(expected .zip, {', '.join(TAR_MODES)})")
@@ -0,0 +1,316 @@
+"""
+Bulk QR Code Generation Module
+
+This module reads payloads from text, CSV or JSON Lines files and generates
+QR codes for them across a pool of worker processes. Payloads are sent to the
+workers in chunks so that inter-process overhead stays small compared to the
+encoding work, and results are yielded in the same order as the input.
+
+For interactive front ends, read_table() reads an uploaded CSV or Excel table
+and BulkJob runs a batch in a background thread into an in-memory ZIP
+archive, exposing its progress while it runs.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import csv
+import io
+import json
+import os
+import threading
+import time
+
+from .archive import ZipSink
+from .pipeline import DEFAULT_CHUNKSIZE, run_pipeline
+from .qr_generator import QRCodeGenerator
+
+# Field looked up in JSON objects when no column is given
+DEFAULT_JSON_FIELD = "text"
+
+# Failed items whose errors are kept by a BulkJob
+MAX_REPORTED_FAILURES = 100
+
+
+def read_payloads(path, column=None):
+    """
+    Lazily read payloads from a .txt, .csv or .jsonl file.
+
+    - .txt: one payload per line; blank lines are skipped.
+    - .csv: one payload per row, taken from the first column, or from the named
+      column (the first row is then treated as a header).
+    - .jsonl: one JSON value per line; strings are used as-is and objects are
+      read from ``column`` (defaults to "text").
+
+    Args:
+        path (str): Path to the input file.
+        column (str, optional): Column or field holding the payload.
+
+    Yields:
+        str: The payloads, in file order.
+
+    Raises:
+        ValueError: If the file extension is not supported. While reading, also
+                    for a missing CSV column, or a .jsonl line that is not JSON or
+                    an object without the field (the message gives the line).
+        OSError: While reading, if the file cannot be opened.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".txt":
+        return _read_text(path)
+    if extension == ".csv":
+        return _read_csv(path, column)
+    if extension in (".jsonl", ".ndjson"):
+        return _read_jsonl(path, column or DEFAULT_JSON_FIELD)
+    raise ValueError(f"Unsupported input file type: {extension or path}")
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.rstrip("\r\n")
+            if line:
+                yield line
+
+
+def _read_csv(path, column):
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        field_index = 0
+        if column is not None:
+            header = next(reader, [])
+            if column not in header:
+                raise ValueError(f"Column {column!r} not found in {path}")
+            field_index = header.index(column)
+        for row in reader:
+            if len(row) > field_index and row[field_index]:
+                yield row[field_index]
+
+
+def _read_jsonl(path, field):
+    with open(path, "r", encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as error:
+                raise ValueError(f"{path}, line {number}: invalid JSON ({error})") from None
+            if isinstance(value, dict):
+                if field not in value:
+                    raise ValueError(f"{path}, line {number}: no {field!r} field in object")
+                value = value[field]
+            yield str(value)
+
+
+def read_table(source, filename):
+    """
+    Read a CSV or Excel (.xlsx) table with a header row.
+
+    Reading .xlsx files requires the optional openpyxl package; only the first
+    worksheet is read.
+
+    Args:
+        source (bytes | file): The file contents, or a binary file object such as
+                               an upload.
+        filename (str): Name of the file; its extension selects the format.
+
+    Returns:
+        tuple: (columns, rows) where columns is the list of header names and
+               rows a list of dicts of column name -> cell value.
+
+    Raises:
+        ValueError: If the extension is not supported.
+        ImportError: For .xlsx files when openpyxl is not installed.
+    """
+    data = source if isinstance(source, bytes) else source.read()
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        reader = csv.DictReader(io.StringIO(data.decode("utf-8-sig"), newline=""))
+        rows = list(reader)
+        return list(reader.fieldnames or []), rows
+    if extension == ".xlsx":
+        return _read_xlsx(data)
+    raise ValueError(f"Unsupported table file type: {extension or filename}")
+
+
+def _read_xlsx(data):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("Reading .xlsx files requires openpyxl (pip install openpyxl)") from None
+    workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        values = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(values, ())
+        columns = ["" if cell is None else str(cell) for cell in header]
+        rows = [dict(zip(columns, row)) for row in values
+                if any(cell is not None for cell in row)]
+    finally:
+        workbook.close()
+    return columns, rows
+
+
+class BulkJob:
+    """
+    A batch of QR codes generated in a background thread into an in-memory ZIP.
+
+    The job runs run_pipeline() with a ZipSink over a memory buffer, so the
+    caller (for example a Streamlit session) stays responsive and can poll
+    the progress. With more than one worker, encoding runs in worker processes:
+    on the given executor, or else on a pool spawned for the job. A server
+    running jobs for many sessions should pass one shared, bounded executor,
+    so the number of processes does not grow with the number of users.
+
+    Attributes:
+        total (int): Number of payloads.
+        done (int): Payloads processed so far, failed ones included.
+        failed (int): Payloads that could not be generated.
+        failures (list): (index, payload, message) of the first failed payloads.
+        error (Exception): Error that stopped the whole job, or None.
+        data (bytes): The ZIP archive once the job has completed, otherwise None.
+
+    Example:
+        >>> job = BulkJob(payloads, QRCodeGenerator("tag", None), workers=4).start()
+        >>> while not job.finished:
+        ...     print(f"{job.progress:.0%} at {job.throughput:.0f} codes/s")
+        ...     time.sleep(0.5)
+        >>> open("tags.zip", "wb").write(job.data)
+    """
+
+    def __init__(self, payloads, generator, workers=1, chunksize=DEFAULT_CHUNKSIZE,
+                 executor=None):
+        """
+        Initialize the job; nothing runs until start().
+
+        Args:
+            payloads (iterable): Texts to encode; read into a list up front.
+            generator (QRCodeGenerator): Provides the settings, file prefix and format.
+            workers (int, optional): Worker processes. Defaults to 1 (in the thread).
+            chunksize (int, optional): Payloads per worker task. Defaults to 64.
+            executor (concurrent.futures.Executor, optional): Shared process pool
+                     to run on; workers then only bounds the chunks in flight.
+        """
+        self.payloads = list(payloads)
+        self.generator = generator
+        self.workers = workers
+        self.chunksize = chunksize
+        self.executor = executor
+        self.total = len(self.payloads)
+        self.done = 0
+        self.failed = 0
+        self.failures = []
+        self.error = None
+        self.data = None
+        self._started_at = None
+        self._finished_at = None
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start generating in a daemon thread and return the job."""
+        if self._thread is not None:
+            raise RuntimeError("job already started")
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="qrgen-bulk-job", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        buffer = io.BytesIO()
+        try:
+            results = run_pipeline(self.payloads, self.generator,
+                                   ZipSink(buffer, self.generator), self.workers,
+                                   self.chunksize, executor=self.executor)
+            try:
+                for result in results:
+                    if not result.ok:
+                        self.failed += 1
+                        if len(self.failures) < MAX_REPORTED_FAILURES:
+                            self.failures.append((result.index, result.input_string,
+                                                  str(result.error)
+                                                  or type(result.error).__name__))
+                    self.done += 1
+                    if self._cancelled.is_set():
+                        break
+            finally:
+                # Closes the sink, which finishes the archive
+                results.close()
+            if not self._cancelled.is_set():
+                self.data = buffer.getvalue()
+        except Exception as error:
+            self.error = error
+        finally:
+            self._finished_at = time.monotonic()
+
+    def cancel(self):
+        """Stop after the item being written; data stays None."""
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        """Block until the job has finished or timeout seconds have passed."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.finished
+
+    @property
+    def finished(self):
+        """bool: True once the job has completed, failed or been cancelled."""
+        return self._finished_at is not None
+
+    @property
+    def cancelled(self):
+        """bool: True if cancel() was called."""
+        return self._cancelled.is_set()
+
+    @property
+    def progress(self):
+        """float: Fraction of the payloads processed, from 0.0 to 1.0."""
+        return self.done / self.total if self.total else float(self.finished)
+
+    @property
+    def elapsed(self):
+        """float: Seconds since start(), up to the end of the job."""
+        if self._started_at is None:
+            return 0.0
+        end = self._finished_at if self._finished_at is not None else time.monotonic()
+        return end - self._started_at
+
+    @property
+    def throughput(self):
+        """float: Payloads processed per second so far."""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+
+def generate_bulk(payloads, file_prefix="qr_code", output_folder="output", workers=None,
+                  chunksize=DEFAULT_CHUNKSIZE, **settings):
+    """
+    Generate QR codes for many payloads using a pool of worker processes.
+
+    Payloads are consumed lazily and grouped into chunks of ``chunksize``; only a
+    small number of chunks per worker is in flight at any time. Workers encode,
+    render and write the files (see run_pipeline()).
+    Results are yielded in input order regardless of which worker finishes first.
+
+    Args:
+        payloads (iterable): Texts or URLs to encode.
+        file_prefix (str, optional): Filename prefix. Defaults to "qr_code".
+        output_folder (str, optional): Output directory. Defaults to "output".
+        workers (int, optional): Number of processes. Defaults to os.cpu_count().
+                                 With 1 worker everything runs in-process.
+        chunksize (int, optional): Payloads per task. Defaults to 64.
+        **settings: Extra QRCodeGenerator options (box_size, border, ...).
+
+    Yields:
+        QRCodeResult: One result per payload, in input order.
+
+    Example:
+        >>> for result in generate_bulk(read_payloads("tags.txt"), workers=8):
+        ...     print(result.path)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    generator = QRCodeGenerator(file_prefix, output_folder, **settings)
+    return run_pipeline(payloads, generator, workers=workers, chunksize=chunksize)
@@ -0,0 +1,211 @@
+"""
+Render Cache Module
+
+This module provides a content-addressed cache for rendered QR code images.
+Entries are keyed on a hash of the payload and every setting that affects the
+output, so a repeated request can return the already-encoded image bytes
+instead of encoding and rasterizing the code again.
+
+The cache has a bounded in-memory LRU tier and an optional on-disk tier that
+survives restarts and can be shared between processes.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+
+
+class CacheStats(namedtuple("CacheStats", ["hits", "disk_hits", "misses", "evictions",
+                                           "entries", "size_bytes"])):
+    """
+    Snapshot of RenderCache counters.
+
+    Attributes:
+        hits (int): Lookups answered from memory.
+        disk_hits (int): Lookups answered from the disk tier.
+        misses (int): Lookups that found nothing.
+        evictions (int): Entries dropped from memory to respect the limits.
+        entries (int): Entries currently held in memory.
+        size_bytes (int): Bytes currently held in memory.
+    """
+
+    __slots__ = ()
+
+    @property
+    def hit_rate(self):
+        """float: Fraction of lookups served from either tier (0.0 when unused)."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+def cache_key(payload, version, error_correction, box_size, border, fill_color,
+              back_color, image_format, options=None):
+    """
+    Build the content address of a rendered QR code.
+
+    Args:
+        payload (str): The encoded text.
+        version (int): Starting QR code version.
+        error_correction (int): qrcode error correction constant.
+        box_size (int): Pixels per module.
+        border (int): Quiet zone width in modules.
+        fill_color: Module color.
+        back_color: Background color.
+        image_format (str): Output format, e.g. "PNG".
+        options (dict, optional): Other settings that change the output. Only
+                                  options differing from their defaults should
+                                  be passed, so existing keys stay valid.
+
+    Returns:
+        str: A SHA-256 hex digest identifying the rendered image.
+    """
+    fields = [payload, version, error_correction, box_size, border, fill_color, back_color,
+              image_format]
+    if options:
+        fields.append(sorted(options.items()))
+    material = json.dumps(fields, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Thread-safe LRU cache of rendered image bytes with an optional disk tier.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept in memory.
+        max_bytes (int): Maximum total size of the in-memory entries, or None.
+        disk_folder (str): Directory of the disk tier, or None for memory only.
+
+    Example:
+        >>> cache = RenderCache(max_entries=10000, disk_folder="qr_cache")
+        >>> generator = QRCodeGenerator(cache=cache)
+        >>> generator.generate_qr_code("https://example.com")
+        >>> cache.stats().hits
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, disk_folder=None):
+        """
+        Initialize the render cache.
+
+        Args:
+            max_entries (int, optional): In-memory entry limit. Defaults to 1024.
+            max_bytes (int, optional): In-memory size limit in bytes. Defaults to None.
+            disk_folder (str, optional): Directory for the disk tier. Defaults to None.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1 (got {max_entries})")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_folder = disk_folder
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if disk_folder is not None:
+            os.makedirs(disk_folder, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Return the cached bytes for key, or None on a miss.
+
+        A disk hit is promoted into the memory tier.
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return data
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._store(key, data)
+        return data
+
+    def put(self, key, data):
+        """Store data under key in memory and, if enabled, on disk."""
+        data = bytes(data)
+        with self._lock:
+            self._store(key, data)
+        self._write_disk(key, data)
+
+    def clear(self):
+        """Drop every in-memory entry and reset the counters (disk is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+            self._hits = self._disk_hits = self._misses = self._evictions = 0
+
+    def stats(self):
+        """Return a CacheStats snapshot of the counters."""
+        with self._lock:
+            return CacheStats(self._hits, self._disk_hits, self._misses,
+                              self._evictions, len(self._entries), self._size_bytes)
+
+    def _store(self, key, data):
+        """Insert into the memory tier and evict least recently used entries."""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size_bytes -= len(previous)
+        self._entries[key] = data
+        self._size_bytes += len(data)
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._size_bytes > self.max_bytes
+            and len(self._entries) > 1
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._size_bytes -= len(evicted)
+            self._evictions += 1
+
+    def _disk_path(self, key):
+        # Fan out over 256 sub-directories to keep directory sizes reasonable
+        return os.path.join(self.disk_folder, key[:2], key)
+
+    def _read_disk(self, key):
+        if self.disk_folder is None:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key, data):
+        if self.disk_folder is None:
+            return
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=folder)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -0,0 +1,128 @@
+"""
+QR Code Capacity Module
+
+This module precomputes the data capacity of every QR code version and error
+correction level, and picks the smallest version that fits a payload in one
+lookup.
+
+qrcode's ``make(fit=True)`` finds the version by writing every data bit into a
+scratch BitBuffer, bisecting the capacity table and, when the length fields
+grow with the version, writing the data again. Here the bit length of each
+segment is computed arithmetically from its mode and length, and a table
+indexed by the number of data codewords gives the minimal version directly.
+The chosen version is always the one qrcode would choose.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+from qrcode import util
+
+# Versions sharing the same character count field widths (ISO/IEC 18004 table 3)
+SIZE_CLASSES = ((1, 9, util.MODE_SIZE_SMALL),
+                (10, 26, util.MODE_SIZE_MEDIUM),
+                (27, 40, util.MODE_SIZE_LARGE))
+
+# Modes for which capacities are tabulated
+MODES = (util.MODE_NUMBER, util.MODE_ALPHA_NUM, util.MODE_8BIT_BYTE, util.MODE_KANJI)
+
+# DATA_BITS[error_correction][version]: data bits available (index 0 unused)
+DATA_BITS = [list(row) for row in util.BIT_LIMIT_TABLE]
+
+# Bits taken by the remainder of a numeric group of 0, 1 or 2 digits
+_NUMBER_REMAINDER_BITS = (0, 4, 7)
+
+
+def _build_version_index(data_bits):
+    """Return a list mapping a data codeword count to the smallest version holding it."""
+    index = []
+    version = 1
+    for codewords in range(data_bits[40] // 8 + 1):
+        while data_bits[version] < codewords * 8:
+            version += 1
+        index.append(version)
+    return index
+
+
+# _VERSION_INDEX[error_correction][codewords]: minimal version with that capacity
+_VERSION_INDEX = [_build_version_index(row) for row in DATA_BITS]
+
+
+def data_bits(mode, length):
+    """
+    Return the number of bits that length characters occupy in mode.
+
+    The 4-bit mode indicator and the character count field are not included.
+    """
+    if mode == util.MODE_NUMBER:
+        return 10 * (length // 3) + _NUMBER_REMAINDER_BITS[length % 3]
+    if mode == util.MODE_ALPHA_NUM:
+        return 11 * (length // 2) + 6 * (length % 2)
+    if mode == util.MODE_KANJI:
+        return 13 * length
+    return 8 * length
+
+
+def _max_characters(version, error_correction, mode):
+    """Return the largest character count of a single mode segment that fits."""
+    available = DATA_BITS[error_correction][version] - 4 - util.length_in_bits(mode, version)
+    low, high = 0, available
+    while low < high:
+        middle = (low + high + 1) // 2
+        if data_bits(mode, middle) <= available:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+# CAPACITY[error_correction][mode][version]: characters of a single segment
+CAPACITY = [
+    {mode: [0] + [_max_characters(version, error_correction, mode) for version in range(1, 41)]
+     for mode in MODES}
+    for error_correction in range(4)
+]
+
+
+def max_characters(version, error_correction, mode=util.MODE_8BIT_BYTE):
+    """
+    Return how many characters of one mode fit in a version.
+
+    Args:
+        version (int): QR code version (1-40).
+        error_correction (int): qrcode error correction constant.
+        mode (int, optional): qrcode mode constant. Defaults to byte mode.
+
+    Returns:
+        int: The capacity in characters (bytes in byte mode).
+    """
+    util.check_version(version)
+    return CAPACITY[error_correction][mode][version]
+
+
+def encoded_bits(data_list, mode_sizes):
+    """Return the bit length of data_list with the given character count field widths."""
+    total = 0
+    for segment in data_list:
+        mode = segment.mode
+        total += 4 + mode_sizes[mode] + data_bits(mode, len(segment))
+    return total
+
+
+def version_for_bits(bits, error_correction, first=1, last=40):
+    """
+    Return the smallest version in first..last holding bits data bits, or None.
+
+    Args:
+        bits (int): Encoded data length in bits, headers included.
+        error_correction (int): qrcode error correction constant.
+        first (int, optional): Lowest acceptable version. Defaults to 1.
+        last (int, optional): Highest acceptable version. Defaults to 40.
+    """
+    index = _VERSION_INDEX[error_correction]
+    codewords = (bits + 7) // 8
+    if codewords >= len(index):
+        return None
+    version = max(index[codewords], first)
+    return version if version <= last else None
@@ -2,10 +2,25 @@
 Command Line Interface for QR Code Generator
 
 This module provides a command-line interface for generating QR codes.
+
+qrgen is often run thousands of times from scripts, so only the argument
+parser is loaded at startup: the generator (and with it qrcode, Pillow and
+NumPy) is imported once there is something to encode, which keeps --help
+and --version near-instant.
+
+When a ``qrgen daemon`` is running, single codes are generated by it over a
+Unix socket instead, so a call does not pay for those imports at all; without
+a daemon (or with --no-daemon) everything runs in this process.
 """
 
 import argparse
-from .qr_generator import QRCodeGenerator
+import os
+import sys
+from . import __version__
+from .naming import NAMING_STRATEGIES
+
+# Kept in sync with pipeline.DEFAULT_CHUNKSIZE, which is not imported at startup
+DEFAULT_CHUNKSIZE = 64
 
 
 def main():
@@ -15,6 +30,8 @@ def main():
     This example creates a QR code for a LinkedIn profile URL and saves it as a PNG file.
     The function will print the filename of the generated QR code upon successful completion.
     """
+    from .qr_generator import QRCodeGenerator
+
     # Example data - LinkedIn profile URL
     input_string = "https://www.linkedin.com/in/shankonduru/"
 
@@ -28,19 +45,193 @@ def main():
     print(f"QR code generated successfully! File saved as: {file_name}")
 
 
-def cli():
+def cli(argv=None):
     """Command line interface entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == 'serve':
+        return _serve_cli(argv[1:])
+    if argv and argv[0] == 'daemon':
+        return _daemon_cli(argv[1:])
+
     parser = argparse.ArgumentParser(description='Generate QR codes from text or URLs')
-    parser.add_argument('text', help='Text or URL to encode in QR code')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    parser.add_argument('text', nargs='?', help='Text or URL to encode in QR code')
     parser.add_argument('--prefix', default='qr_code', help='Filename prefix (default: qr_code)')
     parser.add_argument('--output', default='output', help='Output directory (default: output)')
+    parser.add_argument('--format', default='png', choices=['png', 'svg', 'pdf'],
+                        help='Output image format (default: png)')
+    parser.add_argument('--mask', type=int, choices=range(8), default=None, metavar='0-7',
+                        help='Use a fixed data mask instead of scoring all eight (faster)')
+    parser.add_argument('--png-writer', default='pillow', choices=['pillow', 'builtin'],
+                        help='PNG encoder: Pillow, or the faster direct 1-bit writer '
+                             '(default: pillow)')
+    parser.add_argument('--png-compression', type=int, choices=range(10), default=6,
+                        metavar='0-9',
+                        help='PNG zlib level: 1 for speed, 9 for smallest files (default: 6)')
+    parser.add_argument('--naming', default='timestamp', choices=list(NAMING_STRATEGIES),
+                        help='File naming: timestamp, collision-free counter, or payload '
+                             'hash (default: timestamp)')
+    parser.add_argument('--archive',
+                        help='Write all codes into one .zip or .tar[.gz|.bz2|.xz] archive '
+                             'with a manifest.csv instead of separate files')
+    parser.add_argument('--input-file',
+                        help='Bulk mode: read payloads from a .txt, .csv or .jsonl file')
+    parser.add_argument('--column',
+                        help='CSV column or JSON field holding the payload (bulk mode)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for bulk mode (default: CPU count)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f'Payloads per worker task (default: {DEFAULT_CHUNKSIZE})')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='Chunks queued to workers at once (default: 2 per worker)')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Generate in this process even if a qrgen daemon is running')
     
-    args = parser.parse_args()
-    
-    generator = QRCodeGenerator(args.prefix, args.output)
+    args = parser.parse_args(argv)
+
+    if args.text is None and not args.input_file:
+        parser.error('either text or --input-file is required')
+    if args.input_file or args.archive:
+        return _run_bulk(args)
+
+    settings = {'image_format': args.format, 'naming': args.naming, 'mask_pattern': args.mask,
+                'png_writer': args.png_writer, 'png_compression': args.png_compression}
+
+    if not args.no_daemon:
+        from .daemon import forward_generate
+
+        response = forward_generate(args.text, dict(settings, file_prefix=args.prefix,
+                                                     output_folder=args.output))
+        if response is not None:
+            if not response['ok']:
+                print(f"Error generating QR code: {response['error']}", file=sys.stderr)
+                return 1
+            # Report the path relative to --output, as in-process generation does
+            filename = os.path.join(args.output, os.path.basename(response['path']))
+            print(f"QR code generated successfully! File saved as: {filename}")
+            return None
+
+    from .qr_generator import QRCodeGenerator
+
+    generator = QRCodeGenerator(args.prefix, args.output, **settings)
     filename = generator.generate_qr_code(args.text)
     print(f"QR code generated successfully! File saved as: {filename}")
 
 
+def _run_bulk(args):
+    """Stream every payload through the pipeline into files or an archive and print a summary."""
+    from .archive import open_archive_sink
+    from .bulk import read_payloads
+    from .pipeline import run_pipeline
+    from .qr_generator import QRCodeGenerator
+
+    if args.input_file:
+        workers = args.workers or os.cpu_count() or 1
+    else:
+        workers = 1
+    generated = 0
+    failed = 0
+    try:
+        payloads = read_payloads(args.input_file, args.column) if args.input_file else [args.text]
+        sink = None
+        if args.archive:
+            generator = QRCodeGenerator(args.prefix, None, image_format=args.format,
+                                        mask_pattern=args.mask,
+                                        png_writer=args.png_writer,
+                                        png_compression=args.png_compression)
+            sink = open_archive_sink(args.archive, generator)
+            destination = args.archive
+        else:
+            generator = QRCodeGenerator(args.prefix, args.output, image_format=args.format,
+                                        naming=args.naming, mask_pattern=args.mask,
+                                        png_writer=args.png_writer,
+                                        png_compression=args.png_compression)
+            destination = args.output
+        # The input is read lazily, so unreadable files and malformed lines surface here
+        results = run_pipeline(payloads, generator, sink, workers=workers,
+                               chunksize=args.chunksize, max_in_flight=args.max_in_flight)
+        try:
+            for result in results:
+                if result.ok:
+                    generated += 1
+                else:
+                    failed += 1
+                    message = str(result.error) or type(result.error).__name__
+                    print(f"Failed to generate QR code for item {result.index}: {message}",
+                          file=sys.stderr)
+        finally:
+            results.close()
+    except (OSError, ValueError) as error:
+        print(f"Error: {str(error) or type(error).__name__}", file=sys.stderr)
+        if generated or failed:
+            print(f"Stopped after {generated} QR codes ({failed} failed)", file=sys.stderr)
+        return 2
+
+    print(f"Generated {generated} QR codes in {destination} ({failed} failed)")
+    return 1 if failed else 0
+
+
+def _serve_cli(argv):
+    """Run `qrgen serve`: the local HTTP rendering service."""
+    from .server import DEFAULT_MAX_AGE, serve
+
+    parser = argparse.ArgumentParser(prog='qrgen serve',
+                                     description='Serve QR codes over HTTP at /qr?text=...')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on (default: 8000)')
+    parser.add_argument('--cache-size', type=int, default=4096,
+                        help='Rendered images kept in memory (default: 4096)')
+    parser.add_argument('--max-age', type=int, default=DEFAULT_MAX_AGE,
+                        help=f'Cache-Control max-age in seconds (default: {DEFAULT_MAX_AGE})')
+    parser.add_argument('--quiet', action='store_true', help='Disable the access log')
+
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.cache_size, args.max_age, args.quiet)
+    return 0
+
+
+def _daemon_cli(argv):
+    """Run `qrgen daemon`: the warm worker process that qrgen forwards single codes to."""
+    from .daemon import DISABLE_ENV, SOCKET_ENV, default_socket_path, run_daemon, send_request
+
+    parser = argparse.ArgumentParser(
+        prog='qrgen daemon',
+        description='Keep a warm qrgen process on a Unix socket; qrgen forwards single '
+                    f'codes to it while it runs (set {DISABLE_ENV}=1 or pass --no-daemon '
+                    'to opt out).')
+    parser.add_argument('--socket', default=None,
+                        help=f'Socket path (default: ${SOCKET_ENV} or {default_socket_path()})')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--stop', action='store_true', help='Stop the running daemon')
+    action.add_argument('--status', action='store_true', help='Report whether a daemon is running')
+
+    args = parser.parse_args(argv)
+    if args.stop or args.status:
+        response = send_request({'op': 'shutdown' if args.stop else 'ping'}, args.socket,
+                                timeout=5)
+        if response is None or not response.get('ok'):
+            print('No qrgen daemon is running', file=sys.stderr)
+            return 1
+        if args.stop:
+            print('qrgen daemon stopped')
+        else:
+            print(f"qrgen daemon {response['version']} running (pid {response['pid']}, "
+                  f"{response['served']} codes served)")
+        return 0
+
+    import socket
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print('qrgen daemon requires Unix domain sockets', file=sys.stderr)
+        return 2
+    try:
+        run_daemon(args.socket)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
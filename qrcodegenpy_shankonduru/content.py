@@ -0,0 +1,159 @@
+"""
+Content Payload Builders Module
+
+This module turns structured content (an email with a subject, WiFi
+credentials, a contact card, ...) into the text encoded in the QR code. The
+same builders serve the single-code form of the Streamlit app and its bulk
+mode, where each content field is read from a column of an uploaded table.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+# Values of boolean fields read from a table that count as true
+_TRUE_VALUES = {"1", "true", "yes", "y", "on"}
+
+
+def build_text(text):
+    """Return plain text unchanged."""
+    return text
+
+
+def build_url(url):
+    """Return a URL unchanged."""
+    return url
+
+
+def build_email(email, subject="", body=""):
+    """
+    Build a mailto: link.
+
+    Example:
+        >>> build_email("user@example.com", subject="Hi")
+        'mailto:user@example.com?subject=Hi'
+    """
+    content = f"mailto:{email}"
+    params = []
+    if subject:
+        params.append(f"subject={subject}")
+    if body:
+        params.append(f"body={body}")
+    if params:
+        content += "?" + "&".join(params)
+    return content
+
+
+def build_phone(phone):
+    """Build a tel: link, unless phone already is one."""
+    if phone and not phone.startswith("tel:"):
+        return f"tel:{phone}"
+    return phone
+
+
+def build_wifi(ssid, password="", security="WPA", hidden=False):
+    """
+    Build a WIFI: network configuration, or "" without an SSID.
+
+    Args:
+        ssid (str): Network name.
+        password (str, optional): Network password.
+        security (str, optional): "WPA", "WEP" or "nopass". Defaults to "WPA".
+        hidden (bool | str, optional): Hidden network; strings such as "yes" or
+                                      "true" (from a table) count as true.
+
+    Example:
+        >>> build_wifi("Office", "secret")
+        'WIFI:T:WPA;S:Office;P:secret;H:false;;'
+    """
+    if not ssid:
+        return ""
+    if isinstance(hidden, str):
+        hidden = hidden.strip().lower() in _TRUE_VALUES
+    security = security or "WPA"
+    return f"WIFI:T:{security};S:{ssid};P:{password};H:{'true' if hidden else 'false'};;"
+
+
+def build_vcard(full_name, organization="", phone="", email="", url=""):
+    """Build a version 3.0 vCard, or "" without a name."""
+    if not full_name:
+        return ""
+    return f"""BEGIN:VCARD
+VERSION:3.0
+FN:{full_name}
+ORG:{organization}
+TEL:{phone}
+EMAIL:{email}
+URL:{url}
+END:VCARD"""
+
+
+# Content type -> (builder, field names); the first field is required in bulk mode
+CONTENT_TYPES = {
+    "Text": (build_text, ("text",)),
+    "URL": (build_url, ("url",)),
+    "Email": (build_email, ("email", "subject", "body")),
+    "Phone": (build_phone, ("phone",)),
+    "WiFi": (build_wifi, ("ssid", "password", "security", "hidden")),
+    "vCard": (build_vcard, ("full_name", "organization", "phone", "email", "url")),
+}
+
+
+def build_payload(content_type, fields):
+    """
+    Build the payload of content_type from a mapping of field values.
+
+    Args:
+        content_type (str): A key of CONTENT_TYPES.
+        fields (dict): Field name -> value; missing fields are left at their defaults.
+
+    Returns:
+        str: The text to encode.
+
+    Raises:
+        ValueError: If content_type is not supported.
+
+    Example:
+        >>> build_payload("Phone", {"phone": "+1234567890"})
+        'tel:+1234567890'
+    """
+    if content_type not in CONTENT_TYPES:
+        raise ValueError(f"Unsupported content type: {content_type!r} "
+                         f"(expected one of {', '.join(CONTENT_TYPES)})")
+    builder, names = CONTENT_TYPES[content_type]
+    return builder(**{name: fields[name] for name in names if fields.get(name) is not None})
+
+
+def payloads_from_rows(rows, content_type, column_map):
+    """
+    Build one payload per table row, reading each content field from a column.
+
+    Rows whose required (first) field is empty are skipped.
+
+    Args:
+        rows (iterable): dicts of column name -> cell value, e.g. from read_table().
+        content_type (str): A key of CONTENT_TYPES.
+        column_map (dict): Field name -> column name; unmapped fields use their
+                           defaults.
+
+    Yields:
+        str: The payloads, in row order.
+
+    Example:
+        >>> rows = [{"Network": "Office", "Key": "secret"}]
+        >>> list(payloads_from_rows(rows, "WiFi", {"ssid": "Network", "password": "Key"}))
+        ['WIFI:T:WPA;S:Office;P:secret;H:false;;']
+    """
+    if content_type not in CONTENT_TYPES:
+        raise ValueError(f"Unsupported content type: {content_type!r} "
+                         f"(expected one of {', '.join(CONTENT_TYPES)})")
+    required = CONTENT_TYPES[content_type][1][0]
+    for row in rows:
+        fields = {}
+        for name, column in column_map.items():
+            if column is None:
+                continue
+            value = row.get(column)
+            fields[name] = "" if value is None else str(value).strip()
+        if fields.get(required):
+            yield build_payload(content_type, fields)
@@ -0,0 +1,309 @@
+"""
+Warm Worker Daemon Module
+
+Every qrgen invocation starts an interpreter and imports qrcode, Pillow and
+NumPy before it encodes a single module, which dominates the wall time of
+scripts calling qrgen once per code. ``qrgen daemon`` keeps one process with
+everything imported, the version templates built and a generator per set of
+settings ready, listening on a Unix domain socket. While it runs, qrgen
+forwards single-code requests to it and only starts a bare interpreter;
+when no daemon answers it generates in-process as before.
+
+The protocol is one request per connection, one JSON object per line each
+way, so shell scripts can also talk to the socket directly:
+
+    {"op": "generate", "text": "https://example.com", "output_folder": "/abs/out"}
+    {"ok": true, "path": "/abs/out/qr_code_20241001123456000000.png"}
+
+Only the standard library is imported at module level, to keep the client
+side cheap.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+
+from . import __version__
+
+# Environment variables: socket path, and any non-empty value disables forwarding
+SOCKET_ENV = "QRGEN_SOCKET"
+DISABLE_ENV = "QRGEN_NO_DAEMON"
+
+# Seconds a client waits for the daemon to answer one request
+REQUEST_TIMEOUT = 60
+
+# Longest request line accepted, in bytes
+MAX_REQUEST_BYTES = 1 << 20
+
+# Generators kept warm, one per distinct set of settings
+MAX_GENERATORS = 32
+
+# Versions whose templates are built before the socket accepts connections
+WARM_VERSIONS = range(1, 11)
+
+# QRCodeGenerator options a generate request may set
+GENERATOR_OPTIONS = ("file_prefix", "output_folder", "version", "error_correction", "box_size",
+                     "border", "fill_color", "back_color", "image_format", "naming", "kanji",
+                     "mask_pattern", "engine", "png_writer", "png_compression")
+
+
+def default_socket_path():
+    """
+    Return the daemon socket path: $QRGEN_SOCKET, or qrgen-<uid>.sock in
+    $XDG_RUNTIME_DIR (falling back to $TMPDIR or /tmp).
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    folder = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(folder, f"qrgen-{os.getuid()}.sock")
+
+
+def send_request(request, socket_path=None, timeout=REQUEST_TIMEOUT):
+    """
+    Send one request to the daemon and return its response.
+
+    Args:
+        request (dict): The request object, e.g. {"op": "ping"}.
+        socket_path (str, optional): Defaults to default_socket_path().
+        timeout (float, optional): Seconds to wait for the answer. Defaults to 60.
+
+    Returns:
+        dict: The response, or None when no daemon accepts connections on the
+              socket (or the platform has no Unix domain sockets).
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path or default_socket_path()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(timeout)
+        try:
+            client.connect(path)
+        except OSError:
+            # No socket file, or a stale one left by a daemon that has exited
+            return None
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    except OSError as error:
+        # The request may have been handled; report instead of generating twice
+        return {"ok": False, "error": f"qrgen daemon did not answer: {error}"}
+    finally:
+        client.close()
+    if not line:
+        return {"ok": False, "error": "qrgen daemon closed the connection"}
+    return json.loads(line)
+
+
+def forward_generate(text, settings, socket_path=None):
+    """
+    Ask a running daemon to generate and save the code of text.
+
+    Args:
+        text (str): The payload.
+        settings (dict): QRCodeGenerator options; a relative output_folder is
+                         resolved against the current directory.
+        socket_path (str, optional): Defaults to default_socket_path().
+
+    Returns:
+        dict: {"ok": True, "path": ...} or {"ok": False, "error": ...}, or None
+              when forwarding is disabled, no daemon is running or the daemon
+              runs a different package version.
+    """
+    if os.environ.get(DISABLE_ENV):
+        return None
+    request = dict(settings, op="generate", text=text, client_version=__version__)
+    if request.get("output_folder") is not None:
+        request["output_folder"] = os.path.abspath(request["output_folder"])
+    response = send_request(request, socket_path)
+    if response is not None and response.get("fallback"):
+        return None
+    return response
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request line and write one JSON response line."""
+
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+        if not line:
+            return
+        if len(line) > MAX_REQUEST_BYTES:
+            response = {"ok": False, "error": "request too large"}
+        else:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as error:
+                response = {"ok": False, "error": f"invalid request: {error}"}
+            else:
+                response = self.server.process(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Unix socket server generating QR codes with warm, reused generators.
+
+    Each connection is served by its own thread. Generators are cached per set
+    of settings (at most MAX_GENERATORS) and reused across requests. The
+    socket is created readable and writable by the owner only.
+
+    Attributes:
+        socket_path (str): Path of the listening socket.
+        served (int): Codes generated since the daemon started.
+
+    Example:
+        >>> server = DaemonServer("/tmp/qrgen.sock")
+        >>> server.warm_up()
+        >>> server.serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path=None):
+        """
+        Bind the socket, replacing a stale socket file left by an exited daemon.
+
+        Args:
+            socket_path (str, optional): Defaults to default_socket_path().
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the socket.
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.served = 0
+        self._generators = OrderedDict()
+        self._lock = threading.Lock()
+        _remove_stale_socket(self.socket_path)
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(self.socket_path, DaemonRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def warm_up(self):
+        """Import the generator and build the templates of the common versions."""
+        from .qr_generator import QRCodeGenerator
+
+        for version in WARM_VERSIONS:
+            QRCodeGenerator(output_folder=None, version=version).generate_qr_bytes("warm-up")
+        QRCodeGenerator(output_folder=None, png_writer="builtin").generate_qr_bytes("warm-up")
+
+    def _generator(self, settings):
+        """Return the cached generator for settings, creating it if needed."""
+        from .qr_generator import QRCodeGenerator
+
+        key = tuple(sorted(settings.items()))
+        with self._lock:
+            generator = self._generators.get(key)
+            if generator is not None:
+                self._generators.move_to_end(key)
+                return generator
+        generator = QRCodeGenerator(**settings)
+        with self._lock:
+            self._generators[key] = generator
+            while len(self._generators) > MAX_GENERATORS:
+                self._generators.popitem(last=False)
+        return generator
+
+    def process(self, request):
+        """
+        Answer one request.
+
+        Operations: "generate" (the default) saves one code and returns its
+        path, "ping" reports the daemon's pid, version and count, and
+        "shutdown" stops the daemon after answering.
+
+        Returns:
+            dict: The response; "ok" is False with an "error" message on failure.
+        """
+        op = request.get("op", "generate")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "version": __version__,
+                    "served": self.served}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if op != "generate":
+            return {"ok": False, "error": f"unknown op: {op!r}"}
+
+        client_version = request.get("client_version")
+        if client_version is not None and client_version != __version__:
+            # Let the client generate in-process with its own code
+            return {"ok": False, "fallback": True,
+                    "error": f"daemon runs version {__version__}, client {client_version}"}
+
+        text = request.get("text")
+        if not isinstance(text, str):
+            return {"ok": False, "error": "text must be a string"}
+        settings = {name: request[name] for name in GENERATOR_OPTIONS if name in request}
+        if settings.get("output_folder") is None:
+            return {"ok": False, "error": "output_folder is required"}
+        try:
+            generator = self._generator(settings)
+            # The folder may have been removed since the generator created it
+            os.makedirs(generator.output_folder, exist_ok=True)
+            path = generator.generate_qr_code(text)
+        except Exception as error:
+            return {"ok": False, "error": str(error) or type(error).__name__}
+        with self._lock:
+            self.served += 1
+        return {"ok": True, "path": path}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_stale_socket(path):
+    """Delete a socket file nobody listens on; refuse if a daemon still does."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"A qrgen daemon is already running on {path}")
+    finally:
+        probe.close()
+
+
+def run_daemon(socket_path=None):
+    """
+    Run the daemon in the foreground until interrupted, stopped or terminated.
+
+    Args:
+        socket_path (str, optional): Defaults to default_socket_path().
+    """
+    import signal
+
+    server = DaemonServer(socket_path)
+    server.warm_up()
+
+    def terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, terminate)
+    print(f"qrgen daemon {__version__} listening on {server.socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,132 @@
+"""
+Output Directory Layout Module
+
+This module spreads generated files over a fixed tree of shard directories
+instead of one flat output folder. Very large flat directories make lookups
+and listings slow on most filesystems; a two-level hex fan-out keeps every
+directory small. All shard directories are created once, up front, so writing
+a file never has to check or create its directory.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import hashlib
+import os
+from itertools import product
+
+from .naming import _payload_bytes
+
+# Shard keys supported by ShardedLayout
+SHARD_KEYS = ("hash", "sequence")
+
+# Upper bound on hex digits across all levels (16**4 = 65,536 directories)
+MAX_SHARD_DIGITS = 4
+
+HEX_DIGITS = "0123456789abcdef"
+
+
+class ShardedLayout:
+    """
+    Two-level (by default) hex fan-out of output files.
+
+    With ``key="hash"`` a file is placed by the SHA-256 of its payload, so the same
+    payload always lands in the same shard. With ``key="sequence"`` files are
+    dealt round-robin by their sequence number, which spreads them evenly even
+    when payloads repeat.
+
+    Attributes:
+        key (str): "hash" or "sequence".
+        levels (int): Number of directory levels.
+        width (int): Hex digits per level.
+
+    Example:
+        >>> generator = QRCodeGenerator("tag", "tags", layout=ShardedLayout())
+        >>> generator.generate_qr_code("A-1")
+        'tags/3f/9a/tag_20241001123456123456.png'
+    """
+
+    def __init__(self, key="hash", levels=2, width=2):
+        """
+        Initialize the layout.
+
+        Args:
+            key (str, optional): "hash" or "sequence". Defaults to "hash".
+            levels (int, optional): Directory levels. Defaults to 2.
+            width (int, optional): Hex digits per level. Defaults to 2 (256 entries
+                                 per directory, 65,536 shards in total).
+
+        Raises:
+            ValueError: If key is unknown or the fan-out is out of range.
+        """
+        if key not in SHARD_KEYS:
+            raise ValueError(f"Unsupported shard key: {key!r} (expected one of {SHARD_KEYS})")
+        if levels < 1 or width < 1:
+            raise ValueError("levels and width must be at least 1")
+        if levels * width > MAX_SHARD_DIGITS:
+            raise ValueError(f"levels * width must be at most {MAX_SHARD_DIGITS} hex digits")
+        self.key = key
+        self.levels = levels
+        self.width = width
+        self._digits = levels * width
+        # Every relative shard path, indexed by its hex value, so placing a file
+        # is a list lookup rather than a path join
+        self._paths = [
+            os.path.join(*("".join(level) for level in _split(digits, width)))
+            for digits in product(HEX_DIGITS, repeat=self._digits)
+        ]
+
+    @property
+    def shard_count(self):
+        """int: Total number of leaf shard directories."""
+        return len(self._paths)
+
+    def prepare(self, root):
+        """
+        Create every shard directory under root.
+
+        Existing directories are left untouched, so preparing an already
+        populated tree is safe.
+
+        Args:
+            root (str): The output folder.
+        """
+        os.makedirs(root, exist_ok=True)
+        parents = [root]
+        for _ in range(self.levels):
+            children = []
+            for parent in parents:
+                for digits in product(HEX_DIGITS, repeat=self.width):
+                    child = os.path.join(parent, "".join(digits))
+                    try:
+                        os.mkdir(child)
+                    except FileExistsError:
+                        pass
+                    children.append(child)
+            parents = children
+
+    def shard(self, payload, sequence):
+        """
+        Return the relative shard directory for a file.
+
+        Args:
+            payload: The encoded text or bytes (used by the "hash" key); other
+                     values are hashed as their str().
+            sequence (int): The file's sequence number (used by the "sequence" key).
+
+        Returns:
+            str: Relative directory such as "3f/9a".
+        """
+        if self.key == "hash":
+            digest = hashlib.sha256(_payload_bytes(payload)).hexdigest()
+            return self._paths[int(digest[:self._digits], 16)]
+        return self._paths[sequence % len(self._paths)]
+
+    def __repr__(self):
+        return f"ShardedLayout(key={self.key!r}, levels={self.levels}, width={self.width})"
+
+
+def _split(digits, width):
+    """Split a digit tuple into consecutive groups of width digits."""
+    return [digits[start:start + width] for start in range(0, len(digits), width)]
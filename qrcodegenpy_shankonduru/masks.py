@@ -0,0 +1,261 @@
+"""
+Mask Pattern Evaluation Module
+
+This module chooses the data mask of a QR code with NumPy. qrcode's
+``best_mask_pattern`` builds the complete matrix eight times and scores each
+one with four pure-Python penalty rules, which dominates the cost of
+``make()`` for larger versions. Here the unmasked matrix is built once, the
+eight candidates are stacked into one (8, n, n) array and every penalty rule
+is evaluated for all of them at once:
+
+- N1: runs of five or more same-colored modules, from windows of five.
+- N2: 2x2 blocks of one color, from shifted comparisons.
+- N3: 1:1:3:1:1 finder-like patterns, from shifted window tests.
+- N4: deviation of the dark module ratio from 50%.
+
+The rules reproduce qrcode's ``util.lost_point`` exactly, including scoring
+the candidates with light format and version areas, so the chosen mask and
+the final matrix are identical to qrcode's. The codewords are placed through
+the version templates of the templates module instead of ``makeImpl``.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+from qrcode import util
+
+from .matrix import ModuleMatrix
+from .templates import get_template
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is an optional speed-up
+    numpy = None
+
+# Mask stacks per matrix size
+_mask_cache = {}
+
+# Modules of candidate matrices scored at once by make_matrices()
+_CANDIDATE_MODULES = 1 << 22
+
+
+def _mask_stack(size):
+    """Return a bool array (8, size, size) of where each mask pattern inverts modules."""
+    stack = _mask_cache.get(size)
+    if stack is None:
+        i, j = numpy.indices((size, size))
+        stack = numpy.stack([
+            (i + j) % 2 == 0,
+            i % 2 == 0,
+            j % 3 == 0,
+            (i + j) % 3 == 0,
+            (i // 2 + j // 3) % 2 == 0,
+            (i * j) % 2 + (i * j) % 3 == 0,
+            ((i * j) % 2 + (i * j) % 3) % 2 == 0,
+            ((i * j) % 3 + (i + j) % 2) % 2 == 0,
+        ])
+        _mask_cache[size] = stack
+    return stack
+
+
+def _count(flags):
+    """Return the number of set flags of each candidate: flags has shape (count, ...)."""
+    return numpy.count_nonzero(flags.reshape(len(flags), -1), axis=1)
+
+
+def _run_penalty(lines):
+    """Rule N1 for each candidate: lines has shape (count, rows, size)."""
+    # A run of n >= 5 modules scores n - 2: one point per window of five equal
+    # modules (n - 4 windows) plus two for the window that starts the run
+    same = lines[:, :, 1:] == lines[:, :, :-1]
+    windows = same[:, :, :-3] & same[:, :, 1:-2] & same[:, :, 2:-1] & same[:, :, 3:]
+    starts = windows.copy()
+    starts[:, :, 1:] &= ~same[:, :, :-4]
+    return _count(windows) + 2 * _count(starts)
+
+
+def _finder_penalty(lines):
+    """Rule N3 for each candidate: lines has shape (count, rows, size)."""
+    size = lines.shape[2]
+    if size < 11:
+        return numpy.zeros(lines.shape[0], dtype=numpy.int64)
+    light = ~lines
+    # Dark-light-dark-dark-dark-light-dark core, and four light modules in a row
+    core = (lines[:, :, :size - 6] & light[:, :, 1:size - 5] & lines[:, :, 2:size - 4]
+            & lines[:, :, 3:size - 3] & lines[:, :, 4:size - 2] & light[:, :, 5:size - 1]
+            & lines[:, :, 6:])
+    quiet = ~(lines[:, :, :size - 3] | lines[:, :, 1:size - 2] | lines[:, :, 2:size - 1]
+              | lines[:, :, 3:])
+    width = size - 10
+    # 1011101 0000 and 0000 1011101, the two 11-module windows qrcode matches
+    matches = (_count(core[:, :, :width] & quiet[:, :, 7:7 + width])
+               + _count(quiet[:, :, :width] & core[:, :, 4:4 + width]))
+    return matches * 40
+
+
+def penalty_scores(candidates):
+    """
+    Return the qrcode lost_point of each matrix in candidates.
+
+    Args:
+        candidates: bool array of shape (count, n, n).
+
+    Returns:
+        list: One integer score per candidate.
+    """
+    size = candidates.shape[1]
+    columns = candidates.transpose(0, 2, 1)
+
+    scores = _run_penalty(candidates) + _run_penalty(columns)
+
+    top_left = candidates[:, :-1, :-1]
+    blocks = ((top_left == candidates[:, :-1, 1:]) & (top_left == candidates[:, 1:, :-1])
+              & (top_left == candidates[:, 1:, 1:]))
+    scores = scores + _count(blocks) * 3
+
+    scores = scores + _finder_penalty(candidates) + _finder_penalty(columns)
+
+    # Same float arithmetic as qrcode's _lost_point_level4
+    percent = _count(candidates) / (size ** 2)
+    scores = scores + (numpy.abs(percent * 100 - 50) / 5).astype(numpy.int64) * 10
+    return scores.tolist()
+
+
+def _codewords(qr):
+    """Return qr's final codewords, computing them with qrcode if not cached."""
+    if qr.data_cache is None:
+        qr.data_cache = util.create_data(qr.version, qr.error_correction, qr.data_list)
+    return qr.data_cache
+
+
+def _store(qr, matrix):
+    """Set qr.modules from a final bool matrix, as makeImpl() would."""
+    qr.modules_count = matrix.shape[0]
+    qr.modules = matrix.tolist()
+
+
+def make_with_best_mask(qr):
+    """
+    Build qr.modules with the lowest-penalty mask, as qr.make(fit=False) would.
+
+    qr must have its version and data set. Without NumPy this falls back to
+    qrcode's own implementation.
+
+    Returns:
+        int: The mask pattern used.
+    """
+    if numpy is None:
+        pattern = qr.best_mask_pattern()
+        qr.makeImpl(False, pattern)
+        return pattern
+
+    matrix, pattern = _final_matrix(qr, None)
+    _store(qr, matrix)
+    return pattern
+
+
+def make_with_mask(qr, mask_pattern):
+    """
+    Build qr.modules with the given mask, as qr.makeImpl(False, mask_pattern) would.
+
+    Returns:
+        int: mask_pattern.
+    """
+    if numpy is None:
+        qr.makeImpl(False, mask_pattern)
+        return mask_pattern
+
+    matrix, _ = _final_matrix(qr, mask_pattern)
+    _store(qr, matrix)
+    return mask_pattern
+
+
+def build_matrix(qr, mask_pattern=None):
+    """
+    Return the final matrix of qr as a compact ModuleMatrix.
+
+    This is make_with_best_mask() (or make_with_mask() when mask_pattern is
+    given) without the nested lists: qr.modules is left untouched when NumPy
+    is available.
+
+    Returns:
+        ModuleMatrix: The masked matrix with its format and version information.
+    """
+    if numpy is None:
+        if mask_pattern is None:
+            make_with_best_mask(qr)
+        else:
+            make_with_mask(qr, mask_pattern)
+        return ModuleMatrix.from_rows(qr.modules)
+
+    matrix, _ = _final_matrix(qr, mask_pattern)
+    return ModuleMatrix.from_array(matrix)
+
+
+def _final_matrix(qr, mask_pattern):
+    """Return qr's final bool matrix and its mask, the best one if mask_pattern is None."""
+    template = get_template(qr.version)
+    matrix = template.place(_codewords(qr))
+    if mask_pattern is None:
+        matrix, mask_pattern = _choose_mask(template, matrix)
+    else:
+        matrix ^= _mask_stack(template.size)[mask_pattern] & template.data_area
+    template.finish(matrix, qr.error_correction, mask_pattern)
+    return matrix, mask_pattern
+
+
+def _choose_mask(template, unmasked):
+    """Return the lowest-penalty masked matrix and its mask pattern."""
+    # Candidates are scored with light format and version areas, as qrcode does
+    candidates = unmasked ^ (_mask_stack(template.size) & template.data_area)
+    scores = penalty_scores(candidates)
+    best = scores.index(min(scores))
+    return candidates[best], best
+
+
+def make_matrices(version, error_correction, codeword_lists, mask_pattern=None):
+    """
+    Build the final matrices of many codes of the same version.
+
+    The codewords are placed with one scatter through the version template,
+    then each code gets its best mask (or mask_pattern) and its format and
+    version information. NumPy is required.
+
+    Args:
+        version (int): QR code version shared by every code (1-40).
+        error_correction (int): qrcode error correction constant.
+        codeword_lists (list): Final codewords of each code, e.g. from
+                               reed_solomon.create_data_batch().
+        mask_pattern (int, optional): Mask for every code. Defaults to None
+                                      (the best mask of each code).
+
+    Returns:
+        tuple: (matrices, mask_patterns): a bool (count, size, size) array and
+               the mask used for each code.
+
+    Example:
+        >>> codewords = create_data_batch(5, ERROR_CORRECT_M, data_lists)
+        >>> matrices, patterns = make_matrices(5, ERROR_CORRECT_M, codewords)
+    """
+    template = get_template(version)
+    matrices = template.place_batch(codeword_lists)
+    masks = _mask_stack(template.size) & template.data_area
+    if mask_pattern is not None:
+        matrices ^= masks[mask_pattern]
+        template.finish(matrices, error_correction, mask_pattern)
+        return matrices, [mask_pattern] * len(matrices)
+
+    # Score the eight candidates of many codes in one pass, in chunks that keep
+    # the candidate stack (and the penalty rules' temporaries) a few MB
+    patterns = []
+    chunk = max(1, _CANDIDATE_MODULES // (8 * template.size ** 2))
+    for start in range(0, len(matrices), chunk):
+        group = matrices[start:start + chunk]
+        candidates = group[:, None] ^ masks
+        scores = numpy.array(penalty_scores(candidates.reshape((-1,) + masks.shape[1:])))
+        best = scores.reshape(len(group), 8).argmin(axis=1)
+        group[...] = candidates[numpy.arange(len(group)), best]
+        patterns.extend(best.tolist())
+    template.finish(matrices, error_correction, patterns)
+    return matrices, patterns
@@ -0,0 +1,153 @@
+"""
+Compact Module Matrix Module
+
+This module provides ModuleMatrix, a read-only, bit-packed QR code matrix.
+qrcode keeps modules as nested lists of True/False, which costs about 8 bytes
+of pointer per module plus a list per row: a version 20 matrix (97x97) takes
+around 80 KB. Packed one bit per module, eight modules per byte and rows padded
+to whole bytes, it takes 1.3 KB, so large batches of matrices can be kept in
+memory at once.
+
+The packed bytes are exposed without copying, as a memoryview or a NumPy
+uint8 view, for the rasterizer and the vector serializers. For code written
+against qrcode's nested lists, a ModuleMatrix also supports len(), iteration
+over rows, ``matrix[row][col]`` and comparison with nested lists.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is an optional speed-up
+    numpy = None
+
+
+class ModuleMatrix:
+    """
+    An immutable square matrix of modules packed eight per byte.
+
+    Row r occupies bytes [r * stride, (r + 1) * stride), most significant bit
+    first, with 1 for a dark module. Padding bits at the end of a row are 0.
+
+    Attributes:
+        size (int): Modules per side.
+        stride (int): Bytes per packed row.
+
+    Example:
+        >>> matrix = ModuleMatrix.from_rows(qr.modules)
+        >>> matrix.nbytes, matrix[0][0]
+        (63, True)
+    """
+
+    __slots__ = ("size", "stride", "_data")
+
+    def __init__(self, size, data):
+        """
+        Wrap already packed rows.
+
+        Args:
+            size (int): Modules per side.
+            data (bytes): size rows of (size + 7) // 8 bytes each.
+
+        Raises:
+            ValueError: If data does not have the packed length of size.
+        """
+        stride = (size + 7) // 8
+        data = bytes(data)
+        if len(data) != size * stride:
+            raise ValueError(f"Expected {size * stride} bytes for a {size}x{size} matrix "
+                             f"(got {len(data)})")
+        self.size = size
+        self.stride = stride
+        self._data = data
+
+    @classmethod
+    def from_array(cls, array):
+        """Pack a 2-D NumPy array of truthy (dark) / falsy (light) modules."""
+        array = numpy.asarray(array, dtype=bool)
+        return cls(array.shape[0], numpy.packbits(array, axis=1).tobytes())
+
+    @classmethod
+    def from_stack(cls, arrays):
+        """Pack a 3-D NumPy array of same-size matrices with one call, returning a list."""
+        arrays = numpy.asarray(arrays, dtype=bool)
+        packed = numpy.packbits(arrays, axis=2)
+        return [cls(arrays.shape[1], rows.tobytes()) for rows in packed]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Pack nested lists of truthy (dark) / falsy (light) modules, e.g. qr.modules."""
+        size = len(rows)
+        stride = (size + 7) // 8
+        padding = "0" * (stride * 8 - size)
+        data = b"".join(
+            int("".join("1" if module else "0" for module in row) + padding, 2)
+            .to_bytes(stride, "big")
+            for row in rows
+        )
+        return cls(size, data)
+
+    @property
+    def packed(self):
+        """memoryview: The packed rows, without copying."""
+        return memoryview(self._data)
+
+    @property
+    def nbytes(self):
+        """int: Size of the packed data in bytes."""
+        return len(self._data)
+
+    def packed_array(self):
+        """Return a read-only uint8 (size, stride) NumPy view of the packed rows."""
+        return numpy.frombuffer(self._data, dtype=numpy.uint8).reshape(self.size, self.stride)
+
+    def to_array(self):
+        """Return the modules as a new bool (size, size) NumPy array."""
+        return numpy.unpackbits(self.packed_array(), axis=1, count=self.size).view(bool)
+
+    def bit_strings(self):
+        """Yield each row as a string of "1" (dark) and "0" (light) characters."""
+        data = self._data
+        stride = self.stride
+        width = stride * 8
+        size = self.size
+        for start in range(0, len(data), stride):
+            value = int.from_bytes(data[start:start + stride], "big")
+            yield format(value, f"0{width}b")[:size]
+
+    def to_lists(self):
+        """Return the modules as nested lists of bools, like qrcode's QRCode.modules."""
+        return [[bit == "1" for bit in row] for row in self.bit_strings()]
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for row in self.bit_strings():
+            yield [bit == "1" for bit in row]
+
+    def __getitem__(self, row):
+        """Return one row as a list of bools (negative indices count from the end)."""
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError("matrix row out of range")
+        start = row * self.stride
+        value = int.from_bytes(self._data[start:start + self.stride], "big")
+        bits = format(value, f"0{self.stride * 8}b")
+        return [bit == "1" for bit in bits[:self.size]]
+
+    def __eq__(self, other):
+        if isinstance(other, ModuleMatrix):
+            return self.size == other.size and self._data == other._data
+        if isinstance(other, list):
+            return self.to_lists() == [[bool(module) for module in row] for row in other]
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.size, self._data))
+
+    def __repr__(self):
+        return f"ModuleMatrix(size={self.size}, nbytes={self.nbytes})"
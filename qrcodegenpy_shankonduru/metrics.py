@@ -0,0 +1,278 @@
+"""
+Generation Metrics Module
+
+This module provides the instrumentation surface of QRCodeGenerator. Given an
+``observer``, the generator times each stage of a call and passes a
+StageTimings record to the observer once the code is produced:
+
+- cache: looking the payload up in the RenderCache (only with a cache)
+- segment: splitting the payload into segments and choosing the version
+- make: computing the codewords, placing them and selecting the mask
+- render: rasterizing, or serializing SVG/PDF/builtin PNG output
+- save: writing the file; with the Pillow writer this includes PNG encoding
+
+MetricsCollector is a ready-made, thread-safe observer that aggregates the
+records into histograms and exports them in the Prometheus text exposition
+format or as JSON. Without an observer nothing is timed and the generator
+runs the same code as before.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import json
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+from time import perf_counter
+
+from .naming import _payload_bytes
+
+# Upper bounds of the duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                    0.25, 0.5, 1.0, 2.5)
+
+# Upper bounds of the payload size histogram buckets, in UTF-8 bytes
+PAYLOAD_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+class StageTimings(namedtuple("StageTimings", ["payload_size", "version", "image_format",
+                                               "cached", "stages", "total"])):
+    """
+    Timings of one generated QR code, as passed to a QRCodeGenerator observer.
+
+    Attributes:
+        payload_size (int): Length of the payload in bytes (UTF-8 unless given as bytes).
+        version (int): QR code version used, or None when served from the cache.
+        image_format (str): Output format, e.g. "PNG".
+        cached (bool): True if the image came from the RenderCache.
+        stages (dict): Seconds spent in each stage that ran, by stage name.
+        total (float): Seconds from the start of the call to the end of the last stage.
+    """
+
+    __slots__ = ()
+
+
+class StageClock:
+    """
+    Stopwatch splitting one generator call into stages.
+
+    Example:
+        >>> clock = StageClock()
+        >>> clock.lap("segment")
+        >>> list(clock.stages)
+        ['segment']
+    """
+
+    __slots__ = ("stages", "cached", "_start", "_last")
+
+    def __init__(self):
+        self.stages = {}
+        self.cached = False
+        self._start = self._last = perf_counter()
+
+    def lap(self, stage):
+        """Charge the time since the previous lap (or the start) to stage."""
+        now = perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def resume(self):
+        """Restart the lap timer without charging the time since the previous lap."""
+        now = perf_counter()
+        self._start += now - self._last
+        self._last = now
+
+    def charge(self, stage, seconds):
+        """
+        Charge seconds measured elsewhere (e.g. a share of a batch) to stage.
+
+        The time since the previous lap is not counted, so the total stays the
+        sum of the stages.
+        """
+        self.resume()
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self._start -= seconds
+
+    def timings(self, input_string, version, image_format):
+        """Return the StageTimings of the finished call."""
+        return StageTimings(len(_payload_bytes(input_string)),
+                            None if self.cached else version, image_format, self.cached,
+                            self.stages, self._last - self._start)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram, with the same bucket semantics as Prometheus.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the finite buckets, ascending.
+        count (int): Number of observed values.
+        sum (float): Sum of the observed values.
+    """
+
+    __slots__ = ("buckets", "count", "sum", "_counts")
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.count = 0
+        self.sum = 0.0
+        # One counter per finite bucket plus the +Inf bucket
+        self._counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value):
+        """Add value to the bucket with the smallest upper bound >= value."""
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Return [(upper_bound, count of values <= upper_bound)], ending with +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_dict(self):
+        """Return count, sum, mean and the cumulative bucket counts keyed by bound."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "buckets": {_format_bound(bound): count for bound, count in self.cumulative()},
+        }
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class MetricsCollector:
+    """
+    Thread-safe observer aggregating StageTimings into histograms.
+
+    Records a duration histogram per stage and for whole calls, a payload size
+    histogram, a count of codes per QR version and the number of cache hits.
+    One collector can be shared by any number of generators and threads.
+
+    Example:
+        >>> metrics = MetricsCollector()
+        >>> generator = QRCodeGenerator(observer=metrics)
+        >>> generator.generate_qr_code("https://example.com")
+        >>> print(metrics.to_prometheus())
+    """
+
+    def __init__(self, duration_buckets=DURATION_BUCKETS, payload_buckets=PAYLOAD_BUCKETS,
+                 namespace="qrgen"):
+        """
+        Initialize an empty collector.
+
+        Args:
+            duration_buckets (tuple, optional): Duration bucket bounds in seconds.
+            payload_buckets (tuple, optional): Payload size bucket bounds in bytes.
+            namespace (str, optional): Prefix of the exported metric names.
+                                       Defaults to "qrgen".
+        """
+        self.duration_buckets = tuple(duration_buckets)
+        self.payload_buckets = tuple(payload_buckets)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._stages = {}
+            self._total = Histogram(self.duration_buckets)
+            self._payload = Histogram(self.payload_buckets)
+            self._versions = {}
+            self._cache_hits = 0
+
+    def observe(self, timings):
+        """
+        Record the timings of one generated code.
+
+        Args:
+            timings (StageTimings): As passed by QRCodeGenerator to its observer.
+        """
+        with self._lock:
+            for stage, seconds in timings.stages.items():
+                histogram = self._stages.get(stage)
+                if histogram is None:
+                    histogram = self._stages[stage] = Histogram(self.duration_buckets)
+                histogram.observe(seconds)
+            self._total.observe(timings.total)
+            self._payload.observe(timings.payload_size)
+            if timings.cached:
+                self._cache_hits += 1
+            else:
+                self._versions[timings.version] = self._versions.get(timings.version, 0) + 1
+
+    __call__ = observe
+
+    def snapshot(self):
+        """
+        Return everything recorded so far as plain data.
+
+        Returns:
+            dict: "codes", "cache_hits", "stages" (histogram dicts by stage),
+                  "total" and "payload_bytes" histograms and "versions" counts.
+        """
+        with self._lock:
+            return {
+                "codes": self._total.count,
+                "cache_hits": self._cache_hits,
+                "stages": {stage: histogram.to_dict()
+                           for stage, histogram in sorted(self._stages.items())},
+                "total": self._total.to_dict(),
+                "payload_bytes": self._payload.to_dict(),
+                "versions": {str(version): count
+                             for version, count in sorted(self._versions.items())},
+            }
+
+    def to_json(self, indent=None):
+        """Return snapshot() serialized as JSON."""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self):
+        """
+        Return the metrics in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            str: Metric families <namespace>_stage_duration_seconds,
+                 _duration_seconds, _payload_bytes, _codes_total and _cache_hits_total.
+        """
+        name = self.namespace
+        with self._lock:
+            lines = [f"# HELP {name}_stage_duration_seconds Time spent in each generation stage.",
+                     f"# TYPE {name}_stage_duration_seconds histogram"]
+            for stage, histogram in sorted(self._stages.items()):
+                lines.extend(_histogram_lines(f"{name}_stage_duration_seconds", histogram,
+                                              f'stage="{stage}",'))
+            lines += [f"# HELP {name}_duration_seconds Time spent generating each code.",
+                      f"# TYPE {name}_duration_seconds histogram"]
+            lines.extend(_histogram_lines(f"{name}_duration_seconds", self._total))
+            lines += [f"# HELP {name}_payload_bytes Size of the encoded payloads.",
+                      f"# TYPE {name}_payload_bytes histogram"]
+            lines.extend(_histogram_lines(f"{name}_payload_bytes", self._payload))
+            lines += [f"# HELP {name}_codes_total Codes encoded, by QR version.",
+                      f"# TYPE {name}_codes_total counter"]
+            lines.extend(f'{name}_codes_total{{version="{version}"}} {count}'
+                         for version, count in sorted(self._versions.items()))
+            lines += [f"# HELP {name}_cache_hits_total Codes served from the render cache.",
+                      f"# TYPE {name}_cache_hits_total counter",
+                      f"{name}_cache_hits_total {self._cache_hits}"]
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name, histogram, labels=""):
+    """Yield the _bucket, _sum and _count samples of one histogram."""
+    for bound, count in histogram.cumulative():
+        yield f'{name}_bucket{{{labels}le="{_format_bound(bound)}"}} {count}'
+    labels = labels.rstrip(",")
+    suffix = f"{{{labels}}}" if labels else ""
+    yield f"{name}_sum{suffix} {histogram.sum!r}"
+    yield f"{name}_count{suffix} {histogram.count}"
@@ -0,0 +1,199 @@
+"""
+File Naming Strategies Module
+
+This module provides the strategies QRCodeGenerator uses to name output files.
+A strategy turns (prefix, payload, index) into a file stem; the generator adds
+the folder and the extension.
+
+- TimestampNaming: ``<prefix>_<YYYYmmddHHMMSSffffff>``, the historical default.
+  Two writers in the same microsecond get the same name.
+- CounterNaming: ``<prefix>_<pid>-<start>_<counter>``. Unique across threads,
+  worker processes and runs without touching the filesystem.
+- HashNaming: ``<prefix>_<sha256 of payload>``. The same payload always maps
+  to the same file, so re-running a batch overwrites instead of duplicating.
+- KeyNaming: ``<prefix>_<key(payload, index)>`` for caller-supplied keys.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import os
+import time
+from itertools import count
+
+
+def _payload_bytes(payload):
+    """Return payload as bytes: bytes-like as is, anything else as UTF-8 of its str()."""
+    if isinstance(payload, (bytes, bytearray)):
+        return bytes(payload)
+    return str(payload).encode("utf-8")
+
+
+def _new_process_token():
+    return f"{os.getpid()}-{time.time_ns() // 1000:x}"
+
+
+# Identifies the current process, and the counter shared by every
+# CounterNaming in it; both are replaced in every forked child
+_process_token = _new_process_token()
+_process_counter = count()
+
+
+def _after_fork():
+    global _process_token, _process_counter
+    _process_token = _new_process_token()
+    _process_counter = count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+class TimestampNaming:
+    """
+    Name files after the current time, with microsecond resolution.
+
+    This is the default strategy and matches the names produced by earlier
+    releases. It is not collision-free under concurrent writes; use
+    CounterNaming for that.
+    """
+
+    def name(self, prefix, payload, index):
+        """Return the file stem for the next file."""
+        # Imported here so that the command line can list strategies without it
+        from datetime import datetime
+
+        return f"{prefix}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+
+    def __repr__(self):
+        return "TimestampNaming()"
+
+
+class CounterNaming:
+    """
+    Name files with a per-process token and a monotonic counter.
+
+    The token combines the process id with the time the process started (in
+    microseconds), so two processes can never share it: worker processes,
+    forked children and later runs that reuse a pid all get their own. Within a
+    process every CounterNaming draws from one itertools.count, whose increments
+    are atomic, so neither threads nor separate generators writing to the same
+    folder receive the same number. No strftime and no filesystem checks are
+    involved.
+
+    Example:
+        >>> generator = QRCodeGenerator("tag", "tags", naming=CounterNaming())
+        >>> generator.generate_qr_code("A-1")
+        'tags/tag_4242-18f3a9c2d1e_00000000.png'
+    """
+
+    def __init__(self, width=8):
+        """
+        Initialize the strategy.
+
+        Args:
+            width (int, optional): Minimum digits of the counter. Defaults to 8.
+        """
+        self.width = width
+
+    def name(self, prefix, payload, index):
+        """Return the file stem for the next file."""
+        return f"{prefix}_{_process_token}_{next(_process_counter):0{self.width}d}"
+
+    def __repr__(self):
+        return f"CounterNaming(width={self.width})"
+
+
+class HashNaming:
+    """
+    Name files after the SHA-256 of their payload.
+
+    Distinct payloads get distinct names and identical payloads share one file,
+    which makes batch re-runs idempotent. The generator settings are not part
+    of the name, so use one output folder per set of settings.
+    """
+
+    def __init__(self, length=16):
+        """
+        Initialize the strategy.
+
+        Args:
+            length (int, optional): Hex digits of the digest kept (8-64). Defaults to 16.
+        """
+        if not 8 <= length <= 64:
+            raise ValueError(f"length must be between 8 and 64 (got {length})")
+        self.length = length
+
+    def name(self, prefix, payload, index):
+        """Return the file stem for payload."""
+        import hashlib
+
+        digest = hashlib.sha256(_payload_bytes(payload)).hexdigest()
+        return f"{prefix}_{digest[:self.length]}"
+
+    def __repr__(self):
+        return f"HashNaming(length={self.length})"
+
+
+class KeyNaming:
+    """
+    Name files with a key computed by the caller, e.g. a SKU or database id.
+
+    Keys must be unique within the output folder; that is the caller's
+    responsibility. Keys containing path separators are rejected.
+
+    Example:
+        >>> skus = {"https://shop/p/1": "SKU-1"}
+        >>> naming = KeyNaming(lambda payload, index: skus[payload])
+    """
+
+    def __init__(self, key):
+        """
+        Initialize the strategy.
+
+        Args:
+            key (callable): key(payload, index) -> str. index is None outside of
+                            batch/pipeline generation.
+        """
+        self.key = key
+
+    def name(self, prefix, payload, index):
+        """Return the file stem for payload."""
+        key = str(self.key(payload, index))
+        if not key or "/" in key or os.sep in key or key in (".", ".."):
+            raise ValueError(f"Invalid file key: {key!r}")
+        return f"{prefix}_{key}"
+
+    def __repr__(self):
+        return f"KeyNaming({self.key!r})"
+
+
+# Strategies selectable by name, e.g. from the command line
+NAMING_STRATEGIES = {
+    "timestamp": TimestampNaming,
+    "counter": CounterNaming,
+    "hash": HashNaming,
+}
+
+
+def get_naming(naming):
+    """
+    Return a naming strategy instance.
+
+    Args:
+        naming: None (timestamp), a strategy name from NAMING_STRATEGIES, or an
+                object with a name(prefix, payload, index) method.
+
+    Raises:
+        ValueError: If naming is an unknown strategy name.
+    """
+    if naming is None:
+        return TimestampNaming()
+    if isinstance(naming, str):
+        try:
+            return NAMING_STRATEGIES[naming.lower()]()
+        except KeyError:
+            raise ValueError(f"Unsupported naming strategy: {naming!r} "
+                             f"(expected one of {', '.join(NAMING_STRATEGIES)})") from None
+    return naming
@@ -0,0 +1,468 @@
+"""
+Streaming Generation Pipeline Module
+
+This module connects the generation steps as lazy stages:
+
+    reader -> encode -> render -> sink
+
+Every stage is a generator that pulls from the previous one, the encode stage
+one chunk of payloads at a time (encoded together, see encode_stage()), so no
+more than a chunk is read from the input before the sink is ready for it. When
+encoding and rendering run in worker processes, only a bounded number of
+chunks is in flight; reading pauses until the oldest chunk has been written.
+Peak memory therefore depends on the chunk size and the number of workers,
+not on the size of the input.
+
+With workers, the calling process still owns the generator's cache and
+observer: it looks payloads up in the cache before sending them out, stores
+what the workers render, and reports the stage timings the workers send back.
+When the sink is a DirectorySink and there is no cache, the workers also
+write the files, so file I/O runs in parallel too.
+
+Each chunk carries the generator settings, so one long-lived executor (for
+example a server's shared process pool) can serve any number of runs with
+different settings. A pool created for a single run from a thread other than
+the main thread uses the "spawn" start method, since forking a process that
+runs other threads is unsafe.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import multiprocessing
+import pickle
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .metrics import StageClock
+from .naming import TimestampNaming
+from .qr_generator import QRCodeGenerator, QRCodeResult
+
+# Default number of payloads sent to a worker per task
+DEFAULT_CHUNKSIZE = 64
+
+# Generators built by the current worker process, keyed by the pickled job
+# settings they were built from, most recently used last
+_worker_generators = OrderedDict()
+
+# Generators kept by one worker process, for executors shared by several runs
+MAX_WORKER_GENERATORS = 8
+
+
+class PipelineItem:
+    """
+    A payload travelling through the pipeline stages.
+
+    Attributes:
+        index (int): Position of the payload in the input.
+        payload (str): The text to encode.
+        modules (ModuleMatrix): The encoded matrix, once the encode stage has run.
+        version (int): QR code version of modules.
+        data (bytes): The serialized image, once the render stage has run.
+        path (str): Location of the file, when a worker has already written it.
+        error (Exception): The first error raised for this item, or None.
+        clock (StageClock): Times the stages when the generator has an observer.
+        stages (dict): Seconds measured for this item elsewhere (its share of a
+                       batch, or a worker's stages), not yet charged to clock.
+    """
+
+    __slots__ = ("index", "payload", "modules", "version", "data", "path", "error", "clock",
+                 "stages")
+
+    def __init__(self, index, payload, timed=False):
+        self.index = index
+        self.payload = payload
+        self.modules = None
+        self.version = None
+        self.data = None
+        self.path = None
+        self.error = None
+        self.clock = StageClock() if timed else None
+        self.stages = None
+
+
+class DirectorySink:
+    """
+    Sink writing each rendered image to its own file in the generator's folder.
+
+    Example:
+        >>> generator = QRCodeGenerator("tag", "tags")
+        >>> with DirectorySink(generator) as sink:
+        ...     path = sink.write(0, "A-1", png_bytes)
+    """
+
+    def __init__(self, generator):
+        """
+        Initialize the sink.
+
+        Args:
+            generator (QRCodeGenerator): Provides the output folder and file naming.
+        """
+        self.generator = generator
+
+    def write(self, index, payload, data):
+        """Write data to a new file and return its path."""
+        return _write_file(self.generator, index, payload, data)
+
+    def close(self):
+        """Nothing to release; files are closed as they are written."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _write_file(generator, index, payload, data):
+    """Write data to the next file named by generator and return its path."""
+    full_path = generator._build_file_path(payload, index)
+    if not isinstance(generator.naming, TimestampNaming):
+        with open(full_path, "wb") as file:
+            file.write(data)
+        return full_path
+    # Writers in several processes can draw the same timestamp; take a new one
+    # instead of overwriting the other writer's file
+    while True:
+        try:
+            file = open(full_path, "xb")
+        except FileExistsError:
+            full_path = generator._build_file_path(payload, index)
+            continue
+        with file:
+            file.write(data)
+        return full_path
+
+
+def _lookup(generator, items):
+    """Fill in the data of items found in the generator's cache; return the others."""
+    cache = generator.cache
+    if cache is None:
+        return items
+    misses = []
+    for item in items:
+        try:
+            item.data = generator._cached(item.payload, item.clock)
+        except Exception as error:
+            item.error = error
+            continue
+        if item.data is None:
+            misses.append(item)
+    return misses
+
+
+def _encode_items(generator, items):
+    """Encode items together with QRCodeGenerator._encode_batch()."""
+    # Repeated payloads are encoded once
+    unique = list(dict.fromkeys(item.payload for item in items))
+    encoded = dict(zip(unique, generator._encode_batch(unique)))
+    for item in items:
+        code = encoded[item.payload]
+        item.modules = code.modules
+        item.version = code.version
+        item.error = code.error
+        item.stages = code.stages
+
+
+def _resume(item):
+    """Restart item's clock when its turn comes, charging the stages measured elsewhere."""
+    if item.clock is None:
+        return
+    item.clock.resume()
+    if item.stages:
+        for stage, seconds in item.stages.items():
+            item.clock.charge(stage, seconds)
+    item.stages = None
+
+
+def encode_stage(generator, payloads, start=0, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Encode payloads lazily, yielding one PipelineItem per payload.
+
+    Payloads are read chunksize at a time and each chunk is encoded with
+    QRCodeGenerator._encode_batch(), which shares the Reed-Solomon and matrix
+    work of payloads of the same version. When the generator has a cache,
+    cached items skip encoding and carry their data straight to the render
+    stage.
+    """
+    timed = generator.observer is not None
+    for offset, chunk in _chunks(payloads, chunksize):
+        items = [PipelineItem(index, payload, timed)
+                 for index, payload in enumerate(chunk, start + offset)]
+        _encode_items(generator, _lookup(generator, items))
+        yield from items
+
+
+def render_stage(generator, items):
+    """Serialize encoded items lazily in the generator's image format."""
+    cache = generator.cache
+    for item in items:
+        _resume(item)
+        if item.error is None and item.data is None:
+            try:
+                item.data = generator._serialize(item.modules)
+                if item.clock is not None:
+                    item.clock.lap("render")
+                if cache is not None:
+                    cache.put(generator._cache_key(item.payload, generator.image_format),
+                              item.data)
+            except Exception as error:
+                item.error = error
+        # The module matrix is not needed past this point
+        item.modules = None
+        yield item
+
+
+def sink_stage(sink, items, generator=None):
+    """
+    Hand rendered items to the sink, yielding a QRCodeResult for each.
+
+    Items a worker has already written are passed through. With a generator
+    that has an observer, the timings of every successful item are reported.
+    """
+    observe = generator is not None and generator.observer is not None
+    for item in items:
+        _resume(item)
+        if item.error is not None:
+            yield QRCodeResult(item.index, item.payload, None, item.error)
+            continue
+        location = item.path
+        if location is None:
+            try:
+                location = sink.write(item.index, item.payload, item.data)
+            except Exception as error:
+                yield QRCodeResult(item.index, item.payload, None, error)
+                continue
+            if item.clock is not None:
+                item.clock.lap("save")
+        if observe and item.clock is not None:
+            generator._observe(item.clock, item.version, item.payload)
+        yield QRCodeResult(item.index, item.payload, location, None)
+
+
+def _generator_settings(generator):
+    """Return the constructor options needed to rebuild generator in a worker."""
+    return {
+        "version": generator.version,
+        "error_correction": generator.error_correction,
+        "box_size": generator.box_size,
+        "border": generator.border,
+        "fill_color": generator.fill_color,
+        "back_color": generator.back_color,
+        "image_format": generator.image_format,
+        "kanji": generator.kanji,
+        "mask_pattern": generator.mask_pattern,
+        "engine": generator.engine,
+        "png_writer": generator.png_writer,
+        "png_compression": generator.png_compression,
+    }
+
+
+def _worker_files(generator, sink):
+    """
+    Return (file_prefix, output_folder, naming, layout) for workers to write the
+    files of sink themselves, or None if the calling process must write them.
+
+    Workers write when the sink is a DirectorySink, the generator has no cache
+    (which needs the data in the calling process) and the sink's naming
+    strategy and layout can be sent to the workers.
+    """
+    if type(sink) is not DirectorySink or generator.cache is not None:
+        return None
+    target = sink.generator
+    try:
+        pickle.dumps((target.naming, target.layout))
+    except Exception:
+        return None
+    return target.file_prefix, target.output_folder, target.naming, target.layout
+
+
+def _worker_job(job):
+    """
+    Return this worker's (generator, write_files, timed) for a pickled job,
+    building the generator on first use and reusing it for later chunks.
+    """
+    entry = _worker_generators.get(job)
+    if entry is not None:
+        _worker_generators.move_to_end(job)
+        return entry
+    file_prefix, output_folder, settings, write_files, timed = pickle.loads(job)
+    # The calling process has created the folder (and shard directories) already
+    generator = QRCodeGenerator(file_prefix, None, **settings)
+    generator.output_folder = output_folder
+    entry = _worker_generators[job] = (generator, write_files, timed)
+    while len(_worker_generators) > MAX_WORKER_GENERATORS:
+        _worker_generators.popitem(last=False)
+    return entry
+
+
+def _process_chunk(job, rows):
+    """Encode, render (and write) one chunk of (index, payload) in a worker process."""
+    generator, write_files, timed = _worker_job(job)
+    items = [PipelineItem(index, payload, timed) for index, payload in rows]
+    _encode_items(generator, items)
+    results = []
+    for item in render_stage(generator, items):
+        if write_files and item.error is None:
+            try:
+                item.path = _write_file(generator, item.index, item.payload, item.data)
+            except Exception as error:
+                item.error = error
+            else:
+                item.data = None
+                if item.clock is not None:
+                    item.clock.lap("save")
+        stages = item.clock.stages if item.clock is not None else None
+        results.append((item.data, item.path, item.version, item.error, stages))
+    return results
+
+
+def _chunks(payloads, chunksize):
+    """Split payloads into (start_index, [payload, ...]) chunks."""
+    iterator = iter(payloads)
+    start = 0
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _process_pool(workers):
+    """Create a pool for one run, spawned rather than forked outside the main thread."""
+    context = None
+    if threading.current_thread() is not threading.main_thread():
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def _parallel_render(generator, payloads, sink, workers, chunksize, max_in_flight,
+                     executor=None):
+    """Run encode and render in worker processes, yielding items in input order."""
+    settings = _generator_settings(generator)
+    files = _worker_files(generator, sink)
+    if files is None:
+        file_prefix, output_folder = generator.file_prefix, generator.output_folder
+    else:
+        file_prefix, output_folder, settings["naming"], settings["layout"] = files
+    timed = generator.observer is not None
+    # Pickled once; workers build one generator per distinct job and reuse it
+    job = pickle.dumps((file_prefix, output_folder, settings, files is not None, timed))
+    if executor is None:
+        with _process_pool(workers) as executor:
+            yield from _submit_chunks(generator, payloads, executor, job, timed, chunksize,
+                                      max_in_flight)
+    else:
+        yield from _submit_chunks(generator, payloads, executor, job, timed, chunksize,
+                                  max_in_flight)
+
+
+def _submit_chunks(generator, payloads, executor, job, timed, chunksize, max_in_flight):
+    """Send the chunks that miss the cache to executor, yielding items in input order."""
+    pending = deque()
+    try:
+        for start, chunk in _chunks(payloads, chunksize):
+            items = [PipelineItem(index, payload, timed)
+                     for index, payload in enumerate(chunk, start)]
+            misses = _lookup(generator, items)
+            # Backpressure: wait for the oldest chunk before reading further
+            while len(pending) >= max_in_flight:
+                yield from _collect(generator, *pending.popleft())
+            future = None
+            if misses:
+                future = executor.submit(_process_chunk, job,
+                                         [(item.index, item.payload) for item in misses])
+            pending.append((items, misses, future))
+        while pending:
+            yield from _collect(generator, *pending.popleft())
+    finally:
+        # A shared executor outlives this run: drop the chunks nobody will collect
+        for _, _, future in pending:
+            if future is not None:
+                future.cancel()
+
+
+def _collect(generator, items, misses, future):
+    """Merge the results of a worker chunk into its items, caching the rendered data."""
+    if future is not None:
+        for item, (data, path, version, error, stages) in zip(misses, future.result()):
+            item.data, item.path, item.version, item.error = data, path, version, error
+            item.stages = stages
+            if data is not None and generator.cache is not None:
+                generator.cache.put(generator._cache_key(item.payload, generator.image_format),
+                                    data)
+    return items
+
+
+def run_pipeline(payloads, generator, sink=None, workers=1, chunksize=DEFAULT_CHUNKSIZE,
+                 max_in_flight=None, executor=None):
+    """
+    Stream payloads through encode, render and sink stages.
+
+    Payloads are encoded ``chunksize`` at a time, so that payloads of the same
+    version share one batched Reed-Solomon and mask scoring pass. With one
+    worker every stage runs lazily in the calling process and a single chunk
+    is in flight. With more workers, encode and render run in a process pool
+    on chunks of ``chunksize`` payloads while the sink runs in the calling
+    process; at most ``max_in_flight`` chunks are queued at any time. Into a
+    DirectorySink (the default) without a cache, the workers write the files
+    themselves. Given an executor, the chunks run on it instead of on a pool
+    created for this call, so that concurrent runs (e.g. the sessions of a
+    server) share one bounded set of processes.
+
+    The generator's cache and observer are used in both modes: with workers,
+    the calling process looks payloads up before sending them out, caches what
+    the workers render and reports the stage timings they send back.
+
+    Args:
+        payloads (iterable): Texts to encode, e.g. from read_payloads().
+        generator (QRCodeGenerator): Provides the encoding settings and format.
+        sink (optional): Object with write(index, payload, data) -> location and
+                         close(). Defaults to a DirectorySink for the generator.
+        workers (int, optional): Number of processes. Defaults to 1 (in-process).
+        chunksize (int, optional): Payloads encoded together (per worker task with
+                                   workers). Defaults to 64.
+        max_in_flight (int, optional): Chunks queued at once. Defaults to 2 per worker.
+        executor (concurrent.futures.Executor, optional): A shared process pool to
+                 run the chunks on; it is not shut down. Defaults to None, a pool
+                 of workers processes when workers > 1.
+
+    Yields:
+        QRCodeResult: One result per payload, in input order, with the location
+        returned by the sink as its path.
+
+    Example:
+        >>> generator = QRCodeGenerator("tag", "tags")
+        >>> for result in run_pipeline(read_payloads("tags.csv"), generator, workers=8):
+        ...     print(result.path)
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1 (got {workers})")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1 (got {chunksize})")
+    if max_in_flight is None:
+        max_in_flight = workers * 2
+    if max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be at least 1 (got {max_in_flight})")
+
+    return _run(payloads, generator, sink, workers, chunksize, max_in_flight, executor)
+
+
+def _run(payloads, generator, sink, workers, chunksize, max_in_flight, executor):
+    if sink is None:
+        sink = DirectorySink(generator)
+
+    if workers == 1 and executor is None:
+        items = render_stage(generator, encode_stage(generator, payloads, chunksize=chunksize))
+    else:
+        items = _parallel_render(generator, payloads, sink, workers, chunksize, max_in_flight,
+                                 executor)
+
+    try:
+        yield from sink_stage(sink, items, generator)
+    finally:
+        sink.close()
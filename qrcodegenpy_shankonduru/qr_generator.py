@@ -9,9 +9,71 @@ Created: 2024
 License: MIT
 """
 
+import io
 import qrcode
 import os
-from datetime import datetime
+from collections import namedtuple
+from itertools import count, islice
+from time import perf_counter
+
+from qrcode import util
+
+from .cache import cache_key
+from .masks import build_matrix, make_matrices
+from .matrix import ModuleMatrix
+from .metrics import StageClock
+from .segments import segment_for_version
+from .naming import get_naming
+from .png import render_png
+from .reed_solomon import create_data, create_data_batch
+from .raster import rasterize
+from .vector import render_pdf, render_svg
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is an optional speed-up
+    numpy = None
+
+# Supported output formats and the file extension used for each
+IMAGE_FORMATS = {"PNG": ".png", "SVG": ".svg", "PDF": ".pdf"}
+
+# Codeword encoders: the package's table-driven Reed-Solomon encoder, or qrcode's own
+ENGINES = ("builtin", "qrcode")
+
+# PNG writers: Pillow's general encoder, or the package's direct 1-bit writer
+PNG_WRITERS = ("pillow", "builtin")
+
+# Payloads encoded together by generate_qr_codes()
+BATCH_SIZE = 64
+
+
+class QRCodeResult(namedtuple("QRCodeResult", ["index", "input_string", "path", "error"])):
+    """
+    Outcome of a single item produced by QRCodeGenerator.generate_qr_codes().
+
+    Attributes:
+        index (int): Position of the item in the input iterable.
+        input_string (str): The text that was (or failed to be) encoded.
+        path (str): Full path of the saved image, or None if the item failed.
+        error (Exception): The exception raised for this item, or None on success.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        """bool: True when the item was generated and saved successfully."""
+        return self.error is None
+
+
+class _EncodedCode(namedtuple("_EncodedCode", ["modules", "version", "error", "stages"])):
+    """
+    Outcome of encoding one payload of a batch (see QRCodeGenerator._encode_batch()).
+
+    stages holds the payload's share of the batch's segment and make time.
+    """
+
+    __slots__ = ()
 
 
 class QRCodeGenerator:
@@ -24,33 +86,374 @@ class QRCodeGenerator:
     Attributes:
         file_prefix (str): Prefix used for generated QR code filenames
         output_folder (str): Directory where QR code images will be saved
-        
+        version (int): Starting QR code version (grown automatically to fit the data)
+        error_correction (int): qrcode error correction constant
+        box_size (int): Size of each module in pixels
+        border (int): Quiet zone width in modules
+        fill_color (str): Foreground color of the modules
+        back_color (str): Background color of the image
+        cache (RenderCache): Optional cache of rendered images, or None
+        image_format (str): Output format: "PNG", "SVG" or "PDF"
+        layout (ShardedLayout): Optional shard directory layout, or None (flat)
+        naming: File naming strategy (see the naming module)
+        kanji (bool): Whether kanji mode may be used for Shift JIS characters
+        mask_pattern (int): Fixed data mask (0-7), or None to pick the best one
+        engine (str): Codeword encoder, "builtin" or "qrcode"
+        png_writer (str): PNG encoder, "pillow" or "builtin"
+        png_compression (int): zlib level of PNG output (0-9)
+        observer (callable): Receives the StageTimings of each generated code, or None
+
     Example:
         >>> generator = QRCodeGenerator("my_qr", "output")
         >>> filename = generator.generate_qr_code("https://example.com")
         >>> print(f"QR code saved as: {filename}")
     """
-    
-    def __init__(self, file_prefix="qr_code", output_folder="output"):
+
+    def __init__(self, file_prefix="qr_code", output_folder="output", version=1,
+                 error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10,
+                 border=4, fill_color="black", back_color="white", cache=None,
+                 image_format="PNG", layout=None, naming=None, kanji=False,
+                 mask_pattern=None, engine="builtin", png_writer="pillow",
+                 png_compression=6, observer=None):
         """
         Initialize the QR Code Generator.
-        
+
         Args:
-            file_prefix (str, optional): Prefix for the output filename. 
+            file_prefix (str, optional): Prefix for the output filename.
                                        Defaults to "qr_code".
             output_folder (str, optional): Directory to save QR code images.
-                                         Defaults to "output".
-                                         
+                                         Defaults to "output". Pass None for
+                                         in-memory use only (nothing is created).
+            version (int, optional): Starting QR code version. Defaults to 1.
+            error_correction (int, optional): qrcode error correction constant.
+                                            Defaults to ERROR_CORRECT_L.
+            box_size (int, optional): Pixels per module. Defaults to 10.
+            border (int, optional): Quiet zone width in modules. Defaults to 4.
+            fill_color (str, optional): Module color. Defaults to "black".
+            back_color (str, optional): Background color. Defaults to "white".
+            cache (RenderCache, optional): Cache used to reuse the rendered bytes of
+                                         repeated payloads. Defaults to None (disabled).
+            image_format (str, optional): "PNG", "SVG" or "PDF". Vector formats emit
+                                        the modules as one merged path. Defaults to "PNG".
+            layout (ShardedLayout, optional): Spread files over shard directories,
+                                            which are all created here. Defaults to
+                                            None (every file directly in output_folder).
+            naming (optional): File naming strategy: "timestamp", "counter", "hash" or
+                             an object such as CounterNaming() or KeyNaming(key).
+                             Defaults to None (timestamp names, as before).
+            kanji (bool, optional): Encode Japanese text in kanji mode (13 bits per
+                                  character instead of 24 as UTF-8). Scanners decode
+                                  it as Shift JIS. Defaults to False.
+            mask_pattern (int, optional): Use this data mask (0-7) instead of scoring
+                                        all eight. Faster, but the symbol may be
+                                        slightly harder to scan. Defaults to None.
+            engine (str, optional): "builtin" computes the error correction codewords
+                                  with the package's table-driven Reed-Solomon encoder;
+                                  "qrcode" uses the qrcode library's. Both produce the
+                                  same symbols. Defaults to "builtin".
+            png_writer (str, optional): "builtin" writes 1-bit PNGs directly from the
+                                      packed raster, which is faster and smaller than
+                                      Pillow's encoder; the pixels are identical.
+                                      Defaults to "pillow".
+            png_compression (int, optional): zlib level of PNG output: 1 for
+                                           throughput, 9 for archives. Defaults to 6.
+            observer (callable, optional): Called with a StageTimings record (per-stage
+                                         durations, payload size, version) after each
+                                         code produced by generate_qr_code(),
+                                         generate_qr_codes(), generate_qr_bytes() or
+                                         generate_qr_image(). A MetricsCollector
+                                         aggregates them. Defaults to None (no timing).
+
+        Raises:
+            ValueError: If image_format, naming, mask_pattern, engine, png_writer or
+                        png_compression is not supported.
+
         Example:
             >>> generator = QRCodeGenerator("website_qr", "my_qr_codes")
             >>> # Will create files like: my_qr_codes/website_qr_20241001123456.png
         """
         self.file_prefix = file_prefix
         self.output_folder = output_folder
-        
+        self.version = version
+        self.error_correction = error_correction
+        self.box_size = box_size
+        self.border = border
+        self.fill_color = fill_color
+        self.back_color = back_color
+        self.cache = cache
+        self.image_format = image_format.upper()
+        self.layout = layout
+        self.naming = get_naming(naming)
+        self.kanji = kanji
+        self.mask_pattern = mask_pattern
+        self.engine = engine
+        self.png_writer = png_writer
+        self.png_compression = png_compression
+        self.observer = observer
+        self._sequence = count()
+
+        if self.image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format!r}")
+        if mask_pattern is not None and mask_pattern not in range(8):
+            raise ValueError(f"mask_pattern must be between 0 and 7 (got {mask_pattern!r})")
+        if engine not in ENGINES:
+            raise ValueError(f"Unsupported engine: {engine!r} "
+                             f"(expected one of {', '.join(ENGINES)})")
+        if png_writer not in PNG_WRITERS:
+            raise ValueError(f"Unsupported PNG writer: {png_writer!r} "
+                             f"(expected one of {', '.join(PNG_WRITERS)})")
+        if png_compression not in range(10):
+            raise ValueError(f"png_compression must be between 0 and 9 (got {png_compression!r})")
+
         # Create output directory if it doesn't exist
-        if not os.path.exists(self.output_folder):
+        if self.output_folder is not None and not os.path.exists(self.output_folder):
             os.makedirs(self.output_folder)
+        if self.output_folder is not None and layout is not None:
+            layout.prepare(self.output_folder)
+
+    def _new_qr(self):
+        """Create a qrcode.QRCode configured with this generator's settings."""
+        return qrcode.QRCode(
+            version=self.version,
+            error_correction=self.error_correction,
+            box_size=self.box_size,
+            border=self.border,
+        )
+
+    def _start_clock(self):
+        """Return a StageClock when an observer is set, otherwise None."""
+        return None if self.observer is None else StageClock()
+
+    def _observe(self, clock, version, input_string):
+        """Pass the timings of a finished call to the observer."""
+        self.observer(clock.timings(input_string, version, self.image_format))
+
+    def _encode(self, qr, input_string, clock=None):
+        """
+        Encode input_string into qr, resetting any state left by a previous payload.
+
+        The payload is split into the numeric, alphanumeric, byte (and kanji)
+        segments with the fewest bits, and the smallest version not below the
+        configured one is looked up in the precomputed capacity table instead
+        of letting make(fit=True) measure the data in a scratch buffer. With the
+        builtin engine the codewords are computed here and handed to makeImpl()
+        through data_cache. The codewords are placed into the cached template of
+        the version, and all eight masks are scored at once with NumPy, unless a
+        mask is pinned.
+
+        qr.modules is set to a bit-packed ModuleMatrix rather than nested lists;
+        it supports the same read access (len, iteration, modules[row][col]).
+
+        Args:
+            qr (qrcode.QRCode): The QR code to reuse.
+            input_string (str): The payload.
+            clock (StageClock, optional): Receives the segment and make stages.
+
+        Returns:
+            ModuleMatrix: The final matrix, also stored in qr.modules.
+        """
+        qr.clear()
+        qr.data_list, qr.version = segment_for_version(input_string, self.error_correction,
+                                                       self.version, self.kanji)
+        if clock is not None:
+            clock.lap("segment")
+        if self.engine == "builtin":
+            qr.data_cache = create_data(qr.version, self.error_correction, qr.data_list)
+        qr.modules = build_matrix(qr, self.mask_pattern)
+        qr.modules_count = qr.modules.size
+        if clock is not None:
+            clock.lap("make")
+        return qr.modules
+
+    def _encode_one(self, input_string):
+        """Encode input_string on its own, as an _EncodedCode."""
+        clock = StageClock()
+        qr = self._new_qr()
+        try:
+            self._encode(qr, input_string, clock)
+        except Exception as error:
+            return _EncodedCode(None, None, error, clock.stages)
+        return _EncodedCode(qr.modules, qr.version, None, clock.stages)
+
+    def _encode_batch(self, input_strings):
+        """
+        Encode many payloads, sharing the codeword and matrix work per version.
+
+        Each payload is segmented on its own, then the payloads are grouped by
+        version and every group goes through reed_solomon.create_data_batch()
+        (one vectorized Reed-Solomon pass) and masks.make_matrices() (one
+        template scatter and one mask scoring pass), which is much cheaper per
+        code than _encode() for batches of similar payloads. The symbols are
+        identical. Without NumPy each payload is encoded with _encode().
+
+        Args:
+            input_strings (list): The payloads.
+
+        Returns:
+            list: One _EncodedCode per payload, in order; a payload that cannot
+                  be encoded has its exception as error.
+        """
+        if numpy is None:
+            return [self._encode_one(input_string) for input_string in input_strings]
+
+        encoded = [None] * len(input_strings)
+        groups = {}
+        started = perf_counter()
+        for position, input_string in enumerate(input_strings):
+            try:
+                data_list, version = segment_for_version(input_string, self.error_correction,
+                                                         self.version, self.kanji)
+            except Exception as error:
+                encoded[position] = _EncodedCode(None, None, error, {})
+            else:
+                groups.setdefault(version, []).append((position, data_list))
+        segment = (perf_counter() - started) / max(1, len(input_strings))
+
+        for version, members in groups.items():
+            started = perf_counter()
+            data_lists = [data_list for _, data_list in members]
+            try:
+                if self.engine == "builtin":
+                    codewords = create_data_batch(version, self.error_correction, data_lists)
+                else:
+                    codewords = [util.create_data(version, self.error_correction, data_list)
+                                 for data_list in data_lists]
+                matrices, _ = make_matrices(version, self.error_correction, codewords,
+                                            self.mask_pattern)
+            except Exception:
+                # Isolate the failing payload instead of failing the whole group
+                for position, _ in members:
+                    encoded[position] = self._encode_one(input_strings[position])
+                continue
+            stages = {"segment": segment,
+                      "make": (perf_counter() - started) / len(members)}
+            for (position, _), modules in zip(members, ModuleMatrix.from_stack(matrices)):
+                encoded[position] = _EncodedCode(modules, version, None, stages)
+        return encoded
+
+    def _render_image(self, modules):
+        """Rasterize encoded modules into a PIL image."""
+        return rasterize(modules, self.box_size, self.border, self.fill_color,
+                         self.back_color)
+
+    def _build_file_path(self, input_string=None, index=None):
+        """
+        Return the output path for the next image, named by the naming strategy.
+
+        With a layout, the file is placed in the shard chosen from input_string or
+        index (the generator's own sequence number when index is None).
+        """
+        file_name = (self.naming.name(self.file_prefix, input_string, index)
+                     + IMAGE_FORMATS[self.image_format])
+        if self.layout is None:
+            return os.path.join(self.output_folder, file_name)
+        if index is None:
+            index = next(self._sequence)
+        return os.path.join(self.output_folder, self.layout.shard(input_string, index),
+                            file_name)
+
+    def _cache_key(self, input_string, image_format):
+        """Return the cache key of input_string rendered with the current settings."""
+        options = {}
+        if self.kanji:
+            options["kanji"] = True
+        if self.mask_pattern is not None:
+            options["mask_pattern"] = self.mask_pattern
+        if image_format == "PNG" and self.png_writer != "pillow":
+            options["png_writer"] = self.png_writer
+        if image_format == "PNG" and self.png_compression != 6:
+            options["png_compression"] = self.png_compression
+        return cache_key(input_string, self.version, self.error_correction, self.box_size,
+                         self.border, self.fill_color, self.back_color, image_format, options)
+
+    def _serialize(self, modules):
+        """Serialize encoded modules in the configured image format."""
+        if self.image_format == "SVG":
+            return render_svg(modules, self.box_size, self.border, self.fill_color,
+                              self.back_color).encode("utf-8")
+        if self.image_format == "PDF":
+            return render_pdf(modules, self.box_size, self.border, self.fill_color,
+                              self.back_color)
+        if self.png_writer == "builtin":
+            return render_png(modules, self.box_size, self.border, self.fill_color,
+                              self.back_color, self.png_compression)
+        buffer = io.BytesIO()
+        self._render_image(modules).save(buffer, format="PNG",
+                                         compress_level=self.png_compression)
+        return buffer.getvalue()
+
+    def _cached(self, input_string, clock=None):
+        """Return the cached bytes of input_string, or None on a miss."""
+        data = self.cache.get(self._cache_key(input_string, self.image_format))
+        if clock is not None:
+            clock.lap("cache")
+            clock.cached = data is not None
+        return data
+
+    def _render_bytes(self, qr, input_string, clock=None):
+        """Encode and serialize input_string, returning the file bytes (cached if enabled)."""
+        if self.cache is not None:
+            data = self._cached(input_string, clock)
+            if data is not None:
+                return data
+
+        self._encode(qr, input_string, clock)
+        data = self._serialize(qr.modules)
+        if clock is not None:
+            clock.lap("render")
+
+        if self.cache is not None:
+            self.cache.put(self._cache_key(input_string, self.image_format), data)
+        return data
+
+    def _save_qr_code(self, qr, input_string, index=None):
+        """Encode, render and save input_string, returning the saved path."""
+        clock = self._start_clock()
+        if self.cache is not None or self.image_format != "PNG" or self.png_writer != "pillow":
+            # Cached, vector and builtin PNG output are already serialized, so only
+            # the write remains
+            data = self._render_bytes(qr, input_string, clock)
+            return self._write_file(data, qr.version, input_string, index, clock)
+
+        # Add data to the QR code and optimize its size
+        self._encode(qr, input_string, clock)
+        return self._save_modules(qr.modules, qr.version, input_string, index, clock)
+
+    def _write_file(self, data, version, input_string, index=None, clock=None):
+        """Write serialized data to the next file, returning its path."""
+        full_path = self._build_file_path(input_string, index)
+        with open(full_path, "wb") as file:
+            file.write(data)
+        if clock is not None:
+            clock.lap("save")
+            self._observe(clock, version, input_string)
+        return full_path
+
+    def _save_modules(self, modules, version, input_string, index=None, clock=None):
+        """Render and save encoded modules (caching the bytes if enabled)."""
+        if self.cache is not None or self.image_format != "PNG" or self.png_writer != "pillow":
+            data = self._serialize(modules)
+            if clock is not None:
+                clock.lap("render")
+            if self.cache is not None:
+                self.cache.put(self._cache_key(input_string, self.image_format), data)
+            return self._write_file(data, version, input_string, index, clock)
+
+        # Create the actual image
+        img = self._render_image(modules)
+        if clock is not None:
+            clock.lap("render")
+
+        # Name the file with the naming strategy (timestamp-based by default)
+        full_path = self._build_file_path(input_string, index)
+
+        # Save the image to disk in the output folder
+        img.save(full_path, compress_level=self.png_compression)
+        if clock is not None:
+            clock.lap("save")
+            self._observe(clock, version, input_string)
+
+        return full_path
 
     def generate_qr_code(self, input_string):
         """
@@ -65,45 +468,180 @@ class QRCodeGenerator:
 
         Returns:
             str: The full path of the generated QR code image (includes folder and .png extension).
-            
+
         Raises:
             Exception: If there's an error during QR code generation or file saving.
-            
+
         Example:
             >>> generator = QRCodeGenerator()
             >>> filename = generator.generate_qr_code("https://www.example.com")
             >>> print(f"QR code saved as: {filename}")
-            output/qr_code_20241001123456.png        Note:
-            - QR code version is set to 1 (21x21 modules)
-            - Error correction level is set to L (Low ~7%)
-            - Box size is 10 pixels per module
-            - Border is 4 modules wide
-            - Colors: black foreground on white background
-        """
-        # Create QR code instance with specific configuration
-        qr = qrcode.QRCode(
-            version=1,  # Controls the size of the QR Code (1 is 21x21 modules)
-            error_correction=qrcode.constants.ERROR_CORRECT_L,  # Low error correction (~7%)
-            box_size=10,  # Size of each box in pixels
-            border=4,  # Border size in boxes (minimum is 4)
-        )
+            output/qr_code_20241001123456.png
 
-        # Add data to the QR code
-        qr.add_data(input_string)
-        qr.make(fit=True)  # Optimize the QR code size
+        Note:
+            - QR code version starts at 1 (21x21 modules) and grows to fit the data
+            - Error correction level defaults to L (Low ~7%)
+            - Box size defaults to 10 pixels per module
+            - Border defaults to 4 modules wide
+            - Colors default to black foreground on white background
+        """
+        # Create QR code instance with this generator's configuration
+        qr = self._new_qr()
 
-        # Create the actual image
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Generate timestamp-based filename to avoid conflicts
-        # Include microseconds for higher precision to ensure uniqueness
-        current_datetime = datetime.now().strftime("%Y%m%d%H%M%S%f")
-        file_name = f"{self.file_prefix}_{current_datetime}.png"
-        
-        # Create full path including output folder
-        full_path = os.path.join(self.output_folder, file_name)
-        
-        # Save the image to disk in the output folder
-        img.save(full_path)
-        
-        return full_path
\ No newline at end of file
+        return self._save_qr_code(qr, input_string)
+
+    def _save_batch(self, input_strings, start):
+        """Save one batch of generate_qr_codes(), yielding a QRCodeResult per item."""
+        # Look every first occurrence up in the cache; repeats are looked up when
+        # their turn comes, once the first one has been rendered and cached
+        clocks, hits, seen = [], [], set()
+        for input_string in input_strings:
+            clock = self._start_clock()
+            data = None
+            if self.cache is not None and input_string not in seen:
+                try:
+                    data = self._cached(input_string, clock)
+                except Exception as error:
+                    data = error
+            seen.add(input_string)
+            clocks.append(clock)
+            hits.append(data)
+
+        # Repeated payloads of a batch are encoded once
+        misses = list(dict.fromkeys(input_string for input_string, data
+                                    in zip(input_strings, hits) if data is None))
+        encoded = dict(zip(misses, self._encode_batch(misses)))
+
+        looked_up = set()
+        for index, (input_string, data, clock) in enumerate(zip(input_strings, hits, clocks),
+                                                            start):
+            if clock is not None:
+                # Only this item's own work counts from here on
+                clock.resume()
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                if data is None and self.cache is not None and input_string in looked_up:
+                    data = self._cached(input_string, clock)
+                looked_up.add(input_string)
+                if data is not None:
+                    full_path = self._write_file(data, None, input_string, index, clock)
+                else:
+                    code = encoded[input_string]
+                    if code.error is not None:
+                        raise code.error
+                    if clock is not None:
+                        for stage, seconds in code.stages.items():
+                            clock.charge(stage, seconds)
+                    full_path = self._save_modules(code.modules, code.version, input_string,
+                                                   index, clock)
+            except Exception as error:
+                yield QRCodeResult(index, input_string, None, error)
+            else:
+                yield QRCodeResult(index, input_string, full_path, None)
+
+    def generate_qr_codes(self, input_strings, batch_size=BATCH_SIZE):
+        """
+        Generate QR codes for many input strings, yielding one result per item.
+
+        The input is read batch_size items at a time. The items of a batch are
+        grouped by QR version and each group is encoded at once: one vectorized
+        Reed-Solomon pass and one mask scoring pass for all of its codes (see
+        _encode_batch()), which makes a batch several times cheaper per code to
+        encode than calling generate_qr_code() in a loop. Rendering and saving
+        stay per item. Results are produced lazily in input order, and a failing
+        item (for example data that does not fit in a QR code) is reported in
+        its result instead of aborting the remaining items.
+
+        Args:
+            input_strings (iterable): Texts or URLs to encode. Consumed lazily,
+                                    batch_size items at a time.
+            batch_size (int, optional): Items encoded together. Defaults to 64.
+
+        Yields:
+            QRCodeResult: The index, input, saved path and error (if any) of each item.
+
+        Raises:
+            ValueError: If batch_size is less than 1.
+
+        Example:
+            >>> generator = QRCodeGenerator("tag", "tags")
+            >>> for result in generator.generate_qr_codes(["A-1", "A-2"]):
+            ...     print(result.path if result.ok else result.error)
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1 (got {batch_size})")
+        return self._generate_batches(iter(input_strings), batch_size)
+
+    def _generate_batches(self, iterator, batch_size):
+        start = 0
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield from self._save_batch(batch, start)
+            start += len(batch)
+
+    def generate_qr_bytes(self, input_string, output_type="bytes"):
+        """
+        Generate a QR code in memory, without touching the filesystem.
+
+        Uses the same settings (image format and cache included) as generate_qr_code(),
+        so the data is PNG by default and SVG or PDF when configured.
+
+        Args:
+            input_string (str): The text or URL to encode in the QR code.
+            output_type (str, optional): "bytes", "bytesio" (an io.BytesIO positioned
+                                       at the start) or "memoryview". Defaults to "bytes".
+
+        Returns:
+            bytes | io.BytesIO | memoryview: The encoded image.
+
+        Raises:
+            ValueError: If output_type is not one of the supported values.
+
+        Example:
+            >>> generator = QRCodeGenerator()
+            >>> png = generator.generate_qr_bytes("https://www.example.com")
+            >>> png[:8]
+            b'\\x89PNG\\r\\n\\x1a\\n'
+        """
+        if output_type not in ("bytes", "bytesio", "memoryview"):
+            raise ValueError(f"Unsupported output_type: {output_type!r}")
+
+        clock = self._start_clock()
+        qr = self._new_qr()
+        data = self._render_bytes(qr, input_string, clock)
+        if clock is not None:
+            self._observe(clock, qr.version, input_string)
+
+        if output_type == "bytesio":
+            return io.BytesIO(data)
+        if output_type == "memoryview":
+            return memoryview(data)
+        return data
+
+    def generate_qr_image(self, input_string):
+        """
+        Generate a QR code as an in-memory PIL image, without touching the filesystem.
+
+        Args:
+            input_string (str): The text or URL to encode in the QR code.
+
+        Returns:
+            PIL.Image.Image: The rendered QR code image.
+
+        Example:
+            >>> generator = QRCodeGenerator()
+            >>> img = generator.generate_qr_image("https://www.example.com")
+            >>> img.size
+            (330, 330)
+        """
+        clock = self._start_clock()
+        qr = self._new_qr()
+        self._encode(qr, input_string, clock)
+        img = self._render_image(qr.modules)
+        if clock is not None:
+            clock.lap("render")
+            self._observe(clock, qr.version, input_string)
+        return img
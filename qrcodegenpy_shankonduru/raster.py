@@ -0,0 +1,164 @@
+"""
+QR Code Rasterizer Module
+
+This module turns a QR code module matrix into a scaled, bordered bitmap in a
+single pass instead of drawing one rectangle per dark module. With NumPy
+installed the upscale is a vectorized repeat of the packed bit rows (for a
+ModuleMatrix, a byte lookup on its packed rows, without unpacking them); without
+it an equivalent pure-Python row builder is used. Black on white output is
+emitted directly as a 1-bit image.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+from functools import lru_cache
+
+from PIL import Image
+
+from .matrix import ModuleMatrix
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is an optional speed-up
+    numpy = None
+
+
+def _normalize_color(color):
+    try:
+        return color.lower()
+    except AttributeError:
+        return color
+
+
+@lru_cache(maxsize=32)
+def _scale_table(box_size):
+    """Return a (256, box_size) uint8 table: each byte with every bit repeated box_size times."""
+    bits = numpy.unpackbits(numpy.arange(256, dtype=numpy.uint8)[:, None], axis=1)
+    return numpy.packbits(bits.repeat(box_size, axis=1), axis=1)
+
+
+def _packed_matrix_rows_numpy(matrix, box_size, border):
+    """Return the 1-bit raster (1 = light) of a ModuleMatrix, scaling its packed rows."""
+    width = (matrix.size + 2 * border) * box_size
+    row_bytes = (width + 7) // 8
+    # Scale columns by looking each packed byte up: dark pixels, padding stays 0
+    scaled = _scale_table(box_size)[matrix.packed_array()].reshape(matrix.size, -1)
+    # Shift the pixels right by the quiet zone, which rarely is a whole number of bytes
+    offset, shift = divmod(border * box_size, 8)
+    dark = numpy.zeros((matrix.size, max(row_bytes, offset + scaled.shape[1] + 1)),
+                       dtype=numpy.uint8)
+    dark[:, offset:offset + scaled.shape[1]] = scaled >> shift
+    if shift:
+        dark[:, offset + 1:offset + 1 + scaled.shape[1]] |= scaled << (8 - shift)
+    light = ~dark[:, :row_bytes]
+    blank_rows = b"\xff" * row_bytes * box_size * border
+    return blank_rows + light.repeat(box_size, axis=0).tobytes() + blank_rows
+
+
+def _packed_rows_numpy(modules, box_size, border):
+    """Return the 1-bit raster (1 = light) as bytes using NumPy."""
+    if isinstance(modules, ModuleMatrix):
+        return _packed_matrix_rows_numpy(modules, box_size, border)
+    count = len(modules)
+    # Allocate the bordered matrix directly; numpy.pad is slower for this case
+    dark = numpy.zeros((count + 2 * border, count + 2 * border), dtype=bool)
+    dark[border:border + count, border:border + count] = modules
+    # Scale columns, pack each module row once, then scale rows by repetition
+    light = ~dark.repeat(box_size, axis=1)
+    packed = numpy.packbits(light, axis=1)
+    return packed.repeat(box_size, axis=0).tobytes()
+
+
+def _packed_rows_python(modules, box_size, border):
+    """Return the 1-bit raster (1 = light) as bytes without NumPy."""
+    count = len(modules)
+    width = (count + 2 * border) * box_size
+    row_bytes = (width + 7) // 8
+    padding = "1" * (row_bytes * 8 - width)
+    # Module bit strings ("1" = dark) become pixel strings ("1" = light)
+    scale = {ord("1"): "0" * box_size, ord("0"): "1" * box_size}
+    quiet_pixels = "1" * box_size * border
+
+    if isinstance(modules, ModuleMatrix):
+        bit_rows = modules.bit_strings()
+    else:
+        bit_rows = ("".join("1" if module else "0" for module in row) for row in modules)
+
+    blank_row = b"\xff" * row_bytes * box_size
+    rows = [blank_row * border]
+    for bit_row in bit_rows:
+        bits = bit_row.translate(scale)
+        row = int(quiet_pixels + bits + quiet_pixels + padding, 2).to_bytes(row_bytes, "big")
+        rows.append(row * box_size)
+    rows.append(blank_row * border)
+    return b"".join(rows)
+
+
+def packed_raster(modules, box_size=10, border=4):
+    """
+    Return the scaled, bordered 1-bit raster of a module matrix.
+
+    Args:
+        modules: Square matrix of truthy (dark) / falsy (light) modules, as nested
+                 lists, a 2-D NumPy array or a ModuleMatrix, without quiet zone.
+        box_size (int, optional): Pixels per module. Defaults to 10.
+        border (int, optional): Quiet zone width in modules. Defaults to 4.
+
+    Returns:
+        tuple: (size, data): the side in pixels and the rows packed eight pixels
+               per byte, most significant bit first, 1 for light pixels.
+    """
+    if int(box_size) <= 0:
+        raise ValueError(f"Invalid box size (was {box_size}, expected larger than 0)")
+    if int(border) < 0:
+        raise ValueError(f"Invalid border value (was {border}, expected 0 or larger than that)")
+
+    size = (len(modules) + 2 * border) * box_size
+    if numpy is not None:
+        return size, _packed_rows_numpy(modules, box_size, border)
+    return size, _packed_rows_python(modules, box_size, border)
+
+
+def rasterize(modules, box_size=10, border=4, fill_color="black", back_color="white"):
+    """
+    Render a module matrix as a PIL image.
+
+    The result is pixel-identical to qrcode's PIL backend for the same settings:
+    black on white produces a mode "1" image, a "transparent" background an RGBA
+    image and any other color pair an RGB image.
+
+    Args:
+        modules: Square matrix of truthy (dark) / falsy (light) modules, as nested
+                 lists, a 2-D NumPy array or a ModuleMatrix, without quiet zone.
+        box_size (int, optional): Pixels per module. Defaults to 10.
+        border (int, optional): Quiet zone width in modules. Defaults to 4.
+        fill_color (optional): Module color. Defaults to "black".
+        back_color (optional): Background color. Defaults to "white".
+
+    Returns:
+        PIL.Image.Image: The rendered QR code.
+
+    Example:
+        >>> qr = qrcode.QRCode()
+        >>> qr.add_data("https://example.com")
+        >>> qr.make()
+        >>> rasterize(qr.modules, box_size=10, border=4).save("code.png")
+    """
+    size, data = packed_raster(modules, box_size, border)
+    bitmap = Image.frombytes("1", (size, size), data)
+
+    fill_color = _normalize_color(fill_color)
+    back_color = _normalize_color(back_color)
+    if fill_color == "black" and back_color == "white":
+        return bitmap
+
+    if back_color == "transparent":
+        img = Image.new("RGBA", (size, size), None)
+    else:
+        img = Image.new("RGB", (size, size), back_color)
+    # The bitmap is 0 where modules are dark, so invert it to use as a paste mask
+    mask = bitmap.point(lambda value: 255 - value, "1")
+    img.paste(fill_color, (0, 0, size, size), mask)
+    return img
@@ -0,0 +1,373 @@
+"""
+Reed-Solomon Encoder Module
+
+This module builds the final codeword sequence of a QR code: the data bit
+stream, its padding, the error correction codewords of every block and the
+interleaving of both.
+
+qrcode's ``util.create_data`` writes the data one bit at a time and divides
+each block by its generator polynomial with list-based polynomial arithmetic,
+allocating a new polynomial for every data codeword. Here:
+
+- GF(256) log/antilog tables are built once at import.
+- Generator polynomials are built once per error correction codeword count,
+  together with a 256-entry table of their multiples, so the division is a
+  shift-register loop doing one table lookup and one integer XOR per data
+  codeword.
+- With NumPy, a batch of blocks of the same length is encoded in one matrix
+  product: the code is linear over GF(2), so the error correction bits are
+  the data bits times a parity matrix cached per block shape. All blocks of
+  many same-version codes are encoded together by create_data_batch().
+
+The codewords are identical to those of ``util.create_data``.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+from functools import lru_cache
+
+from qrcode import base, exceptions, util
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is an optional speed-up
+    numpy = None
+
+# GF(256) with the QR code polynomial x^8 + x^4 + x^3 + x^2 + 1. EXP_TABLE is
+# doubled so that EXP_TABLE[LOG_TABLE[a] + LOG_TABLE[b]] needs no modulo.
+EXP_TABLE = [0] * 512
+LOG_TABLE = [0] * 256
+
+_value = 1
+for _exponent in range(255):
+    EXP_TABLE[_exponent] = EXP_TABLE[_exponent + 255] = _value
+    LOG_TABLE[_value] = _exponent
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11D
+del _value, _exponent
+
+# Generator polynomials and remainder tables per block shape (parity matrices
+# are kept by the lru_cache of _parity_matrix)
+_generator_cache = {}
+_remainder_cache = {}
+_layout_cache = {}
+_multiply_table_array = None
+
+# Parity matrices kept at most (each is up to about 1 MB)
+_PARITY_CACHE_SIZE = 64
+
+
+def gf_multiply(a, b):
+    """Return the product of two GF(256) elements."""
+    if a == 0 or b == 0:
+        return 0
+    return EXP_TABLE[LOG_TABLE[a] + LOG_TABLE[b]]
+
+
+def generator_polynomial(ec_count):
+    """
+    Return the generator polynomial for ec_count error correction codewords.
+
+    The polynomial (x - a^0)(x - a^1)...(x - a^(ec_count - 1)) is computed once
+    and cached.
+
+    Returns:
+        tuple: ec_count + 1 coefficients, highest degree first (the first is 1).
+    """
+    polynomial = _generator_cache.get(ec_count)
+    if polynomial is None:
+        coefficients = [1]
+        for exponent in range(ec_count):
+            root = EXP_TABLE[exponent]
+            # Multiply by (x + root); subtraction is addition in GF(2^8)
+            coefficients = [
+                high ^ gf_multiply(low, root)
+                for high, low in zip(coefficients + [0], [0] + coefficients)
+            ]
+        polynomial = _generator_cache[ec_count] = tuple(coefficients)
+    return polynomial
+
+
+def _remainder_table(ec_count):
+    """
+    Return, for every byte f, f times the generator's low coefficients as one int.
+
+    The remainder register of the division is held as a big-endian integer of
+    ec_count bytes, so one step is a shift and an XOR with an entry of this table.
+    """
+    table = _remainder_cache.get(ec_count)
+    if table is None:
+        low = generator_polynomial(ec_count)[1:]
+        table = [
+            int.from_bytes(bytes(gf_multiply(factor, coefficient) for coefficient in low), "big")
+            for factor in range(256)
+        ]
+        _remainder_cache[ec_count] = table
+    return table
+
+
+def ec_codewords(data, ec_count):
+    """
+    Return the error correction codewords of one block.
+
+    Args:
+        data (bytes | list): The data codewords of the block.
+        ec_count (int): Number of error correction codewords.
+
+    Returns:
+        bytes: The ec_count error correction codewords.
+
+    Example:
+        >>> ec_codewords(bytes([32, 91, 11, 120, 209, 114, 220, 77, 67, 64, 236,
+        ...                     17, 236, 17, 236, 17]), 10).hex()
+        'c4232777ebd7e7e25d17'
+    """
+    table = _remainder_table(ec_count)
+    shift = 8 * (ec_count - 1)
+    mask = (1 << 8 * ec_count) - 1
+    remainder = 0
+    for codeword in data:
+        remainder = ((remainder << 8) & mask) ^ table[(remainder >> shift) ^ codeword]
+    return remainder.to_bytes(ec_count, "big")
+
+
+@lru_cache(maxsize=_PARITY_CACHE_SIZE)
+def _parity_matrix(data_count, ec_count):
+    """
+    Return the GF(2) parity matrix of a block shape, as float32 (data bits, ec bits).
+
+    Row 8*i + b holds the error correction bits produced by data codeword i
+    having only bit b (most significant first) set. The matrices are shared
+    between threads (lru_cache is thread-safe), so they are read-only.
+    """
+    table = _remainder_table(ec_count)
+    shift = 8 * (ec_count - 1)
+    mask = (1 << 8 * ec_count) - 1
+    # powers[k]: x^(ec_count + k) mod generator, i.e. the remainder of a 1
+    # at degree k of the data polynomial
+    powers = []
+    remainder = table[1]
+    for _ in range(data_count):
+        powers.append(remainder.to_bytes(ec_count, "big"))
+        remainder = ((remainder << 8) & mask) ^ table[remainder >> shift]
+    # Data codeword i has degree data_count - 1 - i
+    remainders = numpy.frombuffer(b"".join(reversed(powers)), dtype=numpy.uint8)
+    remainders = remainders.reshape(data_count, 1, ec_count)
+    bits = 1 << numpy.arange(7, -1, -1).reshape(1, 8, 1)
+    products = _multiply_table()[bits, remainders]
+    matrix = numpy.unpackbits(products, axis=2).reshape(data_count * 8, ec_count * 8)
+    matrix = matrix.astype(numpy.float32)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def _multiply_table():
+    """Return the full GF(256) multiplication table as a (256, 256) uint8 array."""
+    global _multiply_table_array
+    if _multiply_table_array is None:
+        _multiply_table_array = numpy.array(
+            [[gf_multiply(a, b) for b in range(256)] for a in range(256)], dtype=numpy.uint8)
+    return _multiply_table_array
+
+
+def _ec_codewords_array(blocks, ec_count):
+    """Encode a uint8 array (count, data_count) of blocks into (count, ec_count)."""
+    data_bits = numpy.unpackbits(blocks, axis=1).astype(numpy.float32)
+    # Each output bit is the XOR, i.e. the parity of the sum, of selected data bits
+    parity = data_bits @ _parity_matrix(blocks.shape[1], ec_count)
+    return numpy.packbits(parity.astype(numpy.int32) & 1, axis=1).astype(numpy.uint8)
+
+
+def ec_codewords_batch(blocks, ec_count):
+    """
+    Return the error correction codewords of many blocks of the same length.
+
+    With NumPy all blocks are encoded in one matrix product; without it they
+    are encoded one by one.
+
+    Args:
+        blocks (list): Data codewords (bytes or lists) of each block, all of
+                       the same length.
+        ec_count (int): Number of error correction codewords per block.
+
+    Returns:
+        list: bytes of ec_count codewords per block, in order.
+    """
+    if numpy is None or not blocks:
+        return [ec_codewords(block, ec_count) for block in blocks]
+    array = numpy.frombuffer(b"".join(bytes(block) for block in blocks), dtype=numpy.uint8)
+    array = array.reshape(len(blocks), -1)
+    return [row.tobytes() for row in _ec_codewords_array(array, ec_count)]
+
+
+class _BitWriter:
+    """A bit stream accumulated in one Python int, with BitBuffer's put()."""
+
+    __slots__ = ("value", "length")
+
+    def __init__(self):
+        self.value = 0
+        self.length = 0
+
+    def put(self, num, length):
+        self.value = (self.value << length) | (num & ((1 << length) - 1))
+        self.length += length
+
+    def __len__(self):
+        return self.length
+
+
+def data_codewords(version, error_correction, data_list):
+    """
+    Return the padded data codewords of data_list, before error correction.
+
+    This is the bit stream of util.create_data: the segments, a terminator of
+    up to four zero bits, zero bits up to a byte boundary and the alternating
+    pad codewords 0xEC, 0x11.
+
+    Raises:
+        qrcode.exceptions.DataOverflowError: If the data does not fit in version.
+    """
+    writer = _BitWriter()
+    for segment in data_list:
+        writer.put(segment.mode, 4)
+        writer.put(len(segment), util.length_in_bits(segment.mode, version))
+        if segment.mode == util.MODE_8BIT_BYTE:
+            # Whole bytes need no bit-level packing
+            data = segment.data
+            writer.value = (writer.value << 8 * len(data)) | int.from_bytes(data, "big")
+            writer.length += 8 * len(data)
+        else:
+            segment.write(writer)
+
+    bit_limit = util.BIT_LIMIT_TABLE[error_correction][version]
+    if writer.length > bit_limit:
+        raise exceptions.DataOverflowError(
+            f"Code length overflow. Data size ({writer.length}) > size available ({bit_limit})"
+        )
+
+    # Terminator, then zero bits up to the next byte boundary
+    padding = min(bit_limit - writer.length, 4)
+    padding += -(writer.length + padding) % 8
+    value = writer.value << padding
+    length = (writer.length + padding) // 8
+
+    pad_count = bit_limit // 8 - length
+    pad = bytes((util.PAD0, util.PAD1)) * (pad_count // 2 + 1)
+    return value.to_bytes(length, "big") + pad[:pad_count]
+
+
+def _block_layout(version, error_correction):
+    """
+    Return the block structure of a version and its interleaving order.
+
+    Returns:
+        tuple: (groups, order). groups lists (block_count, data_count, ec_count)
+               for each run of equal blocks. order maps each position of the
+               final codeword sequence to its index in the data codewords
+               followed by every block's error correction codewords.
+    """
+    key = (version, error_correction)
+    layout = _layout_cache.get(key)
+    if layout is None:
+        groups = []
+        for block in base.rs_blocks(version, error_correction):
+            shape = (block.data_count, block.total_count - block.data_count)
+            if groups and groups[-1][1:] == shape:
+                groups[-1] = (groups[-1][0] + 1,) + shape
+            else:
+                groups.append((1,) + shape)
+
+        data_starts, ec_starts, blocks = [], [], []
+        data_offset = 0
+        ec_offset = sum(count * data_count for count, data_count, _ in groups)
+        for count, data_count, ec_count in groups:
+            for _ in range(count):
+                data_starts.append(data_offset)
+                ec_starts.append(ec_offset)
+                blocks.append((data_count, ec_count))
+                data_offset += data_count
+                ec_offset += ec_count
+
+        order = []
+        for i in range(max(data_count for _, data_count, _ in groups)):
+            order.extend(start + i for start, (data_count, _) in zip(data_starts, blocks)
+                         if i < data_count)
+        for i in range(max(ec_count for _, _, ec_count in groups)):
+            order.extend(start + i for start, (_, ec_count) in zip(ec_starts, blocks)
+                         if i < ec_count)
+        layout = _layout_cache[key] = (tuple(groups), order)
+    return layout
+
+
+def create_data(version, error_correction, data_list):
+    """
+    Return the final codewords of a QR code, as util.create_data does.
+
+    The result can be assigned to QRCode.data_cache so that makeImpl() uses it
+    instead of encoding the data again.
+
+    Args:
+        version (int): QR code version (1-40).
+        error_correction (int): qrcode error correction constant.
+        data_list (list): qrcode QRData segments (QRCode.data_list).
+
+    Returns:
+        list: The interleaved data and error correction codewords, as ints.
+
+    Raises:
+        qrcode.exceptions.DataOverflowError: If the data does not fit in version.
+    """
+    data = data_codewords(version, error_correction, data_list)
+    groups, order = _block_layout(version, error_correction)
+    parts = [data]
+    offset = 0
+    for count, data_count, ec_count in groups:
+        for _ in range(count):
+            parts.append(ec_codewords(data[offset:offset + data_count], ec_count))
+            offset += data_count
+    codewords = b"".join(parts)
+    return [codewords[i] for i in order]
+
+
+def create_data_batch(version, error_correction, data_lists):
+    """
+    Return the final codewords of many QR codes of the same version.
+
+    With NumPy, the blocks of every code that share a shape are encoded in one
+    vectorized pass, and all codes are interleaved with one gather, which makes
+    this much faster per code than create_data() for large batches.
+
+    Args:
+        version (int): QR code version shared by every code (1-40).
+        error_correction (int): qrcode error correction constant.
+        data_lists (list): The data_list of each code.
+
+    Returns:
+        list: One list of codewords per code, as returned by create_data().
+
+    Raises:
+        qrcode.exceptions.DataOverflowError: If a code does not fit in version.
+    """
+    if numpy is None or not data_lists:
+        return [create_data(version, error_correction, data_list) for data_list in data_lists]
+
+    groups, order = _block_layout(version, error_correction)
+    data = numpy.frombuffer(
+        b"".join(data_codewords(version, error_correction, data_list)
+                 for data_list in data_lists),
+        dtype=numpy.uint8,
+    ).reshape(len(data_lists), -1)
+
+    parts = [data]
+    offset = 0
+    for count, data_count, ec_count in groups:
+        # (codes, count * data_count) -> (codes * count, data_count): one row per block
+        blocks = data[:, offset:offset + count * data_count].reshape(-1, data_count)
+        parts.append(_ec_codewords_array(blocks, ec_count).reshape(len(data_lists), -1))
+        offset += count * data_count
+    codewords = numpy.concatenate(parts, axis=1)[:, order]
+    return codewords.tolist()
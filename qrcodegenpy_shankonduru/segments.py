@@ -0,0 +1,221 @@
+"""
+Optimal Segmentation Module
+
+This module splits a payload into numeric, alphanumeric, byte and (optionally)
+kanji segments so that the encoded bit stream is as short as possible.
+
+qrcode's ``add_data`` only switches modes for runs of at least 20 digits or
+alphanumeric characters. Here a dynamic program over the characters keeps,
+for every mode, the cheapest encoding of the prefix that ends in that mode,
+charging each segment its 4-bit mode indicator and its character count field.
+Costs are tracked in sixths of a bit so that numeric (10 bits per 3 digits)
+and alphanumeric (11 bits per 2 characters) runs are exact. Because the count
+field widths change at versions 10 and 27, the split is computed per size
+class and the smallest resulting version wins.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import re
+
+from qrcode import exceptions, util
+
+from .capacity import SIZE_CLASSES, encoded_bits, version_for_bits
+
+NUMERIC = util.MODE_NUMBER
+ALPHANUMERIC = util.MODE_ALPHA_NUM
+BYTE = util.MODE_8BIT_BYTE
+KANJI = util.MODE_KANJI
+
+_ALPHANUMERIC_CHARS = frozenset(util.ALPHA_NUM.decode("ascii"))
+
+# Cost of one character in each mode, in sixths of a bit
+_NUMERIC_COST = 20
+_ALPHANUMERIC_COST = 33
+_KANJI_COST = 78
+
+# Cost of a character a mode cannot encode
+_IMPOSSIBLE = 1 << 62
+
+# A numeric or alphanumeric segment saves at most 14/3 bits per character over
+# byte mode but costs at least 13 header bits, plus 12 more when it splits a
+# byte segment in two. Unless a run of such characters reaches 3 at either end
+# of the text or 6 inside it, and the text is not that short, a single byte
+# segment is optimal and the dynamic program can be skipped.
+_ALPHANUMERIC_CLASS = "[" + re.escape(util.ALPHA_NUM.decode("ascii")) + "]"
+_MAY_SWITCH = re.compile(f"^{_ALPHANUMERIC_CLASS}{{3}}|{_ALPHANUMERIC_CLASS}{{3}}$|"
+                         f"{_ALPHANUMERIC_CLASS}{{6}}")
+
+
+class KanjiData(util.QRData):
+    """
+    A kanji mode segment: Shift JIS double-byte characters packed into 13 bits.
+
+    qrcode's QRData has no kanji support, so this subclass provides the
+    length (in characters) and the bit packing expected by util.create_data().
+    """
+
+    def __init__(self, data):
+        """
+        Initialize the segment.
+
+        Args:
+            data (str | bytes): Kanji characters, or their Shift JIS encoding.
+        """
+        if isinstance(data, str):
+            data = data.encode("shift_jis")
+        self.mode = KANJI
+        self.data = data
+
+    def __len__(self):
+        return len(self.data) // 2
+
+    def write(self, buffer):
+        data = self.data
+        for i in range(0, len(data), 2):
+            code = (data[i] << 8) | data[i + 1]
+            code -= 0x8140 if code <= 0x9FFC else 0xC140
+            buffer.put((code >> 8) * 0xC0 + (code & 0xFF), 13)
+
+    def __repr__(self):
+        return repr(self.data.decode("shift_jis"))
+
+
+def _kanji_bytes(char):
+    """Return the Shift JIS bytes of char if kanji mode can encode it, else None."""
+    try:
+        data = char.encode("shift_jis")
+    except UnicodeEncodeError:
+        return None
+    if len(data) != 2:
+        return None
+    code = (data[0] << 8) | data[1]
+    if 0x8140 <= code <= 0x9FFC or 0xE040 <= code <= 0xEBBF:
+        return data
+    return None
+
+
+def _char_costs(char, kanji):
+    """Return the cost of char in numeric, alphanumeric, byte and kanji mode."""
+    return (
+        _NUMERIC_COST if "0" <= char <= "9" else _IMPOSSIBLE,
+        _ALPHANUMERIC_COST if char in _ALPHANUMERIC_CHARS else _IMPOSSIBLE,
+        len(char.encode("utf-8")) * 48,
+        _KANJI_COST if kanji and _kanji_bytes(char) is not None else _IMPOSSIBLE,
+    )
+
+
+def optimal_segments(text, mode_sizes=util.MODE_SIZE_SMALL, kanji=False):
+    """
+    Split text into the segments with the shortest total bit length.
+
+    Args:
+        text (str): The payload.
+        mode_sizes (dict, optional): Character count field widths per mode, i.e.
+                                    the size class of the target version.
+                                    Defaults to versions 1-9.
+        kanji (bool, optional): Allow kanji mode. Defaults to False.
+
+    Returns:
+        list: qrcode QRData (and KanjiData) segments, in order.
+    """
+    if isinstance(text, bytes):
+        return [util.QRData(text, BYTE, check_data=False)] if text else []
+    text = str(text)
+    if not text:
+        return []
+    if not kanji and len(text) > 2 and not _MAY_SWITCH.search(text):
+        return [util.QRData(text.encode("utf-8"), BYTE, check_data=False)]
+
+    modes = (NUMERIC, ALPHANUMERIC, BYTE, KANJI) if kanji else (NUMERIC, ALPHANUMERIC, BYTE)
+    header = [(4 + mode_sizes[mode]) * 6 for mode in modes]
+    count = len(modes)
+
+    # costs[m]: cheapest encoding of the prefix so far whose last segment is in modes[m]
+    costs = header[:]
+    # previous_mode[i][m]: mode of character i-1 on the cheapest path ending with
+    # character i in modes[m]
+    previous_mode = []
+    char_cost_cache = {}
+    indices = range(count)
+    for char in text:
+        char_costs = char_cost_cache.get(char)
+        if char_costs is None:
+            char_costs = char_cost_cache[char] = _char_costs(char, kanji)[:count]
+        # Closing a segment rounds it up to whole bits before the next header;
+        # only the cheapest closed segment (or the runner-up, for its own
+        # mode) can be the best place to switch from
+        closed = [-(-cost // 6) * 6 for cost in costs]
+        first = min(indices, key=closed.__getitem__)
+        second = min((m for m in indices if m != first), key=closed.__getitem__)
+        new_costs = []
+        came_from = []
+        for m in indices:
+            char_cost = char_costs[m]
+            best = costs[m] + char_cost
+            source = m
+            if char_cost != _IMPOSSIBLE:
+                other = second if first == m else first
+                candidate = closed[other] + header[m] + char_cost
+                if candidate < best:
+                    best = candidate
+                    source = other
+            new_costs.append(best)
+            came_from.append(source)
+        previous_mode.append(came_from)
+        costs = new_costs
+
+    # Walk back from the cheapest final mode
+    mode = min(range(count), key=lambda m: -(-costs[m] // 6))
+    char_modes = [0] * len(text)
+    for i in range(len(text) - 1, -1, -1):
+        char_modes[i] = mode
+        mode = previous_mode[i][mode]
+
+    segments = []
+    start = 0
+    for i in range(1, len(text) + 1):
+        if i == len(text) or char_modes[i] != char_modes[start]:
+            segments.append(_make_segment(modes[char_modes[start]], text[start:i]))
+            start = i
+    return segments
+
+
+def _make_segment(mode, chunk):
+    if mode == KANJI:
+        return KanjiData(chunk)
+    return util.QRData(chunk.encode("utf-8"), mode, check_data=False)
+
+
+def segment_for_version(text, error_correction, start=1, kanji=False):
+    """
+    Return the optimal segments for text and the smallest version holding them.
+
+    The split is recomputed for each count field size class from the one
+    containing start, and the first class whose versions can hold its split
+    wins.
+
+    Args:
+        text (str): The payload.
+        error_correction (int): qrcode error correction constant.
+        start (int, optional): Lowest acceptable version. Defaults to 1.
+        kanji (bool, optional): Allow kanji mode. Defaults to False.
+
+    Returns:
+        tuple: (segments, version).
+
+    Raises:
+        qrcode.exceptions.DataOverflowError: If text does not fit in version 40.
+    """
+    util.check_version(start)
+    for first, last, mode_sizes in SIZE_CLASSES:
+        if last < start:
+            continue
+        segments = optimal_segments(text, mode_sizes, kanji)
+        version = version_for_bits(encoded_bits(segments, mode_sizes), error_correction,
+                                   max(first, start), last)
+        if version is not None:
+            return segments, version
+    raise exceptions.DataOverflowError()
@@ -0,0 +1,301 @@
+"""
+QR Code HTTP Server Module
+
+This module provides a small, dependency-free HTTP rendering service built on
+the standard library (``qrgen serve``). Codes are rendered from query
+parameters straight into the response body:
+
+    GET /qr?text=https://example.com&format=svg&box_size=8&border=2&ecc=M
+
+Connections are kept alive (HTTP/1.1), every response carries a strong ETag
+derived from the payload and settings hash, ``If-None-Match`` is answered with
+304 Not Modified without rendering, and rendered images are served from an
+in-process RenderCache. The image size limit is checked on the requested
+version up front and on the version the text needs only once it has been
+encoded, so 304 responses and cache hits do no encoding work. Per-stage timings of every request are aggregated by a
+MetricsCollector and exposed for scraping at ``GET /metrics`` in the
+Prometheus text format.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import sys
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import qrcode
+
+from .cache import RenderCache
+from .metrics import MetricsCollector
+from .qr_generator import IMAGE_FORMATS, QRCodeGenerator
+
+# Content type returned for each output format
+CONTENT_TYPES = {"PNG": "image/png", "SVG": "image/svg+xml", "PDF": "application/pdf"}
+
+# Error correction levels accepted by the ecc parameter
+ERROR_CORRECTION_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+# Upper bounds that keep a single request from allocating huge images
+MAX_BOX_SIZE = 100
+MAX_BORDER = 40
+MAX_TEXT_LENGTH = 7089
+
+# Largest image side, (modules + 2 * border) * box_size, whatever the parameters
+MAX_IMAGE_SIZE = 4096
+
+DEFAULT_MAX_AGE = 86400
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _int_param(params, name, default, minimum, maximum):
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+    if not minimum <= value <= maximum:
+        raise ValueError(f"{name} must be between {minimum} and {maximum}")
+    return value
+
+
+def _param(params, name, default):
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def parse_request(query):
+    """
+    Parse a query string into the payload and QRCodeGenerator settings.
+
+    Args:
+        query (str): The URL query string.
+
+    Returns:
+        tuple: (text, settings) where settings are QRCodeGenerator keyword arguments.
+
+    Raises:
+        ValueError: If a parameter is missing or invalid, or the image would
+                    exceed MAX_IMAGE_SIZE pixels per side even at the requested
+                    version (the text may need a larger one, see _check_size()).
+    """
+    params = parse_qs(query, keep_blank_values=True)
+    text = _param(params, "text", None)
+    if text is None:
+        raise ValueError("text parameter is required")
+    if len(text) > MAX_TEXT_LENGTH:
+        raise ValueError(f"text must be at most {MAX_TEXT_LENGTH} characters")
+
+    image_format = _param(params, "format", "PNG").upper()
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(IMAGE_FORMATS).lower()}")
+    ecc = _param(params, "ecc", "L").upper()
+    if ecc not in ERROR_CORRECTION_LEVELS:
+        raise ValueError("ecc must be one of L, M, Q, H")
+
+    settings = {
+        "version": _int_param(params, "version", 1, 1, 40),
+        "error_correction": ERROR_CORRECTION_LEVELS[ecc],
+        "box_size": _int_param(params, "box_size", 10, 1, MAX_BOX_SIZE),
+        "border": _int_param(params, "border", 4, 0, MAX_BORDER),
+        "fill_color": _param(params, "fill", "black"),
+        "back_color": _param(params, "back", "white"),
+        "image_format": image_format,
+    }
+
+    # The requested version is the smallest the code can have
+    _check_size(settings["version"] * 4 + 17, settings["border"], settings["box_size"])
+    return text, settings
+
+
+def _check_size(modules, border, box_size):
+    """Raise ValueError if a code of modules per side would exceed MAX_IMAGE_SIZE pixels."""
+    side = (modules + 2 * border) * box_size
+    if side > MAX_IMAGE_SIZE:
+        raise ValueError(f"image would be {side}x{side} pixels; (modules + 2 * border) "
+                         f"* box_size must be at most {MAX_IMAGE_SIZE}")
+
+
+class _SizeLimitedGenerator(QRCodeGenerator):
+    """
+    QRCodeGenerator refusing to render images larger than MAX_IMAGE_SIZE.
+
+    The check runs between encoding and serializing, so it uses the version
+    the text needs without segmenting it a second time, and never runs for
+    cache hits.
+    """
+
+    def _serialize(self, modules):
+        _check_size(len(modules), self.border, self.box_size)
+        return super()._serialize(modules)
+
+
+def etag_matches(if_none_match, etag):
+    """Return True if an If-None-Match header value matches etag (weak comparison)."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class QRRequestHandler(BaseHTTPRequestHandler):
+    """Request handler rendering QR codes for GET/HEAD /qr and serving /metrics."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "qrgen"
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body):
+        url = urlsplit(self.path)
+        if url.path == "/metrics":
+            self._send_metrics(send_body)
+            return
+        if url.path != "/qr":
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found", send_body)
+            return
+
+        try:
+            text, settings = parse_request(url.query)
+        except ValueError as error:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error), send_body)
+            return
+
+        generator = _SizeLimitedGenerator(output_folder=None, cache=self.server.cache,
+                                          observer=self.server.metrics, **settings)
+        image_format = generator.image_format
+        etag = f'"{generator._cache_key(text, image_format)}"'
+
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        try:
+            data = generator.generate_qr_bytes(text)
+        except qrcode.exceptions.DataOverflowError:
+            self._send_error(HTTPStatus.BAD_REQUEST, "text is too long for a QR code",
+                             send_body)
+            return
+        except ValueError as error:
+            # Raised for colors that cannot be parsed and images over MAX_IMAGE_SIZE
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error), send_body)
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[image_format])
+        self.send_header("Content-Length", str(len(data)))
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def _send_metrics(self, send_body):
+        body = self.server.metrics.to_prometheus().encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", f"public, max-age={self.server.max_age}")
+
+    def _send_error(self, status, message, send_body):
+        body = f"{message}\n".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class QRCodeServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server rendering QR codes with an in-process cache.
+
+    Attributes:
+        cache (RenderCache): Cache shared by all requests.
+        max_age (int): Cache-Control max-age in seconds.
+        quiet (bool): Suppress the per-request access log.
+        metrics (MetricsCollector): Stage timings of all rendered codes.
+
+    Example:
+        >>> server = QRCodeServer(("127.0.0.1", 8000))
+        >>> server.serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, cache=None, max_age=DEFAULT_MAX_AGE, quiet=False,
+                 metrics=None):
+        """
+        Initialize the server and bind it to server_address.
+
+        Args:
+            server_address (tuple): (host, port); port 0 picks a free port.
+            cache (RenderCache, optional): Cache to use. Defaults to a new RenderCache.
+            max_age (int, optional): Cache-Control max-age. Defaults to one day.
+            quiet (bool, optional): Disable access logging. Defaults to False.
+            metrics (MetricsCollector, optional): Collector served at /metrics.
+                                                Defaults to a new MetricsCollector.
+        """
+        self.cache = cache if cache is not None else RenderCache()
+        self.max_age = max_age
+        self.quiet = quiet
+        self.metrics = metrics if metrics is not None else MetricsCollector()
+        super().__init__(server_address, QRRequestHandler)
+
+
+def serve(host="127.0.0.1", port=8000, cache_entries=4096, max_age=DEFAULT_MAX_AGE,
+          quiet=False):
+    """
+    Run the QR code HTTP server until interrupted.
+
+    Args:
+        host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 8000.
+        cache_entries (int, optional): In-memory cache size. Defaults to 4096.
+        max_age (int, optional): Cache-Control max-age. Defaults to one day.
+        quiet (bool, optional): Disable access logging. Defaults to False.
+    """
+    server = QRCodeServer((host, port), RenderCache(max_entries=cache_entries), max_age,
+                          quiet)
+    print(f"Serving QR codes on http://{server.server_address[0]}:{server.server_port}/qr",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
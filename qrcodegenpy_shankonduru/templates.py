@@ -0,0 +1,224 @@
+"""
+Version Templates Module
+
+This module precomputes, once per QR code version, everything about the
+matrix that does not depend on the data:
+
+- the function patterns (finder patterns, separators, timing and alignment
+  patterns) with the format and version areas left light, as a bool array;
+- the data area, and the flat index of every data module in the order
+  ``map_data()`` fills them;
+- the positions of the format and version information.
+
+qrcode's ``makeImpl`` copies a nested list of the function patterns, re-places
+the format and version information and walks the zigzag placement module by
+module for every code. With a template, placing the codewords is one array
+copy and one scatter of their bits, and many codes of the same version are
+placed at once by place_batch().
+
+NumPy is required.
+
+Author: Shan Konduru
+Created: 2024
+License: MIT
+"""
+
+import threading
+
+import qrcode
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is an optional speed-up
+    numpy = None
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+class VersionTemplate:
+    """
+    The data-independent layout of one QR code version.
+
+    Templates are shared and must not be modified; use get_template() instead
+    of building them directly.
+
+    Attributes:
+        version (int): QR code version (1-40).
+        size (int): Modules per side.
+        modules (numpy.ndarray): bool (size, size) function patterns, with the
+                                 data, format and version areas light.
+        data_area (numpy.ndarray): bool (size, size), True where data modules go.
+        positions (numpy.ndarray): Flat indices of the data modules in placement order.
+
+    Example:
+        >>> template = get_template(5)
+        >>> matrix = template.place(codewords)
+        >>> template.finish(matrix, qrcode.constants.ERROR_CORRECT_M, mask_pattern=2)
+    """
+
+    def __init__(self, version):
+        """
+        Build the template of a version.
+
+        Args:
+            version (int): QR code version (1-40).
+        """
+        qrcode.util.check_version(version)
+        self.version = version
+        self.size = size = version * 4 + 17
+
+        # Let qrcode place its own function patterns on a scratch matrix
+        scratch = qrcode.QRCode(version=version)
+        scratch.modules_count = size
+        scratch.modules = [[None] * size for _ in range(size)]
+        scratch.setup_position_probe_pattern(0, 0)
+        scratch.setup_position_probe_pattern(size - 7, 0)
+        scratch.setup_position_probe_pattern(0, size - 7)
+        scratch.setup_position_adjust_pattern()
+        scratch.setup_timing_pattern()
+        patterns = [row[:] for row in scratch.modules]
+
+        # Test mode marks the format and version areas without darkening them
+        scratch.setup_type_info(True, 0)
+        if version >= 7:
+            scratch.setup_type_number(True)
+        reserved = numpy.array([[module is not None for module in row]
+                                for row in scratch.modules])
+        function = numpy.array([[module is not None for module in row] for row in patterns])
+
+        self.modules = numpy.array([[bool(module) for module in row] for row in patterns])
+        self.data_area = ~reserved
+        self.positions = numpy.array(_placement_order(reserved), dtype=numpy.intp)
+        self._info_positions = numpy.flatnonzero(reserved & ~function)
+        self._scratch = scratch
+        self._info_bits = {}
+
+        for array in (self.modules, self.data_area, self.positions):
+            array.flags.writeable = False
+
+    @property
+    def data_capacity(self):
+        """int: Number of data modules, i.e. codeword bits plus remainder bits."""
+        return len(self.positions)
+
+    def _codeword_bits(self, codewords):
+        """Return the bits of codewords, most significant first, as a uint8 array."""
+        return numpy.unpackbits(numpy.asarray(codewords, dtype=numpy.uint8), axis=-1)
+
+    def place(self, codewords):
+        """
+        Return the unmasked matrix holding codewords.
+
+        Args:
+            codewords (list | bytes): The final codewords (QRCode.data_cache).
+
+        Returns:
+            numpy.ndarray: A new bool (size, size) matrix. Remainder modules are light.
+        """
+        bits = self._codeword_bits(codewords)
+        matrix = self.modules.copy()
+        matrix.reshape(-1)[self.positions[:len(bits)]] = bits
+        return matrix
+
+    def place_batch(self, codeword_lists):
+        """
+        Return the unmasked matrices of many codes of this version.
+
+        Args:
+            codeword_lists (list): The codewords of each code; all have the
+                                   length of this version's codeword sequence.
+
+        Returns:
+            numpy.ndarray: bool (count, size, size) matrices.
+        """
+        bits = self._codeword_bits(codeword_lists)
+        count = len(bits)
+        matrices = numpy.empty((count, self.size, self.size), dtype=bool)
+        matrices[:] = self.modules
+        matrices.reshape(count, -1)[:, self.positions[:bits.shape[1]]] = bits
+        return matrices
+
+    def info_bits(self, error_correction, mask_pattern):
+        """
+        Return the format (and version) information modules of the final symbol.
+
+        Returns:
+            numpy.ndarray: bool values for the reserved non-pattern modules, in
+                           flat index order; cached per setting.
+        """
+        key = (error_correction, mask_pattern)
+        bits = self._info_bits.get(key)
+        if bits is None:
+            with _templates_lock:
+                scratch = self._scratch
+                scratch.error_correction = error_correction
+                scratch.setup_type_info(False, mask_pattern)
+                if self.version >= 7:
+                    scratch.setup_type_number(False)
+                flat = [module for row in scratch.modules for module in row]
+            bits = numpy.array([flat[i] for i in self._info_positions], dtype=bool)
+            bits.flags.writeable = False
+            self._info_bits[key] = bits
+        return bits
+
+    def finish(self, matrices, error_correction, mask_pattern):
+        """
+        Write the format and version information into masked matrices, in place.
+
+        Args:
+            matrices (numpy.ndarray): bool (size, size) or (count, size, size).
+            error_correction (int): qrcode error correction constant.
+            mask_pattern (int | list): The mask applied to the data modules, or
+                                       the mask of each of the count matrices.
+        """
+        flat = matrices.reshape(matrices.shape[:-2] + (-1,))
+        if numpy.ndim(mask_pattern) == 0:
+            flat[..., self._info_positions] = self.info_bits(error_correction, mask_pattern)
+        else:
+            bits = numpy.stack([self.info_bits(error_correction, pattern)
+                                for pattern in range(8)])
+            flat[:, self._info_positions] = bits[numpy.asarray(mask_pattern, dtype=numpy.intp)]
+
+    def __repr__(self):
+        return f"VersionTemplate(version={self.version})"
+
+
+def _placement_order(reserved):
+    """Return the flat indices of the unreserved modules in map_data() order."""
+    size = len(reserved)
+    positions = []
+    row = size - 1
+    step = -1
+    for col in range(size - 1, 0, -2):
+        # The vertical timing pattern column is skipped entirely
+        if col <= 6:
+            col -= 1
+        while True:
+            for c in (col, col - 1):
+                if not reserved[row][c]:
+                    positions.append(row * size + c)
+            row += step
+            if row < 0 or row >= size:
+                row -= step
+                step = -step
+                break
+    return positions
+
+
+def get_template(version):
+    """
+    Return the shared template of a version, building it on first use.
+
+    Args:
+        version (int): QR code version (1-40).
+
+    Returns:
+        VersionTemplate: The cached template.
+    """
+    template = _templates.get(version)
+    if template is None:
+        template = VersionTemplate(version)
+        with _templates_lock:
+            template = _templates.setdefault(version, template)
+    return template
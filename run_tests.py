@@ -7,6 +7,7 @@ This script provides various options for running tests:
 - Run specific test modules
 - Generate coverage reports
 - Run tests with different verbosity levels
+- Run the benchmark suite and check it against a saved baseline (--bench)
 """
 
 import sys
@@ -29,6 +30,31 @@ def run_command(command, description):
         return False
 
 
+def run_benchmarks(args):
+    """Run benchmarks/suite.py and return its exit status."""
+    from benchmarks import suite
+
+    print("⏱️  QR Code Generator Benchmark Suite")
+    print("=" * 40)
+    argv = [
+        "--iterations", str(args.bench_iterations),
+        "--output", args.bench_output,
+        "--baseline", args.baseline,
+        "--threshold", str(args.threshold),
+    ]
+    if args.bench_filter:
+        argv += ["--filter", args.bench_filter]
+    if args.save_baseline:
+        argv.append("--save-baseline")
+
+    status = suite.main(argv)
+    if status == 0:
+        print("\n🎉 Benchmarks completed without regressions!")
+    else:
+        print("\n💥 Performance regressions detected!")
+    return status
+
+
 def main():
     """Main function to handle command line arguments and run tests."""
     parser = argparse.ArgumentParser(description="Test runner for QRCodeGenerator")
@@ -67,8 +93,47 @@ def main():
         action="store_true", 
         help="Run tests quickly (skip slow tests)"
     )
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="Run the benchmark suite instead of the tests"
+    )
+    parser.add_argument(
+        "--bench-iterations",
+        type=int,
+        default=200,
+        help="Timed iterations of the fastest benchmarks (default: 200)"
+    )
+    parser.add_argument(
+        "--bench-filter",
+        help="Only run benchmarks whose name contains this text"
+    )
+    parser.add_argument(
+        "--bench-output",
+        default="bench_results.json",
+        help="JSON file for the benchmark results (default: bench_results.json)"
+    )
+    parser.add_argument(
+        "--baseline",
+        default="benchmarks/baseline.json",
+        help="Baseline results to compare with (default: benchmarks/baseline.json)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.20,
+        help="Allowed slowdown or memory growth versus the baseline, as a fraction (default: 0.20)"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Save the benchmark results as the new baseline"
+    )
     
     args = parser.parse_args()
+
+    if args.bench:
+        return run_benchmarks(args)
     
     # Get the Python executable path
     python_path = Path(sys.executable)
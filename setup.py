@@ -55,7 +55,8 @@ setup(
             "twine>=4.0.0",
             "python-dotenv>=1.0.0",
         ],
-        "ui": ["streamlit>=1.30.0"],
+        "ui": ["streamlit>=1.30.0", "openpyxl>=3.1.0"],
+        "fast": ["numpy>=1.26.0"],
     },
     entry_points={
         "console_scripts": [
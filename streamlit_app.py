@@ -3,29 +3,177 @@ Streamlit UI for QR Code Generator
 
 A user-friendly web interface for generating QR codes from various types of content.
 Users can input text, URLs, or other data and generate QR codes with customizable settings.
+
+Streamlit reruns this script on every keystroke and widget change. Rendered
+images are therefore kept in one RenderCache shared by all sessions of the
+server (bounded in entries and bytes), and a single in-memory generator is
+reused, so a rerun with unchanged content does not encode anything again.
+Files are only written when the user clicks "Save to Output Folder".
+
+The Bulk tab turns an uploaded CSV/XLSX table into one code per row, mapping
+columns to the fields of a content type. Generation runs as a BulkJob in a
+background thread, on a process pool shared by all sessions, so the page keeps
+polling its progress and other sessions of the server are not blocked; the
+result is offered as a single in-memory ZIP download.
 """
 
 import streamlit as st
-import os
-import tempfile
 import base64
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from PIL import Image
 import io
 
 # Import our QR Code Generator
-from QRCodeGenerator import QRCodeGenerator
+from qrcodegenpy_shankonduru import BulkJob, QRCodeGenerator, RenderCache, read_table
+from qrcodegenpy_shankonduru.content import (CONTENT_TYPES, build_email, build_phone,
+                                             build_vcard, build_wifi, payloads_from_rows)
+
+# Limits of the render cache shared by every session of the server
+CACHE_MAX_ENTRIES = 2048
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Worker processes shared by the bulk jobs of all sessions, and how often a
+# job's progress is refreshed
+BULK_WORKERS = min(4, os.cpu_count() or 1)
+BULK_POLL_SECONDS = 0.5
+UNMAPPED_COLUMN = "(not used)"
+
+
+@st.cache_resource
+def get_render_cache():
+    """Return the render cache shared across reruns and sessions."""
+    return RenderCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES)
+
+
+@st.cache_resource
+def get_bulk_executor():
+    """
+    Return the process pool shared by the bulk jobs of every session.
+
+    Jobs run in background threads, so the workers are spawned rather than
+    forked, and one bounded pool keeps the process count independent of the
+    number of users.
+    """
+    return ProcessPoolExecutor(max_workers=BULK_WORKERS,
+                               mp_context=multiprocessing.get_context("spawn"))
+
 
+@st.cache_resource
+def get_generator():
+    """Return the shared in-memory generator; it never touches the filesystem."""
+    return QRCodeGenerator(output_folder=None, cache=get_render_cache())
 
-def get_image_download_link(img_path, filename):
-    """Generate a download link for the QR code image."""
-    with open(img_path, "rb") as file:
-        img_data = file.read()
+
+def save_qr_code(content, file_prefix, output_folder):
+    """
+    Write the QR code of content to output_folder and return the saved path.
+
+    The image is taken from the shared render cache, so saving does not encode
+    it again.
+    """
+    generator = QRCodeGenerator(file_prefix, output_folder, cache=get_render_cache())
+    return generator.generate_qr_code(content)
+
+
+@st.cache_data(max_entries=8)
+def load_table(data, filename):
+    """Parse an uploaded table once per distinct upload."""
+    return read_table(data, filename)
+
+
+def get_image_download_link(img_data, filename):
+    """Generate a download link for in-memory PNG bytes of a QR code."""
     b64_img = base64.b64encode(img_data).decode()
     href = f'<a href="data:image/png;base64,{b64_img}" download="{filename}">📥 Download QR Code</a>'
     return href
 
 
+def render_bulk_tab(file_prefix):
+    """Bulk mode: table upload, column mapping, background job and ZIP download."""
+    st.header("📦 Bulk Generation")
+    st.markdown("Upload a CSV or Excel file and map its columns to the content fields. "
+                "One QR code is generated per row and all of them are downloaded as one ZIP.")
+
+    uploaded = st.file_uploader("Upload CSV or XLSX", type=["csv", "xlsx"])
+    job = st.session_state.get("bulk_job")
+    running = job is not None and not job.finished
+
+    if uploaded is not None:
+        try:
+            columns, rows = load_table(uploaded.getvalue(), uploaded.name)
+        except (ValueError, ImportError, UnicodeDecodeError) as e:
+            st.error(f"❌ Could not read {uploaded.name}: {str(e)}")
+            return
+
+        content_type = st.selectbox("Content Type", list(CONTENT_TYPES), key="bulk_content_type")
+        field_names = CONTENT_TYPES[content_type][1]
+
+        # Map each content field to a column, preselecting columns named like the field
+        st.subheader("🔗 Column Mapping")
+        options = [UNMAPPED_COLUMN] + columns
+        column_map = {}
+        mapping_cols = st.columns(len(field_names))
+        for position, (field, mapping_col) in enumerate(zip(field_names, mapping_cols)):
+            if field in columns:
+                default = options.index(field)
+            else:
+                default = 1 if position == 0 and columns else 0
+            label = field.replace("_", " ").title() + (" *" if position == 0 else "")
+            choice = mapping_col.selectbox(label, options, index=default,
+                                           key=f"bulk_{content_type}_{field}")
+            column_map[field] = None if choice == UNMAPPED_COLUMN else choice
+
+        payloads = list(payloads_from_rows(rows, content_type, column_map))
+        st.caption(f"{len(rows):,} rows read, {len(payloads):,} QR codes to generate "
+                   "(rows without the required * field are skipped)")
+        if payloads:
+            st.code(payloads[0], language="text")
+
+        if st.button("🚀 Generate ZIP", disabled=running or not payloads):
+            generator = QRCodeGenerator(file_prefix, None)
+            job = BulkJob(payloads, generator, workers=BULK_WORKERS,
+                          executor=get_bulk_executor()).start()
+            st.session_state.bulk_job = job
+            st.session_state.bulk_filename = (
+                f"{file_prefix}_{datetime.now().strftime('%Y%m%d%H%M%S')}.zip")
+
+    if job is not None:
+        show_bulk_job(job, st.session_state.bulk_filename)
+
+
+def show_bulk_job(job, filename):
+    """Show the progress of a bulk job, polling until it has finished."""
+    if not job.finished:
+        st.progress(job.progress, text=f"{job.done:,} / {job.total:,} QR codes · "
+                                       f"{job.throughput:,.0f} codes/s")
+        if st.button("⏹️ Cancel"):
+            job.cancel()
+        # Only this session waits; the job itself runs in the background
+        time.sleep(BULK_POLL_SECONDS)
+        st.rerun()
+
+    if job.error is not None:
+        st.error(f"❌ Bulk generation failed: {str(job.error)}")
+        return
+    if job.cancelled:
+        st.warning(f"⏹️ Cancelled after {job.done:,} of {job.total:,} QR codes")
+        return
+
+    st.success(f"✅ Generated {job.done - job.failed:,} QR codes in {job.elapsed:.1f}s "
+               f"({job.throughput:,.0f} codes/s)")
+    if job.failed:
+        st.warning(f"⚠️ {job.failed:,} rows could not be encoded")
+        with st.expander("Failed rows"):
+            st.table([{"Row": index + 1, "Content": payload, "Error": message}
+                      for index, payload, message in job.failures])
+    st.download_button("📥 Download ZIP", data=job.data, file_name=filename,
+                       mime="application/zip")
+
+
 def main():
     """Main Streamlit application."""
     # Page configuration
@@ -64,131 +212,111 @@ def main():
         help="Select the type of content you want to encode"
     )
 
-    # Main content area
-    col1, col2 = st.columns([1, 1])
+    single_tab, bulk_tab = st.tabs(["📱 Single Code", "📦 Bulk"])
 
-    with col1:
-        st.header("📝 Input")
+    with single_tab:
+        # Main content area
+        col1, col2 = st.columns([1, 1])
+
+        with col1:
+            st.header("📝 Input")
         
-        # Dynamic input based on content type
-        if content_type == "Text":
-            content = st.text_area(
-                "Enter your text:",
-                placeholder="Hello, World!",
-                height=150
-            )
+            # Dynamic input based on content type
+            if content_type == "Text":
+                content = st.text_area(
+                    "Enter your text:",
+                    placeholder="Hello, World!",
+                    height=150
+                )
             
-        elif content_type == "URL":
-            content = st.text_input(
-                "Enter URL:",
-                placeholder="https://www.example.com"
-            )
+            elif content_type == "URL":
+                content = st.text_input(
+                    "Enter URL:",
+                    placeholder="https://www.example.com"
+                )
             
-        elif content_type == "Email":
-            email = st.text_input(
-                "Email Address:",
-                placeholder="user@example.com"
-            )
-            subject = st.text_input(
-                "Subject (optional):",
-                placeholder="Email subject"
-            )
-            body = st.text_area(
-                "Message (optional):",
-                placeholder="Email message",
-                height=100
-            )
+            elif content_type == "Email":
+                email = st.text_input(
+                    "Email Address:",
+                    placeholder="user@example.com"
+                )
+                subject = st.text_input(
+                    "Subject (optional):",
+                    placeholder="Email subject"
+                )
+                body = st.text_area(
+                    "Message (optional):",
+                    placeholder="Email message",
+                    height=100
+                )
             
-            # Construct mailto URL
-            content = f"mailto:{email}"
-            if subject or body:
-                params = []
-                if subject:
-                    params.append(f"subject={subject}")
-                if body:
-                    params.append(f"body={body}")
-                if params:
-                    content += "?" + "&".join(params)
+                # Construct mailto URL
+                content = build_email(email, subject, body)
                     
-        elif content_type == "Phone":
-            content = st.text_input(
-                "Phone Number:",
-                placeholder="+1234567890"
-            )
-            if content and not content.startswith("tel:"):
-                content = f"tel:{content}"
+            elif content_type == "Phone":
+                content = st.text_input(
+                    "Phone Number:",
+                    placeholder="+1234567890"
+                )
+                content = build_phone(content)
                 
-        elif content_type == "WiFi":
-            st.subheader("WiFi Settings")
-            network_name = st.text_input("Network Name (SSID):")
-            password = st.text_input("Password:", type="password")
-            security = st.selectbox("Security Type:", ["WPA", "WEP", "nopass"])
-            hidden = st.checkbox("Hidden Network")
+            elif content_type == "WiFi":
+                st.subheader("WiFi Settings")
+                network_name = st.text_input("Network Name (SSID):")
+                password = st.text_input("Password:", type="password")
+                security = st.selectbox("Security Type:", ["WPA", "WEP", "nopass"])
+                hidden = st.checkbox("Hidden Network")
             
-            if network_name:
-                content = f"WIFI:T:{security};S:{network_name};P:{password};H:{'true' if hidden else 'false'};;"
-            else:
-                content = ""
+                content = build_wifi(network_name, password, security, hidden)
                 
-        elif content_type == "vCard":
-            st.subheader("Contact Information")
-            full_name = st.text_input("Full Name:")
-            organization = st.text_input("Organization:")
-            phone = st.text_input("Phone:")
-            email = st.text_input("Email:")
-            url = st.text_input("Website:")
+            elif content_type == "vCard":
+                st.subheader("Contact Information")
+                full_name = st.text_input("Full Name:")
+                organization = st.text_input("Organization:")
+                phone = st.text_input("Phone:")
+                email = st.text_input("Email:")
+                url = st.text_input("Website:")
             
-            if full_name:
-                content = f"""BEGIN:VCARD
-VERSION:3.0
-FN:{full_name}
-ORG:{organization}
-TEL:{phone}
-EMAIL:{email}
-URL:{url}
-END:VCARD"""
-            else:
-                content = ""
+                content = build_vcard(full_name, organization, phone, email, url)
                 
-        else:  # Custom
-            content = st.text_area(
-                "Enter your custom content:",
-                placeholder="Enter any text, URL, or formatted data...",
-                height=200
-            )
-
-        # Display preview of content
-        if content:
-            st.subheader("📋 Content Preview")
-            st.code(content, language="text")
-
-    with col2:
-        st.header("🎯 QR Code")
+            else:  # Custom
+                content = st.text_area(
+                    "Enter your custom content:",
+                    placeholder="Enter any text, URL, or formatted data...",
+                    height=200
+                )
+
+            # Display preview of content
+            if content:
+                st.subheader("📋 Content Preview")
+                st.code(content, language="text")
+
+        with col2:
+            st.header("🎯 QR Code")
         
-        if content:
-            try:
-                # Create QR code generator
-                generator = QRCodeGenerator(file_prefix, output_folder)
+            if content:
+                try:
+                    # Generate QR code in memory with the shared generator - served from
+                    # the render cache when this content was already rendered
+                    with st.spinner("Generating QR code..."):
+                        png_bytes = get_generator().generate_qr_bytes(content)
                 
-                # Generate QR code
-                with st.spinner("Generating QR code..."):
-                    qr_path = generator.generate_qr_code(content)
+                    # Display QR code (only the PNG header is parsed for the properties)
+                    img = Image.open(io.BytesIO(png_bytes))
+                    st.image(png_bytes, caption="Generated QR Code", use_column_width=True)
                 
-                # Display QR code
-                if os.path.exists(qr_path):
-                    # Load and display image
-                    img = Image.open(qr_path)
-                    st.image(img, caption="Generated QR Code", use_column_width=True)
-                    
                     # Download link
-                    filename = os.path.basename(qr_path)
-                    download_link = get_image_download_link(qr_path, filename)
+                    filename = f"{file_prefix}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.png"
+                    download_link = get_image_download_link(png_bytes, filename)
                     st.markdown(download_link, unsafe_allow_html=True)
-                    
-                    # File info
+                
                     st.success(f"✅ QR code generated successfully!")
-                    st.info(f"📁 Saved as: `{qr_path}`")
-                    
+                
+                    # Writing to the output folder only happens on request
+                    if st.button("💾 Save to Output Folder"):
+                        qr_path = save_qr_code(content, file_prefix, output_folder)
+                        st.info(f"📁 Saved as: `{qr_path}`")
+                
                     # Image properties
                     st.subheader("📊 Image Properties")
                     col_a, col_b = st.columns(2)
@@ -199,10 +327,10 @@ END:VCARD"""
                         st.metric("Height", f"{img.height}px")
                         st.metric("Mode", img.mode)
                 
-            except Exception as e:
-                st.error(f"❌ Error generating QR code: {str(e)}")
-        else:
-            st.info("👆 Enter content in the input section to generate a QR code")
+                except Exception as e:
+                    st.error(f"❌ Error generating QR code: {str(e)}")
+            else:
+                st.info("👆 Enter content in the input section to generate a QR code")
 
     # Footer with additional information
     st.markdown("---")
@@ -213,8 +341,10 @@ END:VCARD"""
         1. **Choose Content Type**: Select the type of content you want to encode
         2. **Enter Content**: Fill in the required fields based on your selection
         3. **Customize Settings**: Use the sidebar to adjust file prefix and output folder
-        4. **Generate**: Your QR code will be generated automatically
+        4. **Generate**: Your QR code will be generated automatically, in memory
         5. **Download**: Click the download link to save the QR code to your device
+        6. **Save**: Click "Save to Output Folder" to also write it to the output folder
+        7. **Bulk**: In the Bulk tab, upload a CSV/XLSX table, map its columns and download a ZIP
         
         **Supported Content Types:**
         - **Text**: Plain text content
@@ -230,6 +360,7 @@ END:VCARD"""
         st.markdown("""
         - **QR Code Quality**: The generated QR codes use optimized settings for best readability
         - **File Naming**: Files are automatically named with timestamps to prevent conflicts
+        - **Caching**: Codes already rendered (by anyone using this server) are shown instantly
         - **Large Content**: Keep content reasonably sized - very long text may create complex QR codes
         - **Testing**: Test your QR codes with different scanners to ensure compatibility
         - **WiFi Sharing**: Use the WiFi option to create QR codes for easy network sharing
@@ -249,6 +380,15 @@ END:VCARD"""
     
     st.sidebar.metric("QR Codes Generated", st.session_state.qr_count)
 
+    # Render cache shared by all sessions
+    stats = get_render_cache().stats()
+    st.sidebar.metric("Cached Images", stats.entries)
+    st.sidebar.metric("Cache Hit Rate", f"{stats.hit_rate:.0%}")
+
+    # Rendered last: while a bulk job runs, this tab reruns the script to poll it
+    with bulk_tab:
+        render_bulk_tab(file_prefix)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""
+Tests for the ZIP and tar archive sinks and the qrgen --archive option.
+"""
+
+import csv
+import io
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import zipfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from PIL import Image
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import (
+    QRCodeGenerator,
+    TarSink,
+    ZipSink,
+    open_archive_sink,
+    run_pipeline,
+)
+from qrcodegenpy_shankonduru.cli import cli
+
+
+def read_manifest(data):
+    return list(csv.reader(io.StringIO(data.decode("utf-8"))))
+
+
+class TestArchiveSinks:
+    """Test class for ZipSink, TarSink and open_archive_sink()."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.generator = QRCodeGenerator("tag", None, box_size=2, border=1)
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_zip_members_and_manifest(self):
+        """Test that every image and the manifest end up in the ZIP."""
+        path = os.path.join(self.test_dir, "codes.zip")
+        payloads = ["alpha", "beta, with comma", "gamma"]
+        results = list(run_pipeline(payloads, self.generator, ZipSink(path, self.generator)))
+
+        assert [result.path for result in results] == [
+            "tag_00000000.png", "tag_00000001.png", "tag_00000002.png"]
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist()[-1] == "manifest.csv"
+            rows = read_manifest(archive.read("manifest.csv"))
+            assert rows[0] == ["index", "payload", "member"]
+            assert rows[2] == ["1", "beta, with comma", "tag_00000001.png"]
+            expected = self.generator.generate_qr_bytes("beta, with comma")
+            assert archive.read("tag_00000001.png") == expected
+            assert archive.getinfo("tag_00000000.png").compress_type == zipfile.ZIP_STORED
+
+    def test_zip_deflates_svg(self):
+        """Test that SVG members are compressed by default."""
+        generator = QRCodeGenerator("tag", None, image_format="SVG")
+        path = os.path.join(self.test_dir, "codes.zip")
+        with ZipSink(path, generator) as sink:
+            sink.write(0, "svg", generator.generate_qr_bytes("svg"))
+
+        with zipfile.ZipFile(path) as archive:
+            assert archive.getinfo("tag_00000000.svg").compress_type == zipfile.ZIP_DEFLATED
+
+    def test_zip_to_unseekable_stream(self):
+        """Test streaming a ZIP to a write-only file object."""
+        class WriteOnly(io.RawIOBase):
+            def __init__(self):
+                self.buffer = io.BytesIO()
+
+            def writable(self):
+                return True
+
+            def write(self, data):
+                return self.buffer.write(data)
+
+        stream = WriteOnly()
+        with ZipSink(stream, self.generator) as sink:
+            sink.write(0, "x", self.generator.generate_qr_bytes("x"))
+
+        with zipfile.ZipFile(io.BytesIO(stream.buffer.getvalue())) as archive:
+            assert archive.namelist() == ["tag_00000000.png", "manifest.csv"]
+
+    @pytest.mark.parametrize("name", ["codes.tar", "codes.tar.gz", "codes.tgz", "codes.tar.xz"])
+    def test_tar_archives(self, name):
+        """Test tar output with every supported compression."""
+        path = os.path.join(self.test_dir, name)
+        results = list(run_pipeline(["one", "two"], self.generator,
+                                    open_archive_sink(path, self.generator)))
+
+        assert all(result.ok for result in results)
+        with tarfile.open(path) as archive:
+            assert archive.getnames() == ["tag_00000000.png", "tag_00000001.png", "manifest.csv"]
+            data = archive.extractfile("tag_00000001.png").read()
+            with Image.open(io.BytesIO(data)) as img:
+                assert img.format == "PNG"
+            rows = read_manifest(archive.extractfile("manifest.csv").read())
+            assert rows[1:] == [["0", "one", "tag_00000000.png"], ["1", "two", "tag_00000001.png"]]
+
+    def test_tar_memory_does_not_grow(self):
+        """Test that written tar members are not retained."""
+        sink = TarSink(os.path.join(self.test_dir, "codes.tar"), self.generator)
+        for index in range(5):
+            sink.write(index, "x", b"data")
+        assert sink._tar.members == []
+        sink.close()
+
+    def test_parallel_pipeline_into_zip(self):
+        """Test that worker processes feed the archive in input order."""
+        path = os.path.join(self.test_dir, "codes.zip")
+        payloads = [f"item {i}" for i in range(12)]
+        results = list(run_pipeline(payloads, self.generator, ZipSink(path, self.generator),
+                                    workers=2, chunksize=3))
+
+        assert all(result.ok for result in results)
+        with zipfile.ZipFile(path) as archive:
+            rows = read_manifest(archive.read("manifest.csv"))[1:]
+        assert [row[1] for row in rows] == payloads
+
+    def test_failed_items_are_not_archived(self):
+        """Test that failures are reported and left out of the manifest."""
+        path = os.path.join(self.test_dir, "codes.zip")
+        results = list(run_pipeline(["ok", "X" * 5000], self.generator,
+                                    ZipSink(path, self.generator)))
+
+        assert results[0].ok and not results[1].ok
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist() == ["tag_00000000.png", "manifest.csv"]
+
+    def test_without_manifest(self):
+        """Test that the manifest can be disabled."""
+        path = os.path.join(self.test_dir, "codes.zip")
+        with ZipSink(path, self.generator, manifest=False) as sink:
+            sink.write(0, "x", b"data")
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist() == ["tag_00000000.png"]
+
+    def test_write_after_close(self):
+        """Test that writing to a closed sink fails."""
+        sink = ZipSink(os.path.join(self.test_dir, "codes.zip"), self.generator)
+        sink.close()
+        sink.close()
+        with pytest.raises(ValueError):
+            sink.write(0, "x", b"data")
+
+    def test_unsupported_extension(self):
+        """Test that unknown archive types are rejected."""
+        with pytest.raises(ValueError):
+            open_archive_sink(os.path.join(self.test_dir, "codes.rar"), self.generator)
+
+
+class TestArchiveCli:
+    """Test class for qrgen --archive."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_bulk_into_archive(self):
+        """Test that bulk mode writes one archive and no loose files."""
+        input_file = os.path.join(self.test_dir, "payloads.txt")
+        with open(input_file, "w", encoding="utf-8") as file:
+            file.write("\n".join(f"CLI item {i}" for i in range(5)))
+        archive_path = os.path.join(self.test_dir, "out.zip")
+        output_folder = os.path.join(self.test_dir, "unused")
+
+        captured_output = StringIO()
+        with patch('sys.stdout', captured_output):
+            exit_code = cli(["--input-file", input_file, "--archive", archive_path,
+                             "--output", output_folder, "--workers", "1"])
+
+        assert exit_code == 0
+        assert f"Generated 5 QR codes in {archive_path}" in captured_output.getvalue()
+        assert not os.path.exists(output_folder)
+        with zipfile.ZipFile(archive_path) as archive:
+            assert len(archive.namelist()) == 6
+
+    def test_single_text_into_archive(self):
+        """Test that a single text can be archived too."""
+        archive_path = os.path.join(self.test_dir, "out.tar.gz")
+        with patch('sys.stdout', StringIO()):
+            exit_code = cli(["hello", "--archive", archive_path, "--format", "svg"])
+
+        assert exit_code == 0
+        with tarfile.open(archive_path) as archive:
+            assert archive.getnames() == ["qr_code_00000000.svg", "manifest.csv"]
+
+    def test_bad_archive_type(self):
+        """Test that an unsupported archive path exits with an error."""
+        captured_error = StringIO()
+        with patch('sys.stderr', captured_error):
+            exit_code = cli(["hello", "--archive", os.path.join(self.test_dir, "out.7z")])
+
+        assert exit_code == 2
+        assert "Unsupported archive type" in captured_error.getvalue()
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,216 @@
+"""
+Tests for the asyncio front-end AsyncQRCodeGenerator.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from PIL import Image
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import (AsyncQRCodeGenerator, MetricsCollector, QRCodeGenerator,
+                                     RenderCache)
+from qrcodegenpy_shankonduru import aio
+
+
+class TestAsyncQRCodeGenerator:
+    """Test class for AsyncQRCodeGenerator."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "async_output")
+        self.generator = QRCodeGenerator("async", self.test_output_folder)
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_generate_qr_code(self):
+        """Test that a file matching the synchronous output is written."""
+        async_generator = AsyncQRCodeGenerator(self.generator)
+        path = asyncio.run(async_generator.generate_qr_code("https://www.example.com"))
+
+        with Image.open(path) as actual, \
+                Image.open(self.generator.generate_qr_code("https://www.example.com")) as expected:
+            assert actual.tobytes() == expected.tobytes()
+
+    def test_generate_qr_bytes_uses_cache(self):
+        """Test in-memory output and cache reuse."""
+        cache = RenderCache()
+        async_generator = AsyncQRCodeGenerator(
+            QRCodeGenerator("async", self.test_output_folder, cache=cache))
+
+        async def run():
+            return [await async_generator.generate_qr_bytes("same") for _ in range(3)]
+
+        first, second, third = asyncio.run(run())
+        assert first == second == third
+        assert first.startswith(b"\x89PNG")
+        assert cache.stats().hits == 2
+        assert os.listdir(self.test_output_folder) == []
+
+    def test_does_not_block_event_loop(self):
+        """Test that the loop keeps ticking while codes are rendered."""
+        async_generator = AsyncQRCodeGenerator(self.generator)
+        ticks = []
+
+        async def ticker(stop):
+            while not stop.is_set():
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0)
+
+        async def run():
+            stop = asyncio.Event()
+            task = asyncio.create_task(ticker(stop))
+            await async_generator.generate_qr_bytes("X" * 1500)
+            stop.set()
+            await task
+
+        asyncio.run(run())
+        assert len(ticks) > 1
+
+    def test_gather_results_in_order_with_errors(self):
+        """Test generate_qr_codes() ordering and per-item errors."""
+        async_generator = AsyncQRCodeGenerator(self.generator, max_concurrency=2)
+        contents = ["one", "X" * 5000, "three", "four"]
+
+        results = asyncio.run(async_generator.generate_qr_codes(contents))
+
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert [r.ok for r in results] == [True, False, True, True]
+        assert len(os.listdir(self.test_output_folder)) == 3
+
+    def test_bounded_concurrency(self, monkeypatch):
+        """Test that no more than max_concurrency renders run at once."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+        original = aio._render_with
+
+        def tracking_render(generator, input_string, timed=False):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.01)
+            try:
+                return original(generator, input_string, timed)
+            finally:
+                with lock:
+                    active.pop()
+
+        monkeypatch.setattr(aio, "_render_with", tracking_render)
+        executor = ThreadPoolExecutor(max_workers=8)
+        async_generator = AsyncQRCodeGenerator(self.generator, executor=executor,
+                                               max_concurrency=2)
+        try:
+            asyncio.run(async_generator.generate_qr_codes([f"item {i}" for i in range(8)]))
+        finally:
+            executor.shutdown()
+        assert max(peak) <= 2
+
+    def test_cancellation(self):
+        """Test that cancelling a pending generation raises CancelledError."""
+        executor = ThreadPoolExecutor(max_workers=1)
+        async_generator = AsyncQRCodeGenerator(self.generator, executor=executor,
+                                               max_concurrency=1)
+
+        async def run():
+            first = asyncio.create_task(async_generator.generate_qr_code("first"))
+            second = asyncio.create_task(async_generator.generate_qr_code("second"))
+            await asyncio.sleep(0)
+            second.cancel()
+            await first
+            with pytest.raises(asyncio.CancelledError):
+                await second
+
+        try:
+            asyncio.run(run())
+        finally:
+            executor.shutdown()
+        assert len(os.listdir(self.test_output_folder)) == 1
+
+    def test_process_executor(self):
+        """Test rendering in a process pool."""
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            async_generator = AsyncQRCodeGenerator(self.generator, executor=executor)
+            results = asyncio.run(async_generator.generate_qr_codes(["p1", "p2", "p3"]))
+
+        assert all(r.ok for r in results)
+        assert len(os.listdir(self.test_output_folder)) == 3
+
+    @pytest.mark.parametrize("executor_type", [None, ThreadPoolExecutor, ProcessPoolExecutor])
+    def test_observer(self, executor_type):
+        """Test that async calls report their stage timings like the synchronous API."""
+        records = []
+        generator = QRCodeGenerator("async", self.test_output_folder, cache=RenderCache(),
+                                    observer=records.append)
+        executor = executor_type(max_workers=2) if executor_type else None
+        async_generator = AsyncQRCodeGenerator(generator, executor=executor)
+
+        async def run():
+            await async_generator.generate_qr_code("observed")
+            await async_generator.generate_qr_bytes("observed")
+
+        try:
+            asyncio.run(run())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        saved, hit = records
+        assert list(saved.stages) == ["cache", "segment", "make", "render", "save"]
+        assert saved.version == 1 and not saved.cached
+        assert saved.total == pytest.approx(sum(saved.stages.values()))
+        assert hit.cached and list(hit.stages) == ["cache"]
+
+    def test_metrics_collector(self):
+        """Test that a MetricsCollector counts codes generated through asyncio."""
+        metrics = MetricsCollector()
+        async_generator = AsyncQRCodeGenerator(
+            QRCodeGenerator("async", self.test_output_folder, observer=metrics))
+        asyncio.run(async_generator.generate_qr_codes(["a", "b", "X" * 5000]))
+
+        assert metrics.snapshot()["codes"] == 2
+
+    def test_process_generators_bounded(self, monkeypatch):
+        """Test that worker processes keep a bounded number of generators."""
+        monkeypatch.setattr(aio, "_process_generators", aio.OrderedDict())
+        settings = aio._generator_settings(self.generator)
+        for box_size in range(1, aio.MAX_PROCESS_GENERATORS + 5):
+            aio._render_in_process(None, dict(settings, box_size=box_size), "x")
+        # The most recently used generator is kept, the oldest are dropped
+        aio._render_in_process(None, dict(settings, box_size=5), "x")
+        aio._render_in_process(None, dict(settings, box_size=100), "x")
+
+        boxes = [dict(key)["box_size"] for key in aio._process_generators]
+        assert len(boxes) == aio.MAX_PROCESS_GENERATORS
+        assert boxes[-2:] == [5, 100] and 6 not in boxes
+
+    def test_generator_built_from_kwargs(self):
+        """Test constructing the wrapped generator from keyword arguments."""
+        async_generator = AsyncQRCodeGenerator(file_prefix="kw",
+                                               output_folder=self.test_output_folder,
+                                               image_format="svg")
+        data = asyncio.run(async_generator.generate_qr_bytes("kwargs"))
+        assert data.startswith(b"<?xml")
+
+    def test_invalid_concurrency(self):
+        """Test that a non-positive concurrency bound is rejected."""
+        with pytest.raises(ValueError):
+            AsyncQRCodeGenerator(self.generator, max_concurrency=0)
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,169 @@
+"""
+Tests for the batch API of the packaged QRCodeGenerator.
+
+This module checks that generate_qr_codes() yields lazily, keeps input order,
+matches the single-item output and reports per-item failures without stopping,
+and that the grouped batch encoder produces the same symbols as single encodes.
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+import types
+import pytest
+import qrcode
+from PIL import Image
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator, QRCodeResult
+
+
+class TestBatchGeneration:
+    """Test class for QRCodeGenerator.generate_qr_codes()."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "batch_output")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_returns_lazy_generator(self):
+        """Test that nothing is generated until results are consumed."""
+        generator = QRCodeGenerator("lazy", self.test_output_folder)
+        results = generator.generate_qr_codes(["one", "two"])
+
+        assert isinstance(results, types.GeneratorType)
+        assert os.listdir(self.test_output_folder) == []
+
+        first = next(results)
+        assert first.ok
+        assert len(os.listdir(self.test_output_folder)) == 1
+
+    def test_results_in_input_order(self):
+        """Test that every item yields a result in input order."""
+        generator = QRCodeGenerator("order", self.test_output_folder)
+        contents = [f"Asset tag {i}" for i in range(10)]
+
+        results = list(generator.generate_qr_codes(iter(contents)))
+
+        assert [r.index for r in results] == list(range(10))
+        assert [r.input_string for r in results] == contents
+        assert all(isinstance(r, QRCodeResult) for r in results)
+        assert len({r.path for r in results}) == len(results)
+        for result in results:
+            assert result.ok
+            assert os.path.exists(result.path)
+            img = Image.open(result.path)
+            assert img.format == "PNG"
+            img.close()
+
+    def test_version_resets_between_items(self):
+        """Test that a long payload does not inflate the size of the next one."""
+        generator = QRCodeGenerator("reset", self.test_output_folder)
+        single_path = generator.generate_qr_code("short")
+
+        results = list(generator.generate_qr_codes(["X" * 500, "short"]))
+
+        with Image.open(single_path) as expected, Image.open(results[1].path) as actual:
+            assert actual.size == expected.size
+            assert actual.tobytes() == expected.tobytes()
+
+    def test_failures_do_not_abort_batch(self):
+        """Test that an item too large for a QR code is reported and skipped."""
+        generator = QRCodeGenerator("errors", self.test_output_folder)
+
+        results = list(generator.generate_qr_codes(["before", "X" * 5000, "after"]))
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].path is None
+        assert results[1].error is not None
+        assert os.path.exists(results[2].path)
+        assert len(os.listdir(self.test_output_folder)) == 2
+
+    def test_empty_input(self):
+        """Test that an empty iterable yields no results."""
+        generator = QRCodeGenerator("empty", self.test_output_folder)
+        assert list(generator.generate_qr_codes([])) == []
+
+    @pytest.mark.parametrize("box_size, border", [(1, 0), (5, 2), (10, 4)])
+    def test_custom_settings_applied(self, box_size, border):
+        """Test that configured box size and border are used for batch items."""
+        generator = QRCodeGenerator("sized", self.test_output_folder,
+                                    box_size=box_size, border=border)
+        result = next(generator.generate_qr_codes(["Sized"]))
+
+        with Image.open(result.path) as img:
+            assert img.size[0] == (21 + 2 * border) * box_size
+
+    @pytest.mark.parametrize("batch_size", [1, 3, 64])
+    def test_batches_match_single_items(self, batch_size):
+        """Test that every batch size writes the images of generate_qr_code()."""
+        generator = QRCodeGenerator("grouped", self.test_output_folder, naming="counter")
+        contents = ["A-1", "https://example.com/" + "x" * 60, "A-2", "X" * 5000, "A-1"]
+
+        results = list(generator.generate_qr_codes(contents, batch_size=batch_size))
+
+        assert [r.ok for r in results] == [True, True, True, False, True]
+        single = QRCodeGenerator("single", os.path.join(self.test_dir, "single"))
+        for result in results:
+            if not result.ok:
+                continue
+            with Image.open(result.path) as actual, \
+                    Image.open(single.generate_qr_code(result.input_string)) as expected:
+                assert actual.tobytes() == expected.tobytes()
+
+    def test_invalid_batch_size(self):
+        """Test that a batch size below 1 is rejected when called."""
+        generator = QRCodeGenerator("invalid", self.test_output_folder)
+        with pytest.raises(ValueError):
+            generator.generate_qr_codes(["a"], batch_size=0)
+
+
+class TestEncodeBatch:
+    """Test class for QRCodeGenerator._encode_batch()."""
+
+    PAYLOADS = ["short", "https://example.com/item/1", "X" * 5000, "12345678901234567890",
+                "https://example.com/item/2", "x" * 300, "short"]
+
+    @pytest.mark.parametrize("options", [
+        {},
+        {"engine": "qrcode"},
+        {"mask_pattern": 3, "error_correction": qrcode.constants.ERROR_CORRECT_H},
+        {"version": 5, "kanji": True},
+    ])
+    def test_matches_single_encode(self, options):
+        """Test that grouped encoding gives each payload the matrix of _encode()."""
+        generator = QRCodeGenerator(output_folder=None, **options)
+
+        encoded = generator._encode_batch(self.PAYLOADS)
+
+        assert len(encoded) == len(self.PAYLOADS)
+        for payload, code in zip(self.PAYLOADS, encoded):
+            qr = generator._new_qr()
+            try:
+                expected = generator._encode(qr, payload)
+            except qrcode.exceptions.DataOverflowError:
+                assert isinstance(code.error, qrcode.exceptions.DataOverflowError)
+                assert code.modules is None
+                continue
+            assert code.error is None
+            assert code.version == qr.version
+            assert code.modules == expected
+            assert set(code.stages) == {"segment", "make"}
+
+    def test_empty_batch(self):
+        """Test that an empty batch encodes nothing."""
+        assert QRCodeGenerator(output_folder=None)._encode_batch([]) == []
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
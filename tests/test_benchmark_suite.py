@@ -0,0 +1,158 @@
+"""
+Tests for the benchmark suite run by `run_tests.py --bench`.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from io import StringIO
+from itertools import count
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks import suite
+
+
+def result(ops_per_sec, peak_kib=100.0):
+    return {"ops_per_sec": ops_per_sec, "p50_ms": 1.0, "p99_ms": 2.0, "peak_kib": peak_kib,
+            "iterations": 10}
+
+
+class TestMeasure:
+    """Test class for measure() and run_suite()."""
+
+    def test_measure_statistics(self):
+        """Test that measure() reports consistent statistics."""
+        stats = suite.measure(lambda: sum(range(1000)), iterations=20, warmup=1)
+        assert stats["iterations"] == 20
+        assert stats["ops_per_sec"] > 0
+        assert 0 < stats["p50_ms"] <= stats["p99_ms"]
+        assert stats["peak_kib"] >= 0
+
+    def test_measure_per_call(self):
+        """Test that batch timings are reported per operation."""
+        # A clock advancing one second per reading makes every call last exactly 1 s
+        with patch.object(suite.time, "perf_counter", count().__next__):
+            single = suite.measure(lambda: None, iterations=5, warmup=0)
+        with patch.object(suite.time, "perf_counter", count().__next__):
+            batch = suite.measure(lambda: None, iterations=5, warmup=0, per_call=10)
+        assert (single["ops_per_sec"], single["p50_ms"]) == (1.0, 1000.0)
+        assert (batch["ops_per_sec"], batch["p50_ms"]) == (10.0, 100.0)
+
+    def test_run_suite_filter(self):
+        """Test a filtered run and the results document."""
+        seen = []
+        document = suite.run_suite(iterations=5, name_filter="rasterize/short",
+                                   progress=lambda name, _: seen.append(name))
+        assert list(document["results"]) == ["rasterize/short_url"] == seen
+        entry = document["results"]["rasterize/short_url"]
+        assert entry["version"] >= 1
+        assert entry["payload_chars"] == len(suite.PAYLOADS["short_url"])
+        assert document["meta"]["package_version"]
+
+    def test_benchmark_names_cover_every_stage(self):
+        """Test that every stage is benchmarked for every payload size."""
+        names = [name for name, *_ in suite._benchmarks(5)]
+        for stage in ("encode", "mask", "rasterize", "png_pillow", "png_builtin"):
+            for label in suite.PAYLOADS:
+                assert f"{stage}/{label}" in names
+        for batch, single in suite.SPEEDUPS.items():
+            assert batch in names and single in names
+        assert "matrix_memory/packed" in names and "matrix_memory/lists" in names
+        assert "startup/version" in names
+
+    def test_matrix_memory(self):
+        """Test that packed matrices are measured as holding far less than nested lists."""
+        document = suite.run_suite(iterations=5, name_filter="matrix_memory/")
+        results = document["results"]
+        assert results["matrix_memory/packed"]["matrices"] == suite.BATCH_SIZE
+        assert (results["matrix_memory/packed"]["peak_kib"] * 10
+                < results["matrix_memory/lists"]["peak_kib"])
+
+    def test_speedups(self):
+        """Test the batch versus one-at-a-time ratios."""
+        document = {"results": {"batch/short_url": result(300.0),
+                                "loop/short_url": result(200.0),
+                                "encode_batch/short_url": result(50.0)}}
+        assert suite.speedups(document) == {"batch/short_url": 1.5}
+
+
+class TestCompare:
+    """Test class for compare() and the baseline workflow."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_within_threshold(self):
+        """Test that small changes are not regressions."""
+        baseline = {"results": {"encode/x": result(100.0)}}
+        current = {"results": {"encode/x": result(85.0, 110.0)}}
+        assert suite.compare(current, baseline, 0.20) == []
+
+    def test_slowdown(self):
+        """Test that a throughput drop beyond the threshold is reported."""
+        baseline = {"results": {"encode/x": result(100.0)}}
+        current = {"results": {"encode/x": result(70.0)}}
+        (message,) = suite.compare(current, baseline, 0.20)
+        assert "encode/x" in message and "30% slower" in message
+
+    def test_memory_growth(self):
+        """Test that peak memory growth beyond the threshold is reported."""
+        baseline = {"results": {"mask/x": result(100.0, 100.0)}}
+        current = {"results": {"mask/x": result(100.0, 150.0)}}
+        (message,) = suite.compare(current, baseline, 0.20)
+        assert "peak" in message
+
+    def test_new_and_removed_benchmarks_ignored(self):
+        """Test that benchmarks missing on either side are skipped."""
+        baseline = {"results": {"old/x": result(100.0)}}
+        current = {"results": {"new/x": result(1.0)}}
+        assert suite.compare(current, baseline) == []
+
+    def test_main_baseline_workflow(self):
+        """Test saving a baseline, passing against it and failing a doctored one."""
+        output = os.path.join(self.test_dir, "results.json")
+        baseline = os.path.join(self.test_dir, "baseline", "baseline.json")
+        argv = ["--iterations", "5", "--filter", "rasterize/short", "--output", output,
+                "--baseline", baseline]
+
+        with patch("sys.stdout", StringIO()):
+            assert suite.main(argv + ["--save-baseline"]) == 0
+            assert os.path.exists(baseline)
+            assert suite.main(argv + ["--threshold", "10"]) == 0
+
+            with open(baseline, encoding="utf-8") as file:
+                saved = json.load(file)
+            saved["results"]["rasterize/short_url"]["ops_per_sec"] *= 1000
+            with open(baseline, "w", encoding="utf-8") as file:
+                json.dump(saved, file)
+            assert suite.main(argv) == 1
+
+        with open(output, encoding="utf-8") as file:
+            assert "rasterize/short_url" in json.load(file)["results"]
+
+    def test_main_without_baseline(self):
+        """Test that a missing baseline is reported but does not fail."""
+        stdout = StringIO()
+        with patch("sys.stdout", stdout):
+            status = suite.main(["--iterations", "5", "--filter", "rasterize/short",
+                                 "--output", os.path.join(self.test_dir, "r.json"),
+                                 "--baseline", os.path.join(self.test_dir, "none.json")])
+        assert status == 0
+        assert "No baseline" in stdout.getvalue()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
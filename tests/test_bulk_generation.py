@@ -0,0 +1,335 @@
+"""
+Tests for bulk generation: payload readers, the process pool and the CLI bulk mode.
+"""
+
+import multiprocessing
+import os
+import sys
+import json
+import tempfile
+import shutil
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO, StringIO
+from unittest.mock import patch
+import pytest
+from PIL import Image
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import (BulkJob, QRCodeGenerator, generate_bulk, read_payloads,
+                                     read_table)
+from qrcodegenpy_shankonduru.cli import cli
+
+
+class TestReadPayloads:
+    """Test class for the lazy payload readers."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(content)
+        return path
+
+    def test_text_file(self):
+        """Test one payload per line with blank lines skipped."""
+        path = self.write("payloads.txt", "first\n\nsecond line\r\nthird\n")
+        assert list(read_payloads(path)) == ["first", "second line", "third"]
+
+    def test_csv_first_column(self):
+        """Test that the first CSV column is used by default."""
+        path = self.write("payloads.csv", "https://a.example,A\nhttps://b.example,B\n")
+        assert list(read_payloads(path)) == ["https://a.example", "https://b.example"]
+
+    def test_csv_named_column(self):
+        """Test selecting a CSV column by header name."""
+        path = self.write("payloads.csv", "sku,url\n1,https://a.example\n2,\"x,y\"\n")
+        assert list(read_payloads(path, "url")) == ["https://a.example", "x,y"]
+
+    def test_csv_missing_column(self):
+        """Test that an unknown column name is rejected."""
+        path = self.write("payloads.csv", "sku,url\n1,a\n")
+        with pytest.raises(ValueError):
+            list(read_payloads(path, "missing"))
+
+    def test_jsonl(self):
+        """Test JSON Lines with plain strings and objects."""
+        lines = [json.dumps("plain"), json.dumps({"text": "object"}), "",
+                 json.dumps({"text": 42})]
+        path = self.write("payloads.jsonl", "\n".join(lines) + "\n")
+        assert list(read_payloads(path)) == ["plain", "object", "42"]
+
+    def test_jsonl_custom_field(self):
+        """Test reading objects from a custom field."""
+        path = self.write("payloads.jsonl", json.dumps({"url": "https://x.example"}))
+        assert list(read_payloads(path, "url")) == ["https://x.example"]
+
+    def test_jsonl_errors_name_the_line(self):
+        """Test that a missing field or invalid JSON is reported with its line number."""
+        path = self.write("payloads.jsonl", '{"text": "a"}\n\n{"url": "b"}\n')
+        with pytest.raises(ValueError, match=r"line 3: no 'text' field"):
+            list(read_payloads(path))
+
+        path = self.write("broken.jsonl", '"a"\n{"text": \n')
+        with pytest.raises(ValueError, match="line 2: invalid JSON"):
+            list(read_payloads(path))
+
+    def test_unsupported_extension(self):
+        """Test that unknown file types are rejected up front."""
+        with pytest.raises(ValueError):
+            read_payloads(self.write("payloads.xml", "<a/>"))
+
+
+class TestGenerateBulk:
+    """Test class for generate_bulk()."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "bulk_output")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    @pytest.mark.parametrize("workers, chunksize", [(1, 64), (2, 1), (3, 4)])
+    def test_ordered_results(self, workers, chunksize):
+        """Test that results come back complete and in input order."""
+        contents = [f"Bulk item {i}" for i in range(25)]
+
+        results = list(generate_bulk(iter(contents), "bulk", self.test_output_folder,
+                                     workers=workers, chunksize=chunksize))
+
+        assert [r.index for r in results] == list(range(25))
+        assert [r.input_string for r in results] == contents
+        assert all(r.ok for r in results)
+        assert len({r.path for r in results}) == 25
+        assert len(os.listdir(self.test_output_folder)) == 25
+        img = Image.open(results[-1].path)
+        assert img.format == "PNG"
+        img.close()
+
+    def test_failures_reported_from_workers(self):
+        """Test that a failing item in a worker does not stop the batch."""
+        contents = ["ok 1", "X" * 5000, "ok 2"]
+
+        results = list(generate_bulk(contents, "bulk", self.test_output_folder,
+                                     workers=2, chunksize=1))
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].index == 1
+
+    def test_invalid_worker_count(self):
+        """Test that a non-positive worker count is rejected."""
+        with pytest.raises(ValueError):
+            list(generate_bulk(["a"], "bulk", self.test_output_folder, workers=0))
+
+
+class TestReadTable:
+    """Test class for read_table() on uploaded tables."""
+
+    def test_csv(self):
+        """Test a CSV upload with a BOM and a header row."""
+        data = "\ufeffname,url\nHome,https://example.com\nShop,https://shop.example\n"
+        columns, rows = read_table(BytesIO(data.encode("utf-8")), "links.CSV")
+
+        assert columns == ["name", "url"]
+        assert rows == [{"name": "Home", "url": "https://example.com"},
+                        {"name": "Shop", "url": "https://shop.example"}]
+
+    def test_xlsx(self):
+        """Test an Excel upload, skipping blank rows."""
+        openpyxl = pytest.importorskip("openpyxl")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["ssid", "password"])
+        sheet.append(["Office", "secret"])
+        sheet.append([None, None])
+        sheet.append(["Guest", 1234])
+        buffer = BytesIO()
+        workbook.save(buffer)
+
+        columns, rows = read_table(buffer.getvalue(), "wifi.xlsx")
+
+        assert columns == ["ssid", "password"]
+        assert rows == [{"ssid": "Office", "password": "secret"},
+                        {"ssid": "Guest", "password": 1234}]
+
+    def test_unsupported_extension(self):
+        """Test that other file types are rejected."""
+        with pytest.raises(ValueError):
+            read_table(b"", "links.ods")
+
+
+class TestBulkJob:
+    """Test class for BulkJob background generation."""
+
+    def generator(self):
+        return QRCodeGenerator("job", None)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_zip_archive(self, workers):
+        """Test that the job builds a ZIP with every code and a manifest."""
+        contents = [f"Job item {i}" for i in range(10)]
+        job = BulkJob(iter(contents), self.generator(), workers=workers, chunksize=3)
+        assert job.progress == 0.0 and not job.finished
+
+        assert job.start().wait(30)
+
+        assert job.error is None
+        assert (job.done, job.failed, job.total) == (10, 0, 10)
+        assert job.progress == 1.0
+        assert job.throughput > 0
+        with zipfile.ZipFile(BytesIO(job.data)) as archive:
+            names = archive.namelist()
+            assert names[0] == "job_00000000.png"
+            assert len(names) == 11 and names[-1] == "manifest.csv"
+
+    def test_shared_executor(self):
+        """Test that concurrent jobs with different settings share one spawned pool."""
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+            png = BulkJob([f"png {i}" for i in range(7)], self.generator(), workers=2,
+                          chunksize=2, executor=executor).start()
+            svg = BulkJob([f"svg {i}" for i in range(7)],
+                          QRCodeGenerator("vec", None, image_format="SVG"), workers=2,
+                          chunksize=2, executor=executor).start()
+            assert png.wait(60) and svg.wait(60)
+            # The pool is left running for the next job
+            assert executor.submit(sum, [1, 2]).result() == 3
+
+        assert png.error is None and svg.error is None
+        with zipfile.ZipFile(BytesIO(png.data)) as archive:
+            assert archive.namelist()[:7] == [f"job_{i:08d}.png" for i in range(7)]
+        with zipfile.ZipFile(BytesIO(svg.data)) as archive:
+            assert archive.read("vec_00000006.svg").startswith(b"<?xml")
+
+    def test_failures_are_reported(self):
+        """Test that failing payloads are counted and do not stop the job."""
+        job = BulkJob(["ok", "X" * 5000, "ok 2"], self.generator()).start()
+        job.wait(30)
+
+        assert (job.done, job.failed) == (3, 1)
+        # DataOverflowError has no message; its name is reported instead
+        assert job.failures[0] == (1, "X" * 5000, "DataOverflowError")
+        with zipfile.ZipFile(BytesIO(job.data)) as archive:
+            assert len(archive.namelist()) == 3
+
+    def test_cancel(self):
+        """Test that a cancelled job stops early without an archive."""
+        job = BulkJob([f"item {i}" for i in range(2000)], self.generator())
+        job.cancel()
+        job.start().wait(30)
+
+        assert job.cancelled and job.finished
+        assert job.done < job.total
+        assert job.data is None
+
+    def test_start_twice(self):
+        """Test that a job can only be started once."""
+        job = BulkJob([], self.generator()).start()
+        job.wait(30)
+        assert job.progress == 1.0
+        with pytest.raises(RuntimeError):
+            job.start()
+
+
+class TestBulkCli:
+    """Test class for the qrgen --input-file bulk mode."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "cli_output")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_bulk_mode(self):
+        """Test generating every line of an input file from the CLI."""
+        input_file = os.path.join(self.test_dir, "payloads.txt")
+        with open(input_file, "w", encoding="utf-8") as file:
+            file.write("\n".join(f"CLI item {i}" for i in range(6)))
+
+        captured_output = StringIO()
+        with patch('sys.stdout', captured_output):
+            exit_code = cli(["--input-file", input_file, "--output",
+                             self.test_output_folder, "--workers", "2", "--chunksize", "2"])
+
+        assert exit_code == 0
+        assert "Generated 6 QR codes" in captured_output.getvalue()
+        assert len(os.listdir(self.test_output_folder)) == 6
+
+    def test_single_text_still_supported(self):
+        """Test that the positional text argument keeps working."""
+        captured_output = StringIO()
+        with patch('sys.stdout', captured_output), \
+                patch.dict(os.environ, {'QRGEN_NO_DAEMON': '1'}):
+            cli(["hello", "--output", self.test_output_folder])
+
+        assert "QR code generated successfully!" in captured_output.getvalue()
+        assert len(os.listdir(self.test_output_folder)) == 1
+
+    def run_cli(self, *args):
+        """Run the CLI, returning (exit code, stdout, stderr)."""
+        stdout, stderr = StringIO(), StringIO()
+        with patch('sys.stdout', stdout), patch('sys.stderr', stderr):
+            exit_code = cli(list(args) + ["--output", self.test_output_folder])
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    @pytest.mark.parametrize("name, content, expected", [
+        ("missing.txt", None, "No such file"),
+        ("payloads.xls", "", "Unsupported input file type: .xls"),
+        ("payloads.jsonl", '{"text": "a"}\n{"url": "b"}\n', "line 2: no 'text' field"),
+        ("payloads.csv", "sku,url\n1,a\n", "Column 'link' not found"),
+    ])
+    def test_input_errors_exit_with_message(self, name, content, expected):
+        """Test that unreadable or malformed input exits with status 2 and no traceback."""
+        input_file = os.path.join(self.test_dir, name)
+        if content is not None:
+            with open(input_file, "w", encoding="utf-8") as file:
+                file.write(content)
+        args = ["--input-file", input_file, "--workers", "1"]
+        if name.endswith(".csv"):
+            args += ["--column", "link"]
+
+        exit_code, _, stderr = self.run_cli(*args)
+
+        assert exit_code == 2
+        assert expected in stderr
+
+    def test_failure_without_message(self):
+        """Test that a failure whose exception has no message names its type."""
+        input_file = os.path.join(self.test_dir, "payloads.txt")
+        with open(input_file, "w", encoding="utf-8") as file:
+            file.write("ok\n" + "X" * 5000 + "\n")
+
+        exit_code, stdout, stderr = self.run_cli("--input-file", input_file, "--workers", "1")
+
+        assert exit_code == 1
+        assert "Failed to generate QR code for item 1: DataOverflowError" in stderr
+        assert "Generated 1 QR codes" in stdout
+
+    def test_text_or_input_file_required(self):
+        """Test that running without any payload is a usage error."""
+        with patch('sys.stderr', StringIO()), pytest.raises(SystemExit):
+            cli(["--output", self.test_output_folder])
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
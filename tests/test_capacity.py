@@ -0,0 +1,151 @@
+"""
+Tests for the precomputed capacity table and one-step version selection.
+"""
+
+import random
+import string
+import sys
+from pathlib import Path
+import pytest
+import qrcode
+from qrcode import util
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator
+from qrcodegenpy_shankonduru.capacity import (SIZE_CLASSES, encoded_bits, max_characters,
+                                              version_for_bits)
+
+L = qrcode.constants.ERROR_CORRECT_L
+M = qrcode.constants.ERROR_CORRECT_M
+Q = qrcode.constants.ERROR_CORRECT_Q
+H = qrcode.constants.ERROR_CORRECT_H
+
+ALPHABETS = [
+    string.digits,
+    string.digits + string.ascii_uppercase + " $%*+-./:",
+    string.printable,
+    "日本語héllo" + string.ascii_letters,
+]
+
+
+def reference_version(data_list, error_correction, start):
+    """Return the version qrcode's own best_fit() chooses, or None on overflow."""
+    qr = qrcode.QRCode(error_correction=error_correction)
+    qr.data_list = data_list
+    try:
+        return qr.best_fit(start)
+    except (qrcode.exceptions.DataOverflowError, ValueError):
+        return None
+
+
+def select_version(data_list, error_correction, start=1):
+    """Look the version of fixed segments up in the capacity index, as segment_for_version does."""
+    for first, last, mode_sizes in SIZE_CLASSES:
+        if last < start:
+            continue
+        version = version_for_bits(encoded_bits(data_list, mode_sizes), error_correction,
+                                   max(first, start), last)
+        if version is not None:
+            return version
+    raise qrcode.exceptions.DataOverflowError()
+
+
+class TestCapacityTable:
+    """Test class for the capacity table."""
+
+    @pytest.mark.parametrize("version, error_correction, mode, expected", [
+        (1, L, util.MODE_NUMBER, 41),
+        (1, H, util.MODE_NUMBER, 17),
+        (1, L, util.MODE_ALPHA_NUM, 25),
+        (1, L, util.MODE_8BIT_BYTE, 17),
+        (1, L, util.MODE_KANJI, 10),
+        (10, M, util.MODE_8BIT_BYTE, 213),
+        (40, L, util.MODE_NUMBER, 7089),
+        (40, L, util.MODE_ALPHA_NUM, 4296),
+        (40, L, util.MODE_8BIT_BYTE, 2953),
+        (40, L, util.MODE_KANJI, 1817),
+        (40, H, util.MODE_8BIT_BYTE, 1273),
+    ])
+    def test_matches_standard_capacities(self, version, error_correction, mode, expected):
+        """Test values against the ISO/IEC 18004 capacity table."""
+        assert max_characters(version, error_correction, mode) == expected
+
+    def test_invalid_version(self):
+        """Test that versions outside 1-40 are rejected."""
+        with pytest.raises(ValueError):
+            max_characters(41, L)
+
+
+class TestSelectVersion:
+    """Test class for the version index (version_for_bits() by size class)."""
+
+    def test_matches_best_fit(self):
+        """Test that the lookup agrees with qrcode's search on random payloads."""
+        rng = random.Random(1234)
+        for _ in range(400):
+            length = rng.choice([rng.randint(0, 60), rng.randint(0, 600), rng.randint(0, 4000)])
+            text = "".join(rng.choice(rng.choice(ALPHABETS)) for _ in range(length))
+            error_correction = rng.choice([L, M, Q, H])
+            start = rng.choice([1, 1, 7, 10, 26, 27, 35])
+            qr = qrcode.QRCode()
+            qr.add_data(text)
+
+            expected = reference_version(qr.data_list, error_correction, start)
+            if expected is None:
+                with pytest.raises(qrcode.exceptions.DataOverflowError):
+                    select_version(qr.data_list, error_correction, start)
+            else:
+                assert select_version(qr.data_list, error_correction, start) == expected
+
+    @pytest.mark.parametrize("length, expected", [(17, 1), (18, 2), (2953, 40)])
+    def test_byte_boundaries(self, length, expected):
+        """Test both sides of capacity boundaries."""
+        assert select_version([util.QRData(b"a" * length)], L) == expected
+
+    def test_length_field_growth(self):
+        """Test a payload that only fits once the larger count field is accounted for."""
+        data_list = [util.QRData(b"x" * 271)]  # 9-L holds 230 bytes, 10-L holds 271
+        assert select_version(data_list, L) == 10
+
+    def test_overflow(self):
+        """Test that oversize data raises DataOverflowError."""
+        with pytest.raises(qrcode.exceptions.DataOverflowError):
+            select_version([util.QRData(b"a" * 2954)], L)
+
+    def test_start_version_is_respected(self):
+        """Test that the result is never below the starting version."""
+        assert select_version([util.QRData(b"a")], L, start=12) == 12
+
+
+class TestGeneratorVersionSelection:
+    """Test class for the generator's use of the capacity lookup."""
+
+    @pytest.mark.parametrize("text", [
+        "https://www.example.com",
+        "https://example.com/" + "segment/" * 60,
+        "0123456789" * 50,
+    ])
+    def test_modules_identical_to_qrcode(self, text):
+        """Test that encoded symbols are unchanged."""
+        generator = QRCodeGenerator(output_folder=None)
+        qr = generator._new_qr()
+        generator._encode(qr, text)
+
+        reference = qrcode.QRCode(version=1, error_correction=L)
+        reference.add_data(text)
+        reference.make(fit=True)
+        assert qr.version == reference.version
+        assert qr.modules == reference.modules
+
+    def test_too_long_raises_overflow(self):
+        """Test that data beyond version 40 raises DataOverflowError."""
+        generator = QRCodeGenerator(output_folder=None)
+        with pytest.raises(qrcode.exceptions.DataOverflowError):
+            generator.generate_qr_bytes("x" * 3000)
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
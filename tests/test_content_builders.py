@@ -0,0 +1,87 @@
+"""
+Tests for the content payload builders used by the Streamlit single and bulk modes.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru.content import (CONTENT_TYPES, build_email, build_payload,
+                                             build_phone, build_vcard, build_wifi,
+                                             payloads_from_rows)
+
+
+class TestBuilders:
+    """Test class for the individual content builders."""
+
+    def test_email(self):
+        """Test mailto links with and without parameters."""
+        assert build_email("a@example.com") == "mailto:a@example.com"
+        assert (build_email("a@example.com", "Hi", "Body")
+                == "mailto:a@example.com?subject=Hi&body=Body")
+
+    def test_phone(self):
+        """Test that tel: is added once."""
+        assert build_phone("+1234") == "tel:+1234"
+        assert build_phone("tel:+1234") == "tel:+1234"
+        assert build_phone("") == ""
+
+    def test_wifi(self):
+        """Test WiFi configurations, including hidden flags read from a table."""
+        assert build_wifi("") == ""
+        assert build_wifi("Net", "pw", "WEP", True) == "WIFI:T:WEP;S:Net;P:pw;H:true;;"
+        assert build_wifi("Net", hidden="Yes").endswith("H:true;;")
+        assert build_wifi("Net", hidden="no").endswith("H:false;;")
+        assert build_wifi("Net", security="").startswith("WIFI:T:WPA;")
+
+    def test_vcard(self):
+        """Test that a vCard needs a name."""
+        assert build_vcard("") == ""
+        card = build_vcard("Ada Lovelace", email="ada@example.com")
+        assert card.startswith("BEGIN:VCARD\nVERSION:3.0\nFN:Ada Lovelace\n")
+        assert "EMAIL:ada@example.com" in card and card.endswith("END:VCARD")
+
+
+class TestPayloads:
+    """Test class for build_payload() and payloads_from_rows()."""
+
+    def test_build_payload(self):
+        """Test building from a field mapping, ignoring unknown fields."""
+        assert build_payload("URL", {"url": "https://example.com", "other": 1}) == \
+            "https://example.com"
+        assert build_payload("Email", {"email": "a@example.com", "subject": None}) == \
+            "mailto:a@example.com"
+
+    def test_unknown_content_type(self):
+        """Test that unsupported content types are rejected."""
+        with pytest.raises(ValueError):
+            build_payload("Fax", {})
+        with pytest.raises(ValueError):
+            list(payloads_from_rows([], "Fax", {}))
+
+    def test_rows(self):
+        """Test the column mapping, value conversion and skipping of empty rows."""
+        rows = [
+            {"Network": "Office", "Key": "secret", "Hidden": "true"},
+            {"Network": "  ", "Key": "unused"},
+            {"Network": "Lab", "Key": 1234, "Hidden": None},
+        ]
+        column_map = {"ssid": "Network", "password": "Key", "hidden": "Hidden",
+                      "security": None}
+
+        assert list(payloads_from_rows(rows, "WiFi", column_map)) == [
+            "WIFI:T:WPA;S:Office;P:secret;H:true;;",
+            "WIFI:T:WPA;S:Lab;P:1234;H:false;;",
+        ]
+
+    def test_every_type_has_a_required_field(self):
+        """Test that every content type builds a payload from its first field."""
+        for content_type, (_, names) in CONTENT_TYPES.items():
+            assert build_payload(content_type, {names[0]: "value"})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,241 @@
+"""
+Tests for the `qrgen daemon` warm worker and the CLI forwarding to it.
+"""
+
+import os
+import shutil
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from PIL import Image
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import daemon
+from qrcodegenpy_shankonduru.cli import cli
+from qrcodegenpy_shankonduru.daemon import DaemonServer, forward_generate, send_request
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"),
+                                reason="requires Unix domain sockets")
+
+
+class TestDaemon:
+    """Test class for DaemonServer and its clients over a real Unix socket."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        # Unix socket paths are limited to about 100 characters
+        self.test_dir = tempfile.mkdtemp(prefix="qrd")
+        self.socket_path = os.path.join(self.test_dir, "qrgen.sock")
+        self.output = os.path.join(self.test_dir, "out")
+        self.server = None
+        self.thread = None
+        # Forwarding is tested here, whatever QRGEN_NO_DAEMON the caller exported
+        self.environment = patch.dict(os.environ, {"QRGEN_NO_DAEMON": ""})
+        self.environment.start()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+        self.environment.stop()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def start(self):
+        self.server = DaemonServer(self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.server
+
+    def test_generate(self):
+        """Test that a generate request saves the code and returns its path."""
+        self.start()
+        response = send_request({"op": "generate", "text": "daemon", "file_prefix": "d",
+                                 "output_folder": self.output}, self.socket_path)
+
+        assert response["ok"]
+        assert os.path.dirname(response["path"]) == self.output
+        with Image.open(response["path"]) as img:
+            assert img.format == "PNG"
+        assert self.server.served == 1
+
+    def test_generators_are_reused(self):
+        """Test that requests with the same settings share one warm generator."""
+        self.start()
+        for text in ("a", "b"):
+            forward_generate(text, {"output_folder": self.output, "naming": "counter"},
+                             self.socket_path)
+        forward_generate("c", {"output_folder": self.output, "image_format": "SVG"},
+                         self.socket_path)
+
+        assert len(self.server._generators) == 2
+        assert sorted(name[-4:] for name in os.listdir(self.output)) == [".png", ".png",
+                                                                        ".svg"]
+
+    def test_output_folder_recreated(self):
+        """Test that a cached generator writes to a folder removed since."""
+        self.start()
+        forward_generate("a", {"output_folder": self.output}, self.socket_path)
+        shutil.rmtree(self.output)
+        assert forward_generate("b", {"output_folder": self.output}, self.socket_path)["ok"]
+
+    def test_errors(self):
+        """Test that failures are answered, not raised."""
+        self.start()
+        too_long = forward_generate("X" * 5000, {"output_folder": self.output},
+                                    self.socket_path)
+        missing = send_request({"text": "x"}, self.socket_path)
+        unknown = send_request({"op": "rotate"}, self.socket_path)
+
+        assert not too_long["ok"] and too_long["error"]
+        assert missing == {"ok": False, "error": "output_folder is required"}
+        assert not unknown["ok"]
+        assert self.server.served == 0
+
+    def test_invalid_request_line(self):
+        """Test a line that is not a JSON object."""
+        self.start()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+            client.sendall(b"[1, 2]\n")
+            response = client.makefile("rb").readline()
+        assert b"invalid request" in response
+
+    def test_version_mismatch_falls_back(self):
+        """Test that a client of another version is sent back to in-process generation."""
+        self.start()
+        response = send_request({"text": "x", "output_folder": self.output,
+                                 "client_version": "0.0.0"}, self.socket_path)
+        assert response["fallback"] and not response["ok"]
+        assert not os.path.exists(self.output)
+
+        with patch.object(daemon, "send_request", return_value=response):
+            assert forward_generate("x", {"output_folder": self.output},
+                                    self.socket_path) is None
+
+    def test_ping_and_shutdown(self):
+        """Test the ping and shutdown operations."""
+        self.start()
+        ping = send_request({"op": "ping"}, self.socket_path)
+        assert ping["ok"] and ping["pid"] == os.getpid()
+
+        assert send_request({"op": "shutdown"}, self.socket_path) == {"ok": True}
+        self.thread.join(5)
+        assert not self.thread.is_alive()
+        self.server.server_close()
+        self.server = None
+        assert not os.path.exists(self.socket_path)
+
+    def test_socket_is_private(self):
+        """Test that only the owner may connect."""
+        self.start()
+        assert stat.S_IMODE(os.stat(self.socket_path).st_mode) == 0o600
+
+    def test_stale_socket_and_running_daemon(self):
+        """Test that a stale socket is replaced but a live daemon is not."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+        assert send_request({"op": "ping"}, self.socket_path) is None
+
+        self.start()
+        with pytest.raises(RuntimeError):
+            DaemonServer(self.socket_path)
+
+    def test_no_daemon(self):
+        """Test that clients get None when nothing listens."""
+        assert send_request({"op": "ping"}, self.socket_path) is None
+        assert forward_generate("x", {"output_folder": self.output}, self.socket_path) is None
+
+    def test_default_socket_path(self):
+        """Test the environment overrides of the socket path."""
+        with patch.dict(os.environ, {"QRGEN_SOCKET": "/run/custom.sock"}):
+            assert daemon.default_socket_path() == "/run/custom.sock"
+        with patch.dict(os.environ, {"QRGEN_SOCKET": "", "XDG_RUNTIME_DIR": "/run/user/7"}):
+            assert daemon.default_socket_path() == f"/run/user/7/qrgen-{os.getuid()}.sock"
+
+
+class TestDaemonCli:
+    """Test class for qrgen forwarding to the daemon and `qrgen daemon` itself."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp(prefix="qrd")
+        self.socket_path = os.path.join(self.test_dir, "qrgen.sock")
+        self.output = os.path.join(self.test_dir, "out")
+        self.environment = patch.dict(os.environ, {"QRGEN_SOCKET": self.socket_path,
+                                                   "QRGEN_NO_DAEMON": ""})
+        self.environment.start()
+        self.server = DaemonServer(self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.environment.stop()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def run_cli(self, argv):
+        stdout, stderr = StringIO(), StringIO()
+        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+            status = cli(argv)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_forwarded(self):
+        """Test that qrgen hands a single code to the running daemon."""
+        status, output, _ = self.run_cli(["hello", "--output", self.output, "--format", "svg"])
+
+        assert status is None
+        assert self.server.served == 1
+        (name,) = os.listdir(self.output)
+        assert name.endswith(".svg")
+        assert output.strip().endswith(os.path.join(self.output, name))
+
+    def test_opt_out(self):
+        """Test --no-daemon and QRGEN_NO_DAEMON."""
+        self.run_cli(["local", "--output", self.output, "--no-daemon"])
+        with patch.dict(os.environ, {"QRGEN_NO_DAEMON": "1"}):
+            self.run_cli(["local", "--output", self.output])
+
+        assert self.server.served == 0
+        assert len(os.listdir(self.output)) == 2
+
+    def test_daemon_error(self):
+        """Test that an error from the daemon is reported with exit status 1."""
+        status, _, error = self.run_cli(["X" * 5000, "--output", self.output])
+        assert status == 1
+        assert "Error generating QR code" in error
+
+    def test_status_and_stop(self):
+        """Test qrgen daemon --status and --stop."""
+        status, output, _ = self.run_cli(["daemon", "--status"])
+        assert status == 0 and "running" in output
+
+        status, output, _ = self.run_cli(["daemon", "--stop"])
+        assert status == 0 and "stopped" in output
+        self.thread.join(5)
+        assert not self.thread.is_alive()
+
+    def test_already_running(self):
+        """Test that a second daemon on the same socket refuses to start."""
+        status, _, error = self.run_cli(["daemon"])
+        assert status == 1
+        assert "already running" in error
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,181 @@
+"""
+Tests for the pluggable file naming strategies.
+"""
+
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import (
+    CounterNaming,
+    HashNaming,
+    KeyNaming,
+    QRCodeGenerator,
+    TimestampNaming,
+)
+from qrcodegenpy_shankonduru.cli import cli
+
+
+def names_in_process(naming, count):
+    """Worker helper: draw count names from naming."""
+    return [naming.name("p", None, None) for _ in range(count)]
+
+
+class TestNamingStrategies:
+    """Test class for the naming strategies themselves."""
+
+    def test_timestamp_default_format(self):
+        """Test that the default names match the historical format."""
+        assert re.fullmatch(r"qr_\d{20}", TimestampNaming().name("qr", "x", None))
+
+    def test_counter_is_monotonic(self):
+        """Test that counter names share a token and count up."""
+        naming = CounterNaming()
+        first, second = naming.name("tag", "a", None), naming.name("tag", "b", None)
+        assert first.rsplit("_", 1)[0] == second.rsplit("_", 1)[0]
+        assert int(second.rsplit("_", 1)[1]) == int(first.rsplit("_", 1)[1]) + 1
+        assert first.split("_")[1].startswith(f"{os.getpid()}-")
+
+    def test_counter_shared_by_instances(self):
+        """Test that separate strategies in one process never repeat a name."""
+        names = {CounterNaming().name("same", None, None) for _ in range(100)}
+        assert len(names) == 100
+
+    def test_counter_unique_across_threads(self):
+        """Test that threads never receive the same name."""
+        naming = CounterNaming()
+        barrier = threading.Barrier(8)
+
+        def draw():
+            barrier.wait()
+            return [naming.name("t", None, None) for _ in range(2000)]
+
+        with ThreadPoolExecutor(8) as executor:
+            names = [name for batch in executor.map(lambda _: draw(), range(8)) for name in batch]
+        assert len(set(names)) == len(names) == 16000
+
+    @pytest.mark.parametrize("method", [m for m in ("fork", "spawn")
+                                        if m in multiprocessing.get_all_start_methods()])
+    def test_counter_unique_across_processes(self, method):
+        """Test that worker processes (forked or spawned) get their own token."""
+        naming = CounterNaming()
+        parent_names = names_in_process(naming, 10)
+        context = multiprocessing.get_context(method)
+        with ProcessPoolExecutor(3, mp_context=context) as executor:
+            batches = list(executor.map(names_in_process, [naming] * 6, [50] * 6))
+
+        names = parent_names + [name for batch in batches for name in batch]
+        assert len(set(names)) == len(names)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_counter_after_fork(self):
+        """Test that a forked child does not repeat the parent's names."""
+        naming = CounterNaming()
+        naming.name("f", None, None)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, naming.name("f", None, None).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            child_name = pipe.read()
+        os.waitpid(pid, 0)
+        assert child_name != naming.name("f", None, None)
+        assert child_name.endswith("_00000000")
+
+    def test_hash_naming(self):
+        """Test that hash names depend only on the payload."""
+        naming = HashNaming()
+        assert naming.name("h", "abc", 0) == naming.name("h", "abc", 5)
+        assert naming.name("h", "abc", 0) != naming.name("h", "abd", 0)
+        assert naming.name("h", "abc", 0) == "h_ba7816bf8f01cfea"
+        # bytes and int payloads hash like their UTF-8 text
+        assert naming.name("h", b"abc", 0) == naming.name("h", "abc", 0)
+        assert naming.name("h", 42, 0) == naming.name("h", "42", 0)
+        with pytest.raises(ValueError):
+            HashNaming(length=4)
+
+    def test_key_naming(self):
+        """Test caller-supplied keys and path separator rejection."""
+        naming = KeyNaming(lambda payload, index: payload.upper())
+        assert naming.name("k", "sku-1", None) == "k_SKU-1"
+        with pytest.raises(ValueError):
+            naming.name("k", "../etc", None)
+        with pytest.raises(ValueError):
+            naming.name("k", "", None)
+
+
+class TestGeneratorNaming:
+    """Test class for QRCodeGenerator naming integration."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "named")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_default_is_timestamp(self):
+        """Test that the default naming is unchanged."""
+        generator = QRCodeGenerator("legacy", self.test_output_folder)
+        path = generator.generate_qr_code("x")
+        assert re.fullmatch(r"legacy_\d{20}\.png", os.path.basename(path))
+
+    def test_named_strategies(self):
+        """Test that strategies can be selected by name."""
+        generator = QRCodeGenerator("h", self.test_output_folder, naming="hash",
+                                    image_format="svg")
+        assert os.path.basename(generator.generate_qr_code("abc")) == "h_ba7816bf8f01cfea.svg"
+        assert os.path.basename(generator.generate_qr_code(b"abc")) == "h_ba7816bf8f01cfea.svg"
+        with pytest.raises(ValueError):
+            QRCodeGenerator(output_folder=self.test_output_folder, naming="random")
+
+    def test_concurrent_threads_no_collisions(self):
+        """Test that concurrent generate_qr_code calls never overwrite each other."""
+        generator = QRCodeGenerator("c", self.test_output_folder, box_size=1, border=0,
+                                    naming=CounterNaming())
+        with ThreadPoolExecutor(8) as executor:
+            paths = list(executor.map(generator.generate_qr_code,
+                                      [f"item {i}" for i in range(200)]))
+
+        assert len(set(paths)) == 200
+        assert len(os.listdir(self.test_output_folder)) == 200
+
+    def test_key_naming_with_batch_index(self):
+        """Test that batch generation passes the item index to the key."""
+        generator = QRCodeGenerator("row", self.test_output_folder,
+                                    naming=KeyNaming(lambda payload, index: f"{index:03d}"))
+        paths = [result.path for result in generator.generate_qr_codes(["a", "b"])]
+        assert [os.path.basename(path) for path in paths] == ["row_000.png", "row_001.png"]
+
+    def test_cli_naming_option(self):
+        """Test qrgen --naming counter."""
+        captured_output = StringIO()
+        with patch('sys.stdout', captured_output), \
+                patch.dict(os.environ, {'QRGEN_NO_DAEMON': '1'}):
+            cli(["hello", "--output", self.test_output_folder, "--naming", "counter"])
+
+        (name,) = os.listdir(self.test_output_folder)
+        assert re.fullmatch(rf"qr_code_{os.getpid()}-[0-9a-f]+_\d{{8}}\.png", name)
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
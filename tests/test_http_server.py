@@ -0,0 +1,212 @@
+"""
+Tests for the `qrgen serve` HTTP rendering service, run entirely on localhost.
+"""
+
+import http.client
+import io
+import sys
+import threading
+from unittest.mock import patch
+from urllib.parse import urlencode
+import pytest
+from PIL import Image
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator
+from qrcodegenpy_shankonduru.server import QRCodeServer, etag_matches, parse_request
+
+
+@pytest.fixture
+def server():
+    """Run a quiet server on a free localhost port for the duration of a test."""
+    qr_server = QRCodeServer(("127.0.0.1", 0), max_age=60, quiet=True)
+    thread = threading.Thread(target=qr_server.serve_forever, daemon=True)
+    thread.start()
+    yield qr_server
+    qr_server.shutdown()
+    qr_server.server_close()
+    thread.join()
+
+
+def connect(qr_server):
+    return http.client.HTTPConnection("127.0.0.1", qr_server.server_port, timeout=10)
+
+
+def get(connection, params, method="GET", headers=None):
+    connection.request(method, "/qr?" + urlencode(params), headers=headers or {})
+    response = connection.getresponse()
+    return response, response.read()
+
+
+class TestQRCodeServer:
+    """Test class for QRCodeServer over real localhost connections."""
+
+    def test_png_response(self, server):
+        """Test that the body is the same PNG the generator produces."""
+        connection = connect(server)
+        response, body = get(connection, {"text": "https://www.example.com"})
+
+        assert response.status == 200
+        assert response.getheader("Content-Type") == "image/png"
+        assert int(response.getheader("Content-Length")) == len(body)
+        expected = QRCodeGenerator(output_folder=None).generate_qr_bytes("https://www.example.com")
+        assert body == expected
+        with Image.open(io.BytesIO(body)) as img:
+            assert img.format == "PNG"
+
+    def test_keep_alive_and_cache(self, server):
+        """Test several requests on one connection, served from the cache."""
+        connection = connect(server)
+        first, first_body = get(connection, {"text": "repeat"})
+        sock = connection.sock
+        second, second_body = get(connection, {"text": "repeat"})
+
+        assert connection.sock is sock
+        assert first_body == second_body
+        assert first.getheader("ETag") == second.getheader("ETag")
+        assert server.cache.stats().hits == 1
+
+    def test_strong_etag_and_304(self, server):
+        """Test conditional requests with If-None-Match."""
+        connection = connect(server)
+        response, _ = get(connection, {"text": "etag", "format": "svg"})
+        etag = response.getheader("ETag")
+
+        assert etag.startswith('"') and not etag.startswith("W/")
+        assert response.getheader("Cache-Control") == "public, max-age=60"
+
+        cached, body = get(connection, {"text": "etag", "format": "svg"},
+                           headers={"If-None-Match": f'"other", {etag}'})
+        assert cached.status == 304
+        assert body == b""
+        assert cached.getheader("ETag") == etag
+
+    def test_304_and_cache_hits_do_not_encode(self, server):
+        """Test that conditional requests and cache hits skip encoding entirely."""
+        connection = connect(server)
+        params = {"text": "Y" * 4000, "box_size": 1}
+        response, _ = get(connection, params)
+        etag = response.getheader("ETag")
+
+        with patch.object(QRCodeGenerator, "_encode", side_effect=AssertionError("encoded")):
+            cached, _ = get(connection, params, headers={"If-None-Match": etag})
+            hit, _ = get(connection, params)
+
+        assert (response.status, cached.status, hit.status) == (200, 304, 200)
+
+    def test_image_size_of_needed_version(self, server):
+        """Test that the size cap uses the version the text needs."""
+        connection = connect(server)
+        # Version 1 fits in (21 + 2 * 9) * 100 = 3900 pixels, version 2 needs 4300
+        small, _ = get(connection, {"text": "x", "box_size": 100, "border": 9})
+        large, body = get(connection, {"text": "x" * 30, "box_size": 100, "border": 9})
+
+        assert small.status == 200
+        assert large.status == 400
+        assert b"4300x4300" in body
+        assert server.cache.stats().entries == 1
+
+    def test_etag_depends_on_settings(self, server):
+        """Test that different settings produce different ETags."""
+        connection = connect(server)
+        small, _ = get(connection, {"text": "same", "box_size": 2})
+        large, _ = get(connection, {"text": "same", "box_size": 3})
+        assert small.getheader("ETag") != large.getheader("ETag")
+
+    def test_svg_and_pdf_content_types(self, server):
+        """Test the content type of vector formats."""
+        connection = connect(server)
+        svg, svg_body = get(connection, {"text": "v", "format": "svg"})
+        pdf, pdf_body = get(connection, {"text": "v", "format": "pdf"})
+
+        assert svg.getheader("Content-Type") == "image/svg+xml"
+        assert svg_body.startswith(b"<?xml")
+        assert pdf.getheader("Content-Type") == "application/pdf"
+        assert pdf_body.startswith(b"%PDF")
+
+    def test_head_request(self, server):
+        """Test that HEAD returns headers without a body."""
+        connection = connect(server)
+        response, body = get(connection, {"text": "head"}, method="HEAD")
+        assert response.status == 200
+        assert int(response.getheader("Content-Length")) > 0
+        assert body == b""
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"text": "x", "box_size": "big"},
+        {"text": "x", "box_size": 0},
+        {"text": "x", "format": "gif"},
+        {"text": "x", "ecc": "Z"},
+        {"text": "x", "fill": "not-a-color"},
+        {"text": "X" * 5000},
+        {"text": "x", "box_size": 100, "border": 40},
+        {"text": "X" * 1000, "box_size": 50},
+    ])
+    def test_bad_requests(self, server, params):
+        """Test that invalid parameters are answered with 400."""
+        connection = connect(server)
+        response, body = get(connection, params)
+        assert response.status == 400
+        assert body
+
+    def test_unknown_path(self, server):
+        """Test that other paths return 404."""
+        connection = connect(server)
+        connection.request("GET", "/other")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 404
+
+    def test_metrics_endpoint(self, server):
+        """Test that /metrics exposes the stage timings of rendered codes."""
+        connection = connect(server)
+        get(connection, {"text": "metrics"})
+        get(connection, {"text": "metrics"})
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+        body = response.read().decode("utf-8")
+
+        assert response.status == 200
+        assert response.getheader("Content-Type").startswith("text/plain; version=0.0.4")
+        assert 'qrgen_stage_duration_seconds_count{stage="make"} 1' in body
+        assert 'qrgen_codes_total{version="1"} 1' in body
+        assert "qrgen_cache_hits_total 1" in body
+
+
+class TestRequestHelpers:
+    """Test class for parse_request() and etag_matches()."""
+
+    def test_parse_defaults(self):
+        """Test the defaults applied to a bare request."""
+        text, settings = parse_request("text=hello")
+        assert text == "hello"
+        assert settings["box_size"] == 10
+        assert settings["border"] == 4
+        assert settings["image_format"] == "PNG"
+
+    def test_image_size_limit(self):
+        """Test that the smallest possible image is checked without encoding."""
+        # Version 1 is 21 modules: (21 + 2 * 9) * 100 = 3900 pixels
+        parse_request("text=x&box_size=100&border=9")
+        with pytest.raises(ValueError, match="at most 4096"):
+            parse_request("text=x&box_size=100&border=10")
+        # A requested version is the smallest the code can have
+        with pytest.raises(ValueError, match="at most 4096"):
+            parse_request("text=x&box_size=100&border=9&version=2")
+
+    def test_etag_matches(self):
+        """Test If-None-Match list, wildcard and weak forms."""
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
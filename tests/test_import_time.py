@@ -0,0 +1,137 @@
+"""
+Startup regression tests for the qrgen command line.
+
+Each test starts a fresh interpreter with ``-X importtime`` and checks that
+parsing --help or --version imports none of the heavy dependencies. The
+import time budget is a wall-clock check, so it only runs with
+QRGEN_RUN_BENCHMARKS=1; the startup time is regression-checked against the
+baseline by the benchmark suite (startup/version) instead. The budget (in
+milliseconds) can be raised for slow machines with the QRGEN_IMPORT_BUDGET_MS
+environment variable. The
+subprocesses run with QRGEN_NO_DAEMON=1, so a qrgen daemon running on the
+machine is never used.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import qrcodegenpy_shankonduru
+
+ROOT = Path(__file__).parent.parent
+
+# Modules that must only load once something is encoded
+HEAVY_MODULES = ("qrcode", "PIL", "numpy", "datetime", "concurrent.futures", "multiprocessing",
+                 "zipfile", "tarfile", "csv", "http.server", "asyncio")
+
+# Cumulative import time allowed for the package and its CLI module; a full
+# import of the generator takes several times this
+IMPORT_BUDGET_MS = float(os.environ.get("QRGEN_IMPORT_BUDGET_MS", "60"))
+
+# Wall-clock assertions flake on busy machines, so they are opt-in
+benchmark = pytest.mark.skipif(not os.environ.get("QRGEN_RUN_BENCHMARKS"),
+                               reason="timing test; set QRGEN_RUN_BENCHMARKS=1 to run it")
+
+STARTUP_SCRIPT = """
+import json, sys
+before = set(sys.modules)
+from qrcodegenpy_shankonduru.cli import cli
+try:
+    cli({argv!r})
+except SystemExit:
+    pass
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def run_startup(argv):
+    """Run the CLI with argv in a fresh interpreter; return (stdout, new modules, timings)."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT.format(argv=argv)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env=dict(os.environ, QRGEN_NO_DAEMON="1"),
+    )
+    *output, modules = completed.stdout.strip().splitlines()
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                timings[name.strip()] = int(cumulative) / 1000
+    return "\n".join(output), json.loads(modules), timings
+
+
+def heavy_imports(modules):
+    return sorted(module for module in modules
+                  if any(module == heavy or module.startswith(heavy + ".")
+                         for heavy in HEAVY_MODULES))
+
+
+class TestStartup:
+    """Test class for qrgen cold-start imports."""
+
+    @pytest.mark.parametrize("argv", [["--version"], ["--help"]])
+    def test_no_heavy_imports(self, argv):
+        """Test that --version and --help load no heavy dependency."""
+        _, modules, _ = run_startup(argv)
+        assert heavy_imports(modules) == []
+        assert "qrcodegenpy_shankonduru.qr_generator" not in modules
+
+    @benchmark
+    def test_import_time_budget(self):
+        """Test that the package and CLI import within the time budget."""
+        # Best of three runs, to ignore a cold disk cache or a busy machine
+        totals = []
+        for _ in range(3):
+            _, _, timings = run_startup(["--version"])
+            totals.append(timings.get("qrcodegenpy_shankonduru", 0.0)
+                          + timings["qrcodegenpy_shankonduru.cli"])
+        assert min(totals) < IMPORT_BUDGET_MS, (
+            f"qrgen startup imports took {min(totals):.1f} ms "
+            f"(budget {IMPORT_BUDGET_MS:.0f} ms)"
+        )
+
+    def test_version_output(self):
+        """Test that --version prints the package version."""
+        output, _, _ = run_startup(["--version"])
+        assert output.endswith(qrcodegenpy_shankonduru.__version__)
+
+    def test_chunksize_default_in_sync(self):
+        """Test that the CLI's chunk size default matches the pipeline's."""
+        from qrcodegenpy_shankonduru import cli, pipeline
+        assert cli.DEFAULT_CHUNKSIZE == pipeline.DEFAULT_CHUNKSIZE
+
+    def test_encoding_imports_generator(self, tmp_path):
+        """Test that encoding something still loads the generator."""
+        _, modules, _ = run_startup(["--format", "svg", "--output", str(tmp_path),
+                                     "startup test"])
+        assert "qrcodegenpy_shankonduru.qr_generator" in modules
+        assert "qrcode" in modules
+
+
+class TestLazyExports:
+    """Test class for the package's lazily imported names."""
+
+    def test_all_names_resolve(self):
+        """Test that every name in __all__ can be imported."""
+        for name in qrcodegenpy_shankonduru.__all__:
+            assert getattr(qrcodegenpy_shankonduru, name).__name__ == name
+
+    def test_unknown_name(self):
+        """Test that unknown attributes still raise AttributeError."""
+        with pytest.raises(AttributeError):
+            qrcodegenpy_shankonduru.NotAThing
+
+    def test_dir_lists_exports(self):
+        """Test that dir() shows the lazy names."""
+        assert "QRCodeGenerator" in dir(qrcodegenpy_shankonduru)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+"""
+Tests for the in-memory output variants of QRCodeGenerator.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import shutil
+import pytest
+from PIL import Image
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator, RenderCache
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class TestInMemoryOutput:
+    """Test class for generate_qr_bytes() and generate_qr_image()."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "memory_output")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_bytes_match_saved_file(self):
+        """Test that the PNG bytes decode to the same image as the saved file."""
+        generator = QRCodeGenerator("memory", self.test_output_folder)
+        png_bytes = generator.generate_qr_bytes("https://www.example.com")
+
+        assert isinstance(png_bytes, bytes)
+        assert png_bytes.startswith(PNG_SIGNATURE)
+        with Image.open(io.BytesIO(png_bytes)) as actual, \
+                Image.open(generator.generate_qr_code("https://www.example.com")) as expected:
+            assert actual.format == "PNG"
+            assert actual.tobytes() == expected.tobytes()
+
+    def test_nothing_written_to_disk(self):
+        """Test that the in-memory variants never create files."""
+        generator = QRCodeGenerator("memory", self.test_output_folder)
+        generator.generate_qr_bytes("no files")
+        generator.generate_qr_bytes("no files", output_type="bytesio")
+        generator.generate_qr_image("no files")
+
+        assert os.listdir(self.test_output_folder) == []
+
+    def test_bytesio_output(self):
+        """Test that a BytesIO positioned at the start is returned."""
+        generator = QRCodeGenerator("memory", self.test_output_folder)
+        buffer = generator.generate_qr_bytes("stream", output_type="bytesio")
+
+        assert isinstance(buffer, io.BytesIO)
+        assert buffer.tell() == 0
+        assert buffer.read(8) == PNG_SIGNATURE
+
+    def test_memoryview_output(self):
+        """Test that a memoryview over the PNG bytes is returned."""
+        generator = QRCodeGenerator("memory", self.test_output_folder)
+        view = generator.generate_qr_bytes("view", output_type="memoryview")
+
+        assert isinstance(view, memoryview)
+        assert view[:8].tobytes() == PNG_SIGNATURE
+
+    def test_invalid_output_type(self):
+        """Test that unknown output types are rejected."""
+        generator = QRCodeGenerator("memory", self.test_output_folder)
+        with pytest.raises(ValueError):
+            generator.generate_qr_bytes("x", output_type="file")
+
+    def test_bytes_use_cache(self):
+        """Test that repeated in-memory renders are served from the cache."""
+        cache = RenderCache()
+        generator = QRCodeGenerator("memory", self.test_output_folder, cache=cache)
+
+        first = generator.generate_qr_bytes("cached")
+        second = generator.generate_qr_bytes("cached")
+
+        assert first == second
+        assert cache.stats().hits == 1
+
+    def test_generate_qr_image(self):
+        """Test that a PIL image with the configured size is returned."""
+        generator = QRCodeGenerator("memory", self.test_output_folder, box_size=3, border=1)
+        img = generator.generate_qr_image("image")
+
+        assert isinstance(img, Image.Image)
+        assert img.size == ((21 + 2) * 3, (21 + 2) * 3)
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
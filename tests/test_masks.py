@@ -0,0 +1,139 @@
+"""
+Tests for the vectorized mask pattern evaluation.
+"""
+
+import os
+import random
+import shutil
+import string
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+import qrcode
+from qrcode import util
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator
+from qrcodegenpy_shankonduru import masks
+from qrcodegenpy_shankonduru.cli import cli
+
+numpy = pytest.importorskip("numpy")
+
+
+def reference_qr(text, error_correction, version=None, mask_pattern=None):
+    """Encode text with qrcode's own pure-Python make()."""
+    qr = qrcode.QRCode(version=version, error_correction=error_correction,
+                       mask_pattern=mask_pattern)
+    qr.add_data(text)
+    qr.make(fit=version is None)
+    return qr
+
+
+class TestPenaltyScores:
+    """Test class for penalty_scores()."""
+
+    @pytest.mark.parametrize("size", [21, 25, 45, 57, 101])
+    def test_matches_lost_point(self, size):
+        """Test the four rules against util.lost_point on random matrices."""
+        rng = numpy.random.default_rng(size)
+        for density in (0.2, 0.5, 0.8):
+            candidates = rng.random((8, size, size)) < density
+            expected = [util.lost_point(matrix.tolist()) for matrix in candidates]
+            assert masks.penalty_scores(candidates) == expected
+
+    def test_structured_matrix(self):
+        """Test long runs, solid blocks and finder-like patterns."""
+        matrix = numpy.zeros((21, 21), dtype=bool)
+        matrix[3, :] = True
+        matrix[:, 4] = True
+        matrix[10, 2:13] = [1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0]
+        matrix[12:16, 12:16] = True
+        assert masks.penalty_scores(matrix[None]) == [util.lost_point(matrix.tolist())]
+
+
+class TestMakeWithBestMask:
+    """Test class for make_with_best_mask()."""
+
+    def test_identical_to_qrcode(self):
+        """Test byte-identical matrices across versions and ECC levels."""
+        rng = random.Random(15)
+        for _ in range(40):
+            text = "".join(rng.choice(string.printable)
+                           for _ in range(rng.choice([1, 20, 90, 300, 900])))
+            error_correction = rng.choice([0, 1, 2, 3])
+            reference = reference_qr(text, error_correction)
+
+            qr = qrcode.QRCode(version=reference.version, error_correction=error_correction)
+            qr.add_data(text)
+            pattern = masks.make_with_best_mask(qr)
+
+            assert qr.modules == reference.modules
+            # best_mask_pattern() rebuilds the matrix, so ask it last
+            assert pattern == reference.best_mask_pattern()
+
+    def test_fallback_without_numpy(self, monkeypatch):
+        """Test that the pure-Python path is used when NumPy is missing."""
+        monkeypatch.setattr(masks, "numpy", None)
+        reference = reference_qr("fallback", qrcode.constants.ERROR_CORRECT_M)
+        qr = qrcode.QRCode(version=reference.version,
+                           error_correction=qrcode.constants.ERROR_CORRECT_M)
+        qr.add_data("fallback")
+        masks.make_with_best_mask(qr)
+        assert qr.modules == reference.modules
+
+
+class TestGeneratorMasks:
+    """Test class for the generator's mask handling."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    @pytest.mark.parametrize("text", ["https://www.example.com", "x" * 400])
+    def test_png_identical_to_qrcode_path(self, text):
+        """Test that generated PNGs match qrcode's own rendering."""
+        generator = QRCodeGenerator(output_folder=None)
+        reference = reference_qr(text, qrcode.constants.ERROR_CORRECT_L)
+        expected = generator._render_image(reference.modules)
+
+        image = generator.generate_qr_image(text)
+        assert image.tobytes() == expected.tobytes()
+
+    def test_pinned_mask(self):
+        """Test that a pinned mask is used as-is."""
+        generator = QRCodeGenerator(output_folder=None, mask_pattern=5)
+        qr = generator._new_qr()
+        generator._encode(qr, "pinned")
+
+        reference = reference_qr("pinned", qrcode.constants.ERROR_CORRECT_L, mask_pattern=5)
+        assert qr.modules == reference.modules
+        assert (generator._cache_key("pinned", "PNG")
+                != QRCodeGenerator(output_folder=None)._cache_key("pinned", "PNG"))
+
+    @pytest.mark.parametrize("mask_pattern", [-1, 8, "3"])
+    def test_invalid_mask(self, mask_pattern):
+        """Test that masks outside 0-7 are rejected."""
+        with pytest.raises(ValueError):
+            QRCodeGenerator(output_folder=None, mask_pattern=mask_pattern)
+
+    def test_cli_mask_option(self):
+        """Test qrgen --mask."""
+        output_folder = os.path.join(self.test_dir, "masked")
+        with patch('sys.stdout', StringIO()), patch.dict(os.environ, {'QRGEN_NO_DAEMON': '1'}):
+            cli(["hello", "--output", output_folder, "--mask", "2"])
+        assert len(os.listdir(output_folder)) == 1
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,152 @@
+"""
+Tests for the bit-packed ModuleMatrix.
+"""
+
+import random
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+import qrcode
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import ModuleMatrix, QRCodeGenerator
+from qrcodegenpy_shankonduru import raster
+from qrcodegenpy_shankonduru.raster import rasterize
+from qrcodegenpy_shankonduru.vector import dark_runs, render_svg
+
+
+def random_rows(size, seed):
+    """Return a random size x size matrix as nested lists of bools."""
+    rng = random.Random(seed)
+    return [[rng.random() < 0.5 for _ in range(size)] for _ in range(size)]
+
+
+def qrcode_modules(text):
+    """Return qrcode's own module lists for text."""
+    qr = qrcode.QRCode()
+    qr.add_data(text)
+    qr.make()
+    return qr.modules
+
+
+class TestModuleMatrix:
+    """Test class for ModuleMatrix."""
+
+    @pytest.mark.parametrize("size", [1, 8, 21, 23, 97, 177])
+    def test_round_trip(self, size):
+        """Test packing and unpacking nested lists."""
+        rows = random_rows(size, size)
+        matrix = ModuleMatrix.from_rows(rows)
+
+        assert len(matrix) == matrix.size == size
+        assert matrix.stride == (size + 7) // 8
+        assert matrix.nbytes == size * matrix.stride
+        assert matrix.to_lists() == rows
+        assert list(matrix) == rows
+        assert matrix == rows
+        assert matrix[0] == rows[0]
+        assert matrix[-1][size - 1] == rows[-1][-1]
+
+    def test_from_array_matches_from_rows(self):
+        """Test that NumPy packing equals the pure-Python packing."""
+        numpy = pytest.importorskip("numpy")
+        rows = random_rows(45, 2)
+        matrix = ModuleMatrix.from_array(numpy.array(rows))
+        assert matrix == ModuleMatrix.from_rows(rows)
+        assert (matrix.to_array() == numpy.array(rows)).all()
+        assert matrix.to_array().dtype == bool
+
+    def test_from_stack(self):
+        """Test that packing a stack equals packing each matrix."""
+        numpy = pytest.importorskip("numpy")
+        stack = numpy.array([random_rows(29, seed) for seed in range(4)])
+        matrices = ModuleMatrix.from_stack(stack)
+        assert matrices == [ModuleMatrix.from_array(array) for array in stack]
+
+    def test_zero_copy_views(self):
+        """Test that packed views share the matrix bytes."""
+        numpy = pytest.importorskip("numpy")
+        matrix = ModuleMatrix.from_rows(random_rows(25, 3))
+        view = matrix.packed_array()
+        assert view.shape == (25, 4)
+        assert numpy.shares_memory(view, numpy.frombuffer(matrix.packed, dtype=numpy.uint8))
+        assert not view.flags.writeable
+        assert matrix.packed.readonly
+
+    def test_none_modules_are_light(self):
+        """Test that unset (None) modules pack as light."""
+        matrix = ModuleMatrix.from_rows([[None, True], [False, None]])
+        assert matrix.to_lists() == [[False, True], [False, False]]
+
+    def test_padding_bits_are_zero(self):
+        """Test that row padding stays clear."""
+        matrix = ModuleMatrix.from_rows([[True] * 21 for _ in range(21)])
+        assert bytes(matrix.packed[:3]) == b"\xff\xff\xf8"
+
+    def test_invalid_length(self):
+        """Test that data of the wrong length is rejected."""
+        with pytest.raises(ValueError, match="Expected 63 bytes"):
+            ModuleMatrix(21, b"\x00" * 62)
+
+    def test_index_out_of_range(self):
+        """Test row indexing bounds."""
+        matrix = ModuleMatrix.from_rows(random_rows(21, 4))
+        with pytest.raises(IndexError):
+            matrix[21]
+
+    def test_equality_and_hash(self):
+        """Test comparison between matrices and with other types."""
+        rows = random_rows(21, 5)
+        first, second = ModuleMatrix.from_rows(rows), ModuleMatrix.from_rows(rows)
+        assert first == second and hash(first) == hash(second)
+        assert first != ModuleMatrix.from_rows(random_rows(21, 6))
+        assert first != "matrix"
+
+    def test_compact(self):
+        """Test that a version 20 matrix fits in under 1.5 KB."""
+        assert ModuleMatrix.from_rows(random_rows(97, 7)).nbytes < 1500
+
+
+class TestConsumers:
+    """Test class for the rasterizer, serializers and generator using ModuleMatrix."""
+
+    @pytest.mark.parametrize("box_size,border", [(1, 0), (3, 4), (10, 2)])
+    def test_rasterize_matches_lists(self, box_size, border):
+        """Test that rasterizing a ModuleMatrix equals rasterizing the lists."""
+        modules = qrcode_modules("https://example.com/packed")
+        matrix = ModuleMatrix.from_rows(modules)
+        expected = rasterize(modules, box_size, border).tobytes()
+        assert rasterize(matrix, box_size, border).tobytes() == expected
+        with patch.object(raster, "numpy", None):
+            assert rasterize(matrix, box_size, border).tobytes() == expected
+
+    def test_dark_runs_match_lists(self):
+        """Test the packed run scanner against the list scanner."""
+        rows = random_rows(33, 8)
+        assert list(dark_runs(ModuleMatrix.from_rows(rows))) == list(dark_runs(rows))
+
+    def test_svg_matches_lists(self):
+        """Test that SVG output is identical for both representations."""
+        modules = qrcode_modules("vector")
+        assert render_svg(ModuleMatrix.from_rows(modules)) == render_svg(modules)
+
+    def test_generator_stores_packed_matrix(self):
+        """Test that the generator keeps a ModuleMatrix equal to qrcode's lists."""
+        generator = QRCodeGenerator(output_folder=None)
+        qr = generator._new_qr()
+        matrix = generator._encode(qr, "https://example.com/generator")
+        assert isinstance(qr.modules, ModuleMatrix)
+        assert qr.modules is matrix
+        assert qr.modules_count == matrix.size
+
+        reference = qrcode.QRCode(version=qr.version, error_correction=qr.error_correction)
+        reference.data_list = qr.data_list
+        reference.make(fit=False)
+        assert matrix == reference.modules
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,296 @@
+"""
+Tests for the streaming reader -> encode -> render -> sink pipeline.
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import shutil
+import threading
+import tracemalloc
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import pipeline
+from qrcodegenpy_shankonduru import (
+    DirectorySink,
+    MetricsCollector,
+    QRCodeGenerator,
+    RenderCache,
+    run_pipeline,
+)
+from qrcodegenpy_shankonduru.cli import cli
+from qrcodegenpy_shankonduru.naming import TimestampNaming
+
+
+class ScriptedNaming(TimestampNaming):
+    """Timestamp naming that hands out fixed stems, to force collisions."""
+
+    def __init__(self, stems):
+        self.stems = iter(stems)
+
+    def name(self, prefix, payload, index):
+        return f"{prefix}_{next(self.stems)}"
+
+
+class CountingPayloads:
+    """Iterable that records how many payloads have been pulled."""
+
+    def __init__(self, count):
+        self.count = count
+        self.pulled = 0
+
+    def __iter__(self):
+        for i in range(self.count):
+            self.pulled += 1
+            yield f"Streamed payload {i}"
+
+
+class MemorySink:
+    """Sink keeping only the sizes of the written images."""
+
+    def __init__(self, fail_on=None):
+        self.sizes = []
+        self.indexes = []
+        self.closed = False
+        self.fail_on = fail_on
+
+    def write(self, index, payload, data):
+        if index == self.fail_on:
+            raise OSError("disk full")
+        self.indexes.append(index)
+        self.sizes.append(len(data))
+        return f"memory://{index}"
+
+    def close(self):
+        self.closed = True
+
+
+class TestRunPipeline:
+    """Test class for run_pipeline()."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "pipeline_output")
+        self.generator = QRCodeGenerator("stream", self.test_output_folder)
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    @pytest.mark.parametrize("chunksize", [1, 8])
+    def test_in_process_is_lazy(self, chunksize):
+        """Test that a single worker pulls one chunk of payloads at a time."""
+        payloads = CountingPayloads(50)
+        results = run_pipeline(payloads, self.generator, MemorySink(), chunksize=chunksize)
+
+        assert payloads.pulled == 0
+        for consumed, _ in enumerate(results, start=1):
+            assert payloads.pulled == -(-consumed // chunksize) * chunksize
+            if consumed == 20:
+                break
+
+    def test_parallel_backpressure(self):
+        """Test that worker mode keeps the number of pulled payloads bounded."""
+        payloads = CountingPayloads(200)
+        chunksize, max_in_flight = 5, 2
+        results = run_pipeline(payloads, self.generator, MemorySink(), workers=2,
+                               chunksize=chunksize, max_in_flight=max_in_flight)
+
+        for consumed, result in enumerate(results, start=1):
+            assert result.ok
+            assert payloads.pulled <= consumed + (max_in_flight + 1) * chunksize
+        assert consumed == 200
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_sink_receives_items_in_order(self, workers):
+        """Test that the sink sees items in input order and is closed."""
+        sink = MemorySink()
+        results = list(run_pipeline(CountingPayloads(20), self.generator, sink,
+                                    workers=workers, chunksize=3))
+
+        assert sink.indexes == list(range(20))
+        assert [r.path for r in results] == [f"memory://{i}" for i in range(20)]
+        assert sink.closed
+
+    def test_default_directory_sink(self):
+        """Test that files are written to the generator's folder by default."""
+        results = list(run_pipeline(["a", "b"], self.generator))
+
+        assert all(os.path.dirname(r.path) == self.test_output_folder for r in results)
+        assert len(os.listdir(self.test_output_folder)) == 2
+
+    def test_errors_are_reported_per_item(self):
+        """Test that encode and sink failures do not stop the stream."""
+        sink = MemorySink(fail_on=2)
+        results = list(run_pipeline(["ok", "X" * 5000, "sink fails", "ok"],
+                                    self.generator, sink))
+
+        assert [r.ok for r in results] == [True, False, False, True]
+        assert isinstance(results[2].error, OSError)
+
+    def test_cache_is_used(self):
+        """Test that cached payloads skip encoding in the pipeline."""
+        cache = RenderCache()
+        generator = QRCodeGenerator("stream", self.test_output_folder, cache=cache)
+        list(run_pipeline(["same", "same", "other"], generator, MemorySink(), chunksize=1))
+
+        assert cache.stats().hits == 1
+
+    def test_repeated_payloads_in_chunk(self):
+        """Test that a payload repeated within one chunk is written each time."""
+        sink = MemorySink()
+        results = list(run_pipeline(["same", "other", "same"], self.generator, sink))
+
+        assert [result.ok for result in results] == [True, True, True]
+        assert sink.indexes == [0, 1, 2]
+        assert sink.sizes[0] == sink.sizes[2]
+
+    def test_directory_sink_context_manager(self):
+        """Test DirectorySink used on its own."""
+        with DirectorySink(self.generator) as sink:
+            path = sink.write(0, "payload", b"data")
+        with open(path, "rb") as file:
+            assert file.read() == b"data"
+
+    def test_peak_memory_independent_of_input_size(self):
+        """Test that peak traced memory does not grow with the number of payloads."""
+        def peak(count):
+            gc.collect()
+            tracemalloc.start()
+            for _ in run_pipeline(CountingPayloads(count), self.generator, MemorySink()):
+                pass
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak_bytes
+
+        # Warm up first so one-off allocations (imports, lookup tables) are not counted
+        peak(5)
+        small = peak(100)
+        large = peak(800)
+        # Keeping every rendered image alive would add well over 200 KB here
+        assert large < small * 2
+
+    def test_workers_write_directory_files(self):
+        """Test that workers write the files of a DirectorySink themselves."""
+        generator = QRCodeGenerator("stream", self.test_output_folder, naming="counter")
+        with patch.object(DirectorySink, "write", side_effect=AssertionError("parent write")):
+            results = list(run_pipeline([f"item {i}" for i in range(12)], generator,
+                                        workers=2, chunksize=4))
+
+        assert [result.ok for result in results] == [True] * 12
+        assert sorted(os.listdir(self.test_output_folder)) == sorted(
+            os.path.basename(result.path) for result in results)
+
+    def test_pool_spawned_outside_main_thread(self):
+        """Test that a run started from another thread spawns its workers."""
+        contexts = []
+        real_pool = pipeline.ProcessPoolExecutor
+
+        def recording_pool(max_workers, mp_context=None):
+            contexts.append(mp_context and mp_context.get_start_method())
+            return real_pool(max_workers, mp_context=mp_context)
+
+        generator = QRCodeGenerator("stream", self.test_output_folder)
+        payloads = [f"thread {i}" for i in range(4)]
+        with patch.object(pipeline, "ProcessPoolExecutor", recording_pool):
+            thread = threading.Thread(
+                target=lambda: list(run_pipeline(payloads, generator, workers=2)))
+            thread.start()
+            thread.join(60)
+            list(run_pipeline(payloads, generator, workers=2))
+
+        assert contexts == ["spawn", None]
+        assert len(os.listdir(self.test_output_folder)) == 8
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_cache_and_observer_with_workers(self, workers):
+        """Test that the cache and the observer are used whatever the worker count."""
+        cache = RenderCache()
+        metrics = MetricsCollector()
+        generator = QRCodeGenerator("stream", self.test_output_folder, cache=cache,
+                                    observer=metrics)
+        payloads = [f"cached {i}" for i in range(6)]
+
+        for _ in range(2):
+            results = list(run_pipeline(payloads, generator, workers=workers, chunksize=2))
+            assert all(result.ok for result in results)
+
+        snapshot = metrics.snapshot()
+        assert cache.stats().hits == 6
+        assert snapshot["codes"] == 12 and snapshot["cache_hits"] == 6
+        assert {"cache", "segment", "make", "render", "save"} <= set(snapshot["stages"])
+        assert len(os.listdir(self.test_output_folder)) == 12
+
+    def test_observer_timings_add_up(self):
+        """Test that each item's total is the sum of its own stages."""
+        records = []
+        generator = QRCodeGenerator("stream", self.test_output_folder, observer=records.append)
+        list(run_pipeline([f"timed {i}" for i in range(5)], generator, workers=2,
+                          chunksize=5))
+
+        assert len(records) == 5
+        for record in records:
+            assert list(record.stages) == ["segment", "make", "render", "save"]
+            assert record.total == pytest.approx(sum(record.stages.values()))
+
+    def test_timestamp_collision_takes_new_name(self):
+        """Test that a timestamp name already taken is not overwritten."""
+        generator = QRCodeGenerator("stream", self.test_output_folder,
+                                    naming=ScriptedNaming(["same", "same", "next"]))
+        with DirectorySink(generator) as sink:
+            first = sink.write(0, "a", b"first")
+            second = sink.write(1, "b", b"second")
+
+        assert os.path.basename(second) == "stream_next.png"
+        with open(first, "rb") as file:
+            assert file.read() == b"first"
+
+    @pytest.mark.parametrize("option", ["workers", "chunksize", "max_in_flight"])
+    def test_invalid_options(self, option):
+        """Test that non-positive options are rejected up front."""
+        with pytest.raises(ValueError):
+            run_pipeline([], self.generator, **{option: 0})
+
+
+class TestPipelineCli:
+    """Test class for the CLI bulk mode running on the pipeline."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "cli_output")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_max_in_flight_flag(self):
+        """Test qrgen --input-file with --max-in-flight."""
+        input_file = os.path.join(self.test_dir, "payloads.jsonl")
+        with open(input_file, "w", encoding="utf-8") as file:
+            file.write("\n".join(f'{{"text": "row {i}"}}' for i in range(8)))
+
+        captured_output = StringIO()
+        with patch('sys.stdout', captured_output):
+            exit_code = cli(["--input-file", input_file, "--output", self.test_output_folder,
+                             "--workers", "2", "--chunksize", "2", "--max-in-flight", "1",
+                             "--format", "svg"])
+
+        assert exit_code == 0
+        files = os.listdir(self.test_output_folder)
+        assert len(files) == 8 and all(name.endswith(".svg") for name in files)
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,192 @@
+"""
+Tests for the direct 1-bit PNG writer.
+"""
+
+import io
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+import qrcode
+from PIL import Image
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator, RenderCache
+from qrcodegenpy_shankonduru.cli import cli
+from qrcodegenpy_shankonduru.png import PNG_FILTERS, encode_png, render_png
+from qrcodegenpy_shankonduru.raster import rasterize
+
+
+def sample_modules(text="https://example.com/png"):
+    """Return qrcode's module lists for text."""
+    qr = qrcode.QRCode()
+    qr.add_data(text)
+    qr.make()
+    return qr.modules
+
+
+def chunks(data):
+    """Return the (type, data) chunks of a PNG file, checking every CRC."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    result = []
+    offset = 8
+    while offset < len(data):
+        length, = struct.unpack(">I", data[offset:offset + 4])
+        kind = data[offset + 4:offset + 8]
+        body = data[offset + 8:offset + 8 + length]
+        crc, = struct.unpack(">I", data[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        result.append((kind, body))
+        offset += 12 + length
+    return result
+
+
+class TestRenderPng:
+    """Test class for render_png() and encode_png()."""
+
+    @pytest.mark.parametrize("filter_type", PNG_FILTERS)
+    @pytest.mark.parametrize("compress_level", [0, 1, 6, 9])
+    def test_pixels_match_rasterize(self, filter_type, compress_level):
+        """Test that every filter and level decodes to the rasterize() image."""
+        modules = sample_modules()
+        data = render_png(modules, 10, 4, compress_level=compress_level,
+                          filter_type=filter_type)
+        image = Image.open(io.BytesIO(data))
+        expected = rasterize(modules, 10, 4)
+        assert image.mode == "1"
+        assert image.size == expected.size
+        assert image.tobytes() == expected.tobytes()
+
+    @pytest.mark.parametrize("fill_color,back_color", [
+        ("red", "yellow"),
+        ("#123456", "white"),
+        ((0, 0, 255), (250, 250, 250)),
+        ("black", "transparent"),
+        ("green", "transparent"),
+    ])
+    def test_colors_match_rasterize(self, fill_color, back_color):
+        """Test palette output for colored and transparent images."""
+        modules = sample_modules("colors")
+        image = Image.open(io.BytesIO(render_png(modules, 3, 2, fill_color, back_color)))
+        expected = rasterize(modules, 3, 2, fill_color, back_color)
+        assert image.mode == "P"
+        assert image.convert(expected.mode).tobytes() == expected.tobytes()
+
+    def test_structure(self):
+        """Test the chunk layout and 1-bit grayscale header."""
+        data = render_png(sample_modules(), 1, 0)
+        kinds = [kind for kind, _ in chunks(data)]
+        assert kinds == [b"IHDR", b"IDAT", b"IEND"]
+        width, height, depth, color_type = struct.unpack(">IIBB", chunks(data)[0][1][:10])
+        assert (width, height, depth, color_type) == (25, 25, 1, 0)
+
+    def test_repeated_rows_use_up_filter(self):
+        """Test that the auto filter stores box_size repeats as zero Up rows."""
+        data = render_png(sample_modules(), 8, 0, compress_level=0)
+        raw = zlib.decompress(chunks(data)[1][1])
+        stride = (25 * 8 + 7) // 8 + 1
+        lines = [raw[start:start + stride] for start in range(0, len(raw), stride)]
+        assert [line[0] for line in lines[:8]] == [0, 2, 2, 2, 2, 2, 2, 2]
+        assert lines[1][1:] == bytes(stride - 1)
+
+    def test_smaller_than_pillow(self):
+        """Test that the default output is smaller than Pillow's."""
+        modules = sample_modules("x" * 200)
+        buffer = io.BytesIO()
+        rasterize(modules).save(buffer, format="PNG")
+        assert len(render_png(modules)) < len(buffer.getvalue())
+
+    def test_higher_level_is_not_larger(self):
+        """Test that level 9 with the smallest filter beats level 1."""
+        modules = sample_modules("y" * 300)
+        assert len(render_png(modules, compress_level=9, filter_type="smallest")) < \
+            len(render_png(modules, compress_level=1))
+
+    @pytest.mark.parametrize("options", [{"compress_level": 10}, {"compress_level": -1},
+                                         {"filter_type": "paeth"}])
+    def test_invalid_options(self, options):
+        """Test that unsupported levels and filters are rejected."""
+        with pytest.raises(ValueError):
+            encode_png(b"\x00" * 3, 8, 3, **options)
+
+
+class TestGeneratorPngWriter:
+    """Test class for QRCodeGenerator's png_writer and png_compression options."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_builtin_writer_files(self):
+        """Test that generate_qr_code() writes a PNG identical in pixels."""
+        builtin = QRCodeGenerator("qr", self.test_dir, png_writer="builtin")
+        pillow = QRCodeGenerator(output_folder=None)
+        path = builtin.generate_qr_code("https://example.com/file")
+
+        with Image.open(path) as image:
+            assert image.tobytes() == \
+                pillow.generate_qr_image("https://example.com/file").tobytes()
+
+    def test_builtin_writer_skips_pillow(self):
+        """Test that the builtin writer never creates a PIL image."""
+        generator = QRCodeGenerator(output_folder=None, png_writer="builtin")
+        with patch("qrcodegenpy_shankonduru.raster.Image.frombytes") as frombytes:
+            data = generator.generate_qr_bytes("direct")
+        assert frombytes.call_count == 0
+        assert data.startswith(b"\x89PNG")
+
+    def test_pillow_compression_level(self):
+        """Test that png_compression is applied to Pillow output too."""
+        fast = QRCodeGenerator(output_folder=None, png_compression=0)
+        default = QRCodeGenerator(output_folder=None)
+        assert len(fast.generate_qr_bytes("level")) > len(default.generate_qr_bytes("level"))
+
+    def test_cache_keys(self):
+        """Test that writer settings are part of the PNG cache key only when changed."""
+        default = QRCodeGenerator(output_folder=None)
+        builtin = QRCodeGenerator(output_folder=None, png_writer="builtin")
+        level = QRCodeGenerator(output_folder=None, png_compression=9)
+        keys = {generator._cache_key("a", "PNG") for generator in (default, builtin, level)}
+        assert len(keys) == 3
+        assert builtin._cache_key("a", "SVG") == default._cache_key("a", "SVG")
+
+    def test_cached_builtin_output(self):
+        """Test that the builtin writer works with the render cache."""
+        generator = QRCodeGenerator(output_folder=None, png_writer="builtin",
+                                    cache=RenderCache())
+        first = generator.generate_qr_bytes("cached")
+        assert generator.generate_qr_bytes("cached") == first
+        assert generator.cache.stats().hits == 1
+
+    @pytest.mark.parametrize("options", [{"png_writer": "cairo"}, {"png_compression": 10}])
+    def test_invalid_options(self, options):
+        """Test that unsupported writer settings are rejected."""
+        with pytest.raises(ValueError):
+            QRCodeGenerator(output_folder=None, **options)
+
+    def test_cli_options(self):
+        """Test qrgen --png-writer and --png-compression."""
+        output_folder = os.path.join(self.test_dir, "cli")
+        with patch('sys.stdout', StringIO()):
+            cli(["hello", "--output", output_folder, "--png-writer", "builtin",
+                 "--png-compression", "9"])
+        (name,) = os.listdir(output_folder)
+        with Image.open(os.path.join(output_folder, name)) as image:
+            assert image.mode == "1"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+"""
+Tests for the vectorized module-matrix rasterizer.
+
+The rasterizer must be pixel-identical to qrcode's PIL backend, with and
+without NumPy installed.
+"""
+
+import sys
+import pytest
+import qrcode
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import raster
+from qrcodegenpy_shankonduru.matrix import ModuleMatrix
+from qrcodegenpy_shankonduru.raster import rasterize
+
+BACKENDS = ["numpy", "python"]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Run a test with the NumPy path and with the pure-Python fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(raster, "numpy", None)
+    return request.param
+
+
+def make_qr(data, box_size=10, border=4):
+    qr = qrcode.QRCode(box_size=box_size, border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+
+class TestRasterize:
+    """Test class for rasterize()."""
+
+    @pytest.mark.parametrize("data", ["A", "https://www.example.com", "X" * 400])
+    @pytest.mark.parametrize("box_size, border", [(1, 0), (3, 1), (10, 4)])
+    def test_matches_qrcode_pil_backend(self, backend, data, box_size, border):
+        """Test pixel equality with qrcode's PIL backend for black on white."""
+        qr = make_qr(data, box_size, border)
+        expected = qr.make_image().get_image()
+
+        img = rasterize(qr.modules, box_size, border)
+
+        assert img.mode == "1"
+        assert img.size == expected.size
+        assert img.tobytes() == expected.tobytes()
+
+    @pytest.mark.parametrize("fill_color, back_color, mode", [
+        ("red", "blue", "RGB"),
+        ("Black", "transparent", "RGBA"),
+        ((10, 20, 30), (200, 200, 200), "RGB"),
+    ])
+    def test_colors_match_qrcode_pil_backend(self, backend, fill_color, back_color, mode):
+        """Test pixel equality with qrcode's PIL backend for custom colors."""
+        qr = make_qr("Colors", 4, 2)
+        expected = qr.make_image(fill_color=fill_color, back_color=back_color).get_image()
+
+        img = rasterize(qr.modules, 4, 2, fill_color, back_color)
+
+        assert img.mode == expected.mode == mode
+        assert img.tobytes() == expected.tobytes()
+
+    def test_accepts_numpy_array(self):
+        """Test that a NumPy boolean matrix can be passed directly."""
+        numpy = pytest.importorskip("numpy")
+        qr = make_qr("Array input")
+
+        img = rasterize(numpy.array(qr.modules, dtype=bool), 10, 4)
+
+        assert img.tobytes() == qr.make_image().get_image().tobytes()
+
+    @pytest.mark.parametrize("data", ["A", "X" * 400])
+    @pytest.mark.parametrize("box_size, border", [(1, 0), (3, 1), (5, 3), (10, 4)])
+    def test_module_matrix_rendered_packed(self, backend, monkeypatch, data, box_size, border):
+        """Test that a ModuleMatrix is scaled from its packed rows, without unpacking."""
+        qr = make_qr(data, box_size, border)
+        matrix = ModuleMatrix.from_rows(qr.modules)
+        monkeypatch.setattr(ModuleMatrix, "to_array", None)
+
+        img = rasterize(matrix, box_size, border)
+
+        assert img.tobytes() == qr.make_image().get_image().tobytes()
+
+    @pytest.mark.parametrize("box_size, border", [(0, 4), (10, -1)])
+    def test_invalid_geometry(self, box_size, border):
+        """Test that invalid box sizes and borders are rejected."""
+        with pytest.raises(ValueError):
+            rasterize([[True]], box_size, border)
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,211 @@
+"""
+Tests for the table-driven Reed-Solomon encoder.
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+import qrcode
+from qrcode import exceptions, util
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator
+from qrcodegenpy_shankonduru import reed_solomon
+from qrcodegenpy_shankonduru.segments import segment_for_version
+
+ERROR_CORRECTIONS = [
+    qrcode.constants.ERROR_CORRECT_L,
+    qrcode.constants.ERROR_CORRECT_M,
+    qrcode.constants.ERROR_CORRECT_Q,
+    qrcode.constants.ERROR_CORRECT_H,
+]
+
+
+def random_byte_segments(version, error_correction, rng):
+    """Return a byte segment of random length that fits in version."""
+    capacity = util.BIT_LIMIT_TABLE[error_correction][version] // 8 - 3 - (version > 9)
+    data = bytes(rng.randrange(256) for _ in range(rng.randrange(capacity + 1)))
+    return [util.QRData(data, util.MODE_8BIT_BYTE, check_data=False)]
+
+
+class TestGaloisField:
+    """Test class for the GF(256) tables and generator polynomials."""
+
+    def test_tables_match_qrcode(self):
+        """Test that the log/antilog tables agree with qrcode's."""
+        for exponent in range(255):
+            assert reed_solomon.EXP_TABLE[exponent] == qrcode.base.gexp(exponent)
+        for value in range(1, 256):
+            assert reed_solomon.LOG_TABLE[value] == qrcode.base.glog(value)
+
+    def test_multiply(self):
+        """Test GF(256) multiplication against carry-less multiplication."""
+        def reference(a, b):
+            product = 0
+            while b:
+                if b & 1:
+                    product ^= a
+                a <<= 1
+                if a & 0x100:
+                    a ^= 0x11D
+                b >>= 1
+            return product
+
+        rng = random.Random(3)
+        for _ in range(2000):
+            a, b = rng.randrange(256), rng.randrange(256)
+            assert reed_solomon.gf_multiply(a, b) == reference(a, b)
+
+    @pytest.mark.parametrize("ec_count", sorted(qrcode.LUT.rsPoly_LUT))
+    def test_generator_polynomial_matches_lut(self, ec_count):
+        """Test the generator polynomials against qrcode's lookup table."""
+        assert list(reed_solomon.generator_polynomial(ec_count)) == \
+            qrcode.LUT.rsPoly_LUT[ec_count]
+
+    def test_generator_polynomial_is_cached(self):
+        """Test that a generator polynomial is built only once."""
+        assert reed_solomon.generator_polynomial(22) is reed_solomon.generator_polynomial(22)
+
+
+class TestCodewords:
+    """Test class for ec_codewords(), create_data() and create_data_batch()."""
+
+    def test_ec_codewords_known_block(self):
+        """Test the error correction of the ISO 18004 "01234567" 1-M example."""
+        data = bytes([16, 32, 12, 86, 97, 128, 236, 17, 236, 17, 236, 17, 236, 17, 236, 17])
+        assert list(reed_solomon.ec_codewords(data, 10)) == \
+            [165, 36, 212, 193, 237, 54, 199, 135, 44, 85]
+
+    @pytest.mark.parametrize("error_correction", ERROR_CORRECTIONS)
+    def test_create_data_matches_qrcode_every_version(self, error_correction):
+        """Test byte-identical codewords for every version."""
+        rng = random.Random(error_correction)
+        for version in range(1, 41):
+            data_list = random_byte_segments(version, error_correction, rng)
+            assert reed_solomon.create_data(version, error_correction, data_list) == \
+                util.create_data(version, error_correction, data_list)
+
+    def test_create_data_matches_qrcode_mixed_segments(self):
+        """Test numeric, alphanumeric, byte and kanji segments."""
+        rng = random.Random(11)
+        alphabet = "0123456789ABCXYZ $%*+-./:abcé漢字"
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randrange(1, 400)))
+            error_correction = rng.choice(ERROR_CORRECTIONS)
+            data_list, version = segment_for_version(text, error_correction, kanji=True)
+            assert reed_solomon.create_data(version, error_correction, data_list) == \
+                util.create_data(version, error_correction, data_list)
+
+    def test_empty_data_is_all_padding(self):
+        """Test that no segments at all still yields a full, padded symbol."""
+        assert reed_solomon.create_data(3, qrcode.constants.ERROR_CORRECT_L, []) == \
+            util.create_data(3, qrcode.constants.ERROR_CORRECT_L, [])
+
+    def test_overflow(self):
+        """Test that data larger than the version raises DataOverflowError."""
+        data_list = [util.QRData(b"x" * 20, util.MODE_8BIT_BYTE, check_data=False)]
+        with pytest.raises(exceptions.DataOverflowError):
+            reed_solomon.create_data(1, qrcode.constants.ERROR_CORRECT_H, data_list)
+
+    @pytest.mark.parametrize("version", [1, 5, 14, 27, 40])
+    @pytest.mark.parametrize("error_correction", ERROR_CORRECTIONS)
+    def test_batch_matches_single(self, version, error_correction):
+        """Test that a batch equals encoding each code separately."""
+        rng = random.Random(version * 4 + error_correction)
+        data_lists = [random_byte_segments(version, error_correction, rng) for _ in range(7)]
+        assert reed_solomon.create_data_batch(version, error_correction, data_lists) == \
+            [util.create_data(version, error_correction, data_list)
+             for data_list in data_lists]
+
+    def test_batch_empty(self):
+        """Test that an empty batch returns an empty list."""
+        assert reed_solomon.create_data_batch(10, qrcode.constants.ERROR_CORRECT_M, []) == []
+
+    def test_batch_without_numpy(self):
+        """Test the pure-Python fallback of the batch functions."""
+        rng = random.Random(5)
+        data_lists = [random_byte_segments(9, 0, rng) for _ in range(3)]
+        expected = [util.create_data(9, 0, data_list) for data_list in data_lists]
+        blocks = [bytes(rng.randrange(256) for _ in range(15)) for _ in range(4)]
+        with patch.object(reed_solomon, "numpy", None):
+            assert reed_solomon.create_data_batch(9, 0, data_lists) == expected
+            assert reed_solomon.ec_codewords_batch(blocks, 18) == \
+                [reed_solomon.ec_codewords(block, 18) for block in blocks]
+
+    def test_ec_codewords_batch(self):
+        """Test the vectorized block encoder against the shift-register one."""
+        pytest.importorskip("numpy")
+        rng = random.Random(8)
+        blocks = [[rng.randrange(256) for _ in range(118)] for _ in range(25)]
+        assert reed_solomon.ec_codewords_batch(blocks, 30) == \
+            [reed_solomon.ec_codewords(block, 30) for block in blocks]
+
+    def test_ec_codewords_batch_threads(self):
+        """Test concurrent batches of more block shapes than parity matrices are cached."""
+        pytest.importorskip("numpy")
+        rng = random.Random(9)
+        shapes = [(data_count, 7 + data_count % 4)
+                  for data_count in range(1, 2 * reed_solomon._PARITY_CACHE_SIZE)]
+        jobs = [([[rng.randrange(256) for _ in range(data_count)] for _ in range(3)], ec_count)
+                for data_count, ec_count in shapes * 2]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda job: reed_solomon.ec_codewords_batch(*job), jobs))
+
+        for (blocks, ec_count), result in zip(jobs, results):
+            assert result == [reed_solomon.ec_codewords(block, ec_count) for block in blocks]
+
+
+class TestEngineOption:
+    """Test class for QRCodeGenerator's engine option."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_default_engine_is_builtin(self):
+        """Test that the builtin encoder is the default."""
+        generator = QRCodeGenerator(output_folder=None)
+        assert generator.engine == "builtin"
+        with patch.object(util, "create_data", side_effect=AssertionError("not used")):
+            generator.generate_qr_bytes("https://example.com/builtin")
+
+    def test_qrcode_engine_uses_library(self):
+        """Test that engine="qrcode" goes through qrcode's create_data."""
+        generator = QRCodeGenerator(output_folder=None, engine="qrcode")
+        with patch.object(util, "create_data", wraps=util.create_data) as create_data:
+            generator.generate_qr_bytes("https://example.com/library")
+        assert create_data.call_count == 1
+
+    @pytest.mark.parametrize("error_correction", ERROR_CORRECTIONS)
+    def test_engines_produce_identical_images(self, error_correction):
+        """Test that both engines render the same bytes."""
+        payloads = ["A", "https://example.com/" + "x" * 300, "SERIAL 000123456789",
+                    "é" * 200]
+        for payload in payloads:
+            builtin = QRCodeGenerator(output_folder=None, error_correction=error_correction)
+            library = QRCodeGenerator(output_folder=None, error_correction=error_correction,
+                                      engine="qrcode")
+            assert builtin.generate_qr_bytes(payload) == library.generate_qr_bytes(payload)
+
+    def test_invalid_engine(self):
+        """Test that an unknown engine is rejected."""
+        with pytest.raises(ValueError, match="Unsupported engine"):
+            QRCodeGenerator(output_folder=self.test_dir, engine="numpy")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
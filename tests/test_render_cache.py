@@ -0,0 +1,183 @@
+"""
+Tests for the content-addressed render cache and its use by QRCodeGenerator.
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+import threading
+import pytest
+from PIL import Image
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator, RenderCache
+from qrcodegenpy_shankonduru.cache import cache_key
+
+
+class TestRenderCache:
+    """Test class for RenderCache behaviour."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_cache_key_covers_settings(self):
+        """Test that every setting changes the key and equal inputs match."""
+        base = ("payload", 1, 1, 10, 4, "black", "white", "PNG")
+        keys = {cache_key(*base)}
+        for position, value in enumerate(["other", 2, 0, 5, 2, "red", "blue", "SVG"]):
+            changed = list(base)
+            changed[position] = value
+            keys.add(cache_key(*changed))
+        assert len(keys) == 9
+        assert cache_key(*base) == cache_key(*base)
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses."""
+        cache = RenderCache()
+        assert cache.get("a") is None
+        cache.put("a", b"data")
+        assert cache.get("a") == b"data"
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries, stats.size_bytes) == (1, 1, 1, 4)
+        assert stats.hit_rate == 0.5
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = RenderCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+
+        assert "a" in cache and "c" in cache and "b" not in cache
+        assert cache.stats().evictions == 1
+
+    def test_eviction_by_size(self):
+        """Test that the byte limit is enforced."""
+        cache = RenderCache(max_entries=100, max_bytes=10)
+        for key in "abcd":
+            cache.put(key, b"xxxx")
+
+        stats = cache.stats()
+        assert stats.size_bytes <= 10
+        assert stats.entries == 2
+        assert stats.evictions == 2
+
+    def test_disk_tier_survives_new_instance(self):
+        """Test that a fresh cache is served from the shared disk folder."""
+        disk_folder = os.path.join(self.test_dir, "disk")
+        RenderCache(disk_folder=disk_folder).put("key", b"png bytes")
+
+        cache = RenderCache(disk_folder=disk_folder)
+        assert cache.get("key") == b"png bytes"
+        assert cache.get("key") == b"png bytes"
+
+        stats = cache.stats()
+        assert (stats.disk_hits, stats.hits, stats.misses) == (1, 1, 0)
+
+    def test_clear_resets_memory(self):
+        """Test that clear() empties the memory tier and counters."""
+        cache = RenderCache()
+        cache.put("a", b"1")
+        cache.get("a")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats().hits == 0
+
+    def test_concurrent_access(self):
+        """Test that concurrent puts and gets keep the counters consistent."""
+        cache = RenderCache(max_entries=50)
+
+        def worker(offset):
+            for i in range(200):
+                key = str((offset + i) % 80)
+                if cache.get(key) is None:
+                    cache.put(key, b"v" * 10)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert stats.hits + stats.misses == 800
+        assert stats.entries <= 50
+        assert stats.size_bytes == stats.entries * 10
+
+
+class TestGeneratorWithCache:
+    """Test class for QRCodeGenerator with a cache attached."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "cached_output")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_repeat_payload_hits_cache(self):
+        """Test that a repeated payload is served from the cache."""
+        cache = RenderCache()
+        generator = QRCodeGenerator("cached", self.test_output_folder, cache=cache)
+
+        first = generator.generate_qr_code("https://shop.example/item/1")
+        second = generator.generate_qr_code("https://shop.example/item/1")
+
+        assert first != second
+        with open(first, "rb") as a, open(second, "rb") as b:
+            assert a.read() == b.read()
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+
+    def test_cached_output_matches_uncached(self):
+        """Test that the cached image is identical to a normal render."""
+        plain = QRCodeGenerator("plain", self.test_output_folder)
+        cached = QRCodeGenerator("cached", self.test_output_folder, cache=RenderCache())
+
+        with Image.open(plain.generate_qr_code("Same content")) as expected, \
+                Image.open(cached.generate_qr_code("Same content")) as actual:
+            assert actual.format == "PNG"
+            assert actual.size == expected.size
+            assert actual.tobytes() == expected.tobytes()
+
+    def test_settings_are_part_of_key(self):
+        """Test that generators with different settings do not share entries."""
+        cache = RenderCache()
+        small = QRCodeGenerator("small", self.test_output_folder, box_size=2, cache=cache)
+        large = QRCodeGenerator("large", self.test_output_folder, box_size=8, cache=cache)
+
+        with Image.open(small.generate_qr_code("x")) as a, \
+                Image.open(large.generate_qr_code("x")) as b:
+            assert a.size != b.size
+        assert cache.stats().misses == 2
+
+    def test_batch_uses_cache(self):
+        """Test that the batch API also goes through the cache."""
+        cache = RenderCache()
+        generator = QRCodeGenerator("batch", self.test_output_folder, cache=cache)
+
+        results = list(generator.generate_qr_codes(["a", "b", "a", "a"]))
+
+        assert all(r.ok for r in results)
+        assert cache.stats().hits == 2
+        assert len(os.listdir(self.test_output_folder)) == 4
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,199 @@
+"""
+Tests for the optimal mixed-mode segmenter.
+"""
+
+import itertools
+import random
+import sys
+from pathlib import Path
+import pytest
+import qrcode
+from qrcode import util
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator
+from qrcodegenpy_shankonduru import segments as segments_module
+from qrcodegenpy_shankonduru.capacity import encoded_bits
+from qrcodegenpy_shankonduru.segments import KanjiData, optimal_segments, segment_for_version
+
+SIZE_CLASSES = [util.MODE_SIZE_SMALL, util.MODE_SIZE_MEDIUM, util.MODE_SIZE_LARGE]
+ALPHANUMERIC = util.ALPHA_NUM.decode("ascii")
+
+
+def decode_bits(segments, mode_sizes):
+    """Minimal bit stream decoder used to check what the segments encode."""
+    buffer = util.BitBuffer()
+    for segment in segments:
+        buffer.put(segment.mode, 4)
+        buffer.put(len(segment), mode_sizes[segment.mode])
+        segment.write(buffer)
+    bits = "".join("1" if buffer.get(i) else "0" for i in range(len(buffer)))
+
+    position = 0
+
+    def read(count):
+        nonlocal position
+        value = int(bits[position:position + count], 2)
+        position += count
+        return value
+
+    text = []
+    while position < len(bits):
+        mode = read(4)
+        length = read(mode_sizes[mode])
+        if mode == util.MODE_NUMBER:
+            for group in range(0, length, 3):
+                digits = min(3, length - group)
+                text.append(str(read(util.NUMBER_LENGTH[digits])).zfill(digits))
+        elif mode == util.MODE_ALPHA_NUM:
+            for pair in range(0, length - 1, 2):
+                value = read(11)
+                text.append(ALPHANUMERIC[value // 45] + ALPHANUMERIC[value % 45])
+            if length % 2:
+                text.append(ALPHANUMERIC[read(6)])
+        elif mode == util.MODE_8BIT_BYTE:
+            text.append(bytes(read(8) for _ in range(length)).decode("utf-8"))
+        else:
+            for _ in range(length):
+                value = read(13)
+                code = (value // 0xC0 << 8) | (value % 0xC0)
+                code += 0x8140 if code < 0x1F00 else 0xC140
+                text.append(code.to_bytes(2, "big").decode("shift_jis"))
+    return "".join(text)
+
+
+def brute_force_bits(text, mode_sizes):
+    """Smallest bit length over every per-character mode assignment."""
+    def allowed(mode, char):
+        if mode == util.MODE_NUMBER:
+            return char in "0123456789"
+        if mode == util.MODE_ALPHA_NUM:
+            return char in ALPHANUMERIC
+        return True
+
+    best = None
+    modes = (util.MODE_NUMBER, util.MODE_ALPHA_NUM, util.MODE_8BIT_BYTE)
+    for assignment in itertools.product(modes, repeat=len(text)):
+        if not all(allowed(mode, char) for mode, char in zip(assignment, text)):
+            continue
+        candidate = [
+            util.QRData("".join(char for _, char in group).encode("utf-8"), mode,
+                        check_data=False)
+            for mode, group in itertools.groupby(zip(assignment, text), key=lambda pair: pair[0])
+        ]
+        bits = encoded_bits(candidate, mode_sizes)
+        best = bits if best is None else min(best, bits)
+    return best
+
+
+class TestOptimalSegments:
+    """Test class for optimal_segments()."""
+
+    def test_matches_brute_force(self):
+        """Test that the dynamic program finds the minimal bit length."""
+        rng = random.Random(7)
+        for _ in range(300):
+            text = "".join(rng.choice("aA1:é") for _ in range(rng.randint(1, 7)))
+            for mode_sizes in SIZE_CLASSES:
+                assert (encoded_bits(optimal_segments(text, mode_sizes), mode_sizes)
+                        == brute_force_bits(text, mode_sizes)), text
+
+    def test_byte_shortcut_is_exact(self):
+        """Test that skipping the dynamic program never costs bits."""
+        rng = random.Random(11)
+        for _ in range(2000):
+            text = "".join(rng.choice("aZ09 :/é") for _ in range(rng.randint(1, 16)))
+            for mode_sizes in SIZE_CLASSES:
+                shortcut = encoded_bits(optimal_segments(text, mode_sizes), mode_sizes)
+                with pytest.MonkeyPatch.context() as monkeypatch:
+                    monkeypatch.setattr(segments_module, "_MAY_SWITCH",
+                                        type("Always", (), {"search": lambda self, t: True})())
+                    full = encoded_bits(optimal_segments(text, mode_sizes), mode_sizes)
+                assert shortcut == full, text
+
+    @pytest.mark.parametrize("text", [
+        "SN-000123456789",
+        "HTTPS://EXAMPLE.COM/ITEM/1234567890",
+        "Lot A1B2C3 qty 000000000012",
+        "abc123456789012def",
+        "https://www.example.com/?q=über",
+        "日本語のテキスト and ＡＢＣ 123456",
+        "",
+    ])
+    def test_round_trip(self, text):
+        """Test that the segments decode back to the original text."""
+        for kanji in (False, True):
+            for mode_sizes in SIZE_CLASSES:
+                assert decode_bits(optimal_segments(text, mode_sizes, kanji), mode_sizes) == text
+
+    @pytest.mark.parametrize("text", [
+        "SN-000123456789",
+        "HTTPS://EXAMPLE.COM/ITEM/1234567890",
+        "abc123456789012def",
+    ])
+    def test_never_larger_than_qrcode(self, text):
+        """Test that mixed payloads need fewer bits than qrcode's own chunking."""
+        qr = qrcode.QRCode()
+        qr.add_data(text)
+        for mode_sizes in SIZE_CLASSES:
+            assert (encoded_bits(optimal_segments(text, mode_sizes), mode_sizes)
+                    < encoded_bits(qr.data_list, mode_sizes))
+
+    def test_kanji_packing(self):
+        """Test the 13-bit kanji values from ISO/IEC 18004 section 7.4.6."""
+        buffer = util.BitBuffer()
+        KanjiData("点茗").write(buffer)
+        bits = "".join("1" if buffer.get(i) else "0" for i in range(len(buffer)))
+        assert bits == format(0x0D9F, "013b") + format(0x1AAA, "013b")
+
+    def test_kanji_is_opt_in(self):
+        """Test that kanji mode is only used when enabled."""
+        text = "日本語のテキスト"
+        assert {segment.mode for segment in optimal_segments(text)} == {util.MODE_8BIT_BYTE}
+        assert [segment.mode for segment in optimal_segments(text, kanji=True)] == [
+            util.MODE_KANJI]
+
+
+class TestSegmentForVersion:
+    """Test class for segment_for_version() and the generator integration."""
+
+    def test_serial_numbers_get_smaller_versions(self):
+        """Test that a digit-heavy payload fits a smaller symbol than before."""
+        text = "item-00012345678-lot-99887766554-rev-b"
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_Q)
+        qr.add_data(text)
+        _, version = segment_for_version(text, qrcode.constants.ERROR_CORRECT_Q)
+        assert version == 3
+        assert qr.best_fit() == 4
+
+    def test_overflow(self):
+        """Test that oversize payloads raise DataOverflowError."""
+        with pytest.raises(qrcode.exceptions.DataOverflowError):
+            segment_for_version("x" * 3000, qrcode.constants.ERROR_CORRECT_L)
+
+    def test_generator_uses_segments(self):
+        """Test that the generator encodes the optimal segments."""
+        generator = QRCodeGenerator(output_folder=None)
+        qr = generator._new_qr()
+        generator._encode(qr, "SN-000123456789")
+        assert [segment.mode for segment in qr.data_list] == [util.MODE_ALPHA_NUM,
+                                                               util.MODE_NUMBER]
+
+    def test_generator_kanji_option(self):
+        """Test that kanji=True shrinks Japanese payloads and changes the cache key."""
+        text = "倉庫の在庫管理システムへようこそ。品番と数量を確認してください。"
+        plain = QRCodeGenerator(output_folder=None)
+        kanji = QRCodeGenerator(output_folder=None, kanji=True)
+        plain_qr, kanji_qr = plain._new_qr(), kanji._new_qr()
+        plain._encode(plain_qr, text)
+        kanji._encode(kanji_qr, text)
+
+        assert kanji_qr.version < plain_qr.version
+        assert plain._cache_key(text, "PNG") != kanji._cache_key(text, "PNG")
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+"""
+Tests for the sharded output directory layout.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator, ShardedLayout, run_pipeline
+
+
+class TestShardedLayout:
+    """Test class for ShardedLayout."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "sharded")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_prepare_creates_every_shard(self):
+        """Test that all shard directories exist after prepare()."""
+        layout = ShardedLayout(levels=2, width=1)
+        layout.prepare(self.test_output_folder)
+
+        assert layout.shard_count == 256
+        top_level = sorted(os.listdir(self.test_output_folder))
+        assert top_level == list("0123456789abcdef")
+        leaves = [os.path.join(top, leaf) for top in top_level
+                  for leaf in os.listdir(os.path.join(self.test_output_folder, top))]
+        assert len(leaves) == 256
+
+    def test_prepare_is_idempotent(self):
+        """Test that preparing an existing tree keeps its files."""
+        layout = ShardedLayout(levels=1, width=1)
+        layout.prepare(self.test_output_folder)
+        marker = os.path.join(self.test_output_folder, "a", "keep.txt")
+        with open(marker, "w", encoding="utf-8") as file:
+            file.write("x")
+        layout.prepare(self.test_output_folder)
+        assert os.path.exists(marker)
+
+    def test_hash_shard_is_stable(self):
+        """Test that a payload always maps to the same shard."""
+        layout = ShardedLayout()
+        shard = layout.shard("https://example.com", 0)
+        assert shard == layout.shard("https://example.com", 99)
+        assert shard == os.path.join("10", "06")
+
+    def test_hash_shard_of_non_text_payloads(self):
+        """Test that bytes and int payloads are sharded like their UTF-8 text."""
+        layout = ShardedLayout()
+        assert layout.shard(b"https://example.com", 0) == os.path.join("10", "06")
+        assert layout.shard(42, 0) == layout.shard("42", 0)
+
+        generator = QRCodeGenerator("tag", self.test_output_folder, layout=layout)
+        path = generator.generate_qr_code(b"\xffraw")
+        assert os.path.dirname(path) == os.path.join(self.test_output_folder,
+                                                     layout.shard(b"\xffraw", 0))
+
+    def test_sequence_shard_round_robin(self):
+        """Test that sequence numbers are dealt across shards."""
+        layout = ShardedLayout(key="sequence", levels=2, width=1)
+        assert layout.shard("x", 0) == os.path.join("0", "0")
+        assert layout.shard("x", 17) == os.path.join("1", "1")
+        assert layout.shard("x", 256) == layout.shard("x", 0)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"key": "random"},
+        {"levels": 0},
+        {"width": 0},
+        {"levels": 3, "width": 2},
+    ])
+    def test_invalid_layout(self, kwargs):
+        """Test that unsupported settings are rejected."""
+        with pytest.raises(ValueError):
+            ShardedLayout(**kwargs)
+
+    def test_generator_writes_into_shards(self):
+        """Test that generate_qr_code places files in their hash shard."""
+        layout = ShardedLayout(levels=1, width=1)
+        generator = QRCodeGenerator("tag", self.test_output_folder, layout=layout)
+
+        path = generator.generate_qr_code("https://example.com")
+
+        expected_folder = os.path.join(self.test_output_folder,
+                                       layout.shard("https://example.com", 0))
+        assert os.path.dirname(path) == expected_folder
+        assert os.path.exists(path)
+
+    def test_no_directory_probing_per_write(self):
+        """Test that writes do not create directories."""
+        generator = QRCodeGenerator("tag", self.test_output_folder,
+                                    layout=ShardedLayout(key="sequence", levels=1, width=1))
+        with patch("os.makedirs") as makedirs, patch("os.mkdir") as mkdir:
+            paths = [result.path for result in generator.generate_qr_codes(
+                [f"item {i}" for i in range(4)])]
+
+        makedirs.assert_not_called()
+        mkdir.assert_not_called()
+        assert [os.path.basename(os.path.dirname(path)) for path in paths] == ["0", "1", "2", "3"]
+
+    def test_pipeline_uses_item_index(self):
+        """Test that the pipeline shards sequence layouts by input index."""
+        generator = QRCodeGenerator("tag", self.test_output_folder, box_size=1, border=0,
+                                    layout=ShardedLayout(key="sequence", levels=1, width=1))
+        results = list(run_pipeline([f"p{i}" for i in range(20)], generator))
+
+        for result in results:
+            assert os.path.basename(os.path.dirname(result.path)) == format(result.index % 16, "x")
+
+    def test_flat_layout_unchanged(self):
+        """Test that generators without a layout still write flat."""
+        generator = QRCodeGenerator("tag", self.test_output_folder)
+        path = generator.generate_qr_code("flat")
+        assert os.path.dirname(path) == self.test_output_folder
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])
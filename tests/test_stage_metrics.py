@@ -0,0 +1,200 @@
+"""
+Tests for the per-stage timing hooks of QRCodeGenerator and MetricsCollector.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import MetricsCollector, QRCodeGenerator, RenderCache, StageTimings
+from qrcodegenpy_shankonduru.metrics import Histogram, StageClock
+
+
+def timings(stages, version=2, payload_size=30, cached=False):
+    return StageTimings(payload_size, None if cached else version, "PNG", cached, stages,
+                        sum(stages.values()))
+
+
+class TestObserver:
+    """Test class for the observer hook of QRCodeGenerator."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.records = []
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def generator(self, **settings):
+        return QRCodeGenerator("test", self.test_dir, observer=self.records.append, **settings)
+
+    def test_pillow_png_stages(self):
+        """Test the stages of generate_qr_code() with the Pillow writer."""
+        self.generator().generate_qr_code("https://example.com/ü")
+
+        (record,) = self.records
+        assert list(record.stages) == ["segment", "make", "render", "save"]
+        assert all(seconds >= 0 for seconds in record.stages.values())
+        assert record.total == pytest.approx(sum(record.stages.values()))
+        assert record.payload_size == len("https://example.com/ü".encode("utf-8"))
+        assert record.version == 2
+        assert record.image_format == "PNG"
+        assert not record.cached
+
+    @pytest.mark.parametrize("payload, size", [(b"\xff\x00raw", 5), (1234567, 7)])
+    def test_non_text_payloads(self, payload, size):
+        """Test that bytes and int payloads are measured, not only str."""
+        metrics = MetricsCollector()
+        path = QRCodeGenerator("test", self.test_dir, observer=metrics).generate_qr_code(payload)
+
+        assert os.path.exists(path)
+        snapshot = metrics.snapshot()
+        assert snapshot["codes"] == 1
+        assert snapshot["payload_bytes"]["sum"] == size
+
+    @pytest.mark.parametrize("settings", [{"image_format": "SVG"}, {"png_writer": "builtin"}])
+    def test_serialized_output_stages(self, settings):
+        """Test the stages of vector and builtin PNG output."""
+        self.generator(**settings).generate_qr_code("svg")
+        assert list(self.records[0].stages) == ["segment", "make", "render", "save"]
+
+    def test_cache_hit(self):
+        """Test that a cache hit reports only the lookup and the write."""
+        generator = self.generator(cache=RenderCache())
+        generator.generate_qr_code("cached")
+        generator.generate_qr_code("cached")
+
+        first, second = self.records
+        assert list(first.stages) == ["cache", "segment", "make", "render", "save"]
+        assert not first.cached and first.version == 1
+        assert list(second.stages) == ["cache", "save"]
+        assert second.cached and second.version is None
+
+    def test_in_memory_methods(self):
+        """Test generate_qr_bytes() and generate_qr_image()."""
+        generator = self.generator()
+        generator.generate_qr_bytes("bytes")
+        generator.generate_qr_image("image")
+
+        assert [list(record.stages) for record in self.records] == [
+            ["segment", "make", "render"], ["segment", "make", "render"]]
+
+    def test_batch_reports_successful_items(self):
+        """Test that generate_qr_codes() reports each successful item."""
+        results = list(self.generator().generate_qr_codes(["a", "x" * 5000, "b"]))
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert len(self.records) == 2
+        for record in self.records:
+            assert list(record.stages) == ["segment", "make", "render", "save"]
+            assert record.total == pytest.approx(sum(record.stages.values()))
+
+    def test_disabled_by_default(self):
+        """Test that no clock is started without an observer."""
+        generator = QRCodeGenerator(output_folder=None)
+        assert generator.observer is None
+        assert generator._start_clock() is None
+        assert generator.generate_qr_bytes("plain")[:4] == b"\x89PNG"
+
+
+class TestMetricsCollector:
+    """Test class for Histogram and MetricsCollector."""
+
+    def test_histogram_buckets(self):
+        """Test Prometheus bucket semantics (upper bounds are inclusive)."""
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 7):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [(1, 2), (5, 3), (float("inf"), 4)]
+        assert histogram.to_dict()["mean"] == pytest.approx(2.875)
+
+    def test_stage_clock_accumulates(self):
+        """Test that repeated laps of a stage add up."""
+        clock = StageClock()
+        clock.lap("render")
+        clock.lap("render")
+        assert list(clock.stages) == ["render"]
+        record = clock.timings("é", 3, "PNG")
+        assert record.payload_size == 2 and record.version == 3
+
+    def test_stage_clock_charge(self):
+        """Test that charged seconds count in the stages and the total, idle time not."""
+        clock = StageClock()
+        time.sleep(0.01)
+        clock.charge("make", 0.5)
+        record = clock.timings("x", 1, "PNG")
+        assert record.stages == {"make": 0.5}
+        assert record.total == pytest.approx(0.5)
+
+    def test_snapshot_and_json(self):
+        """Test the aggregated snapshot and its JSON form."""
+        metrics = MetricsCollector()
+        metrics(timings({"segment": 0.00005, "make": 0.002}))
+        metrics(timings({"segment": 0.00007, "make": 0.003}, version=5, payload_size=300))
+        metrics(timings({"cache": 0.00001}, cached=True))
+
+        snapshot = metrics.snapshot()
+        assert snapshot["codes"] == 3
+        assert snapshot["cache_hits"] == 1
+        assert snapshot["versions"] == {"2": 1, "5": 1}
+        assert snapshot["stages"]["make"]["count"] == 2
+        assert snapshot["stages"]["make"]["buckets"]["0.0025"] == 1
+        assert snapshot["stages"]["make"]["buckets"]["+Inf"] == 2
+        assert snapshot["payload_bytes"]["buckets"]["256"] == 2
+        assert json.loads(metrics.to_json()) == snapshot
+
+        metrics.reset()
+        assert metrics.snapshot()["codes"] == 0
+
+    def test_prometheus_format(self):
+        """Test the text exposition format."""
+        metrics = MetricsCollector(duration_buckets=(0.001, 0.01), namespace="app")
+        metrics(timings({"make": 0.002}))
+        lines = metrics.to_prometheus().splitlines()
+
+        assert "# TYPE app_stage_duration_seconds histogram" in lines
+        assert 'app_stage_duration_seconds_bucket{stage="make",le="0.001"} 0' in lines
+        assert 'app_stage_duration_seconds_bucket{stage="make",le="0.01"} 1' in lines
+        assert 'app_stage_duration_seconds_bucket{stage="make",le="+Inf"} 1' in lines
+        assert 'app_stage_duration_seconds_count{stage="make"} 1' in lines
+        assert "app_duration_seconds_count 1" in lines
+        assert 'app_codes_total{version="2"} 1' in lines
+        assert "app_cache_hits_total 0" in lines
+        samples = [line for line in lines if line and not line.startswith("#")]
+        assert all(len(line.split(" ")) == 2 for line in samples)
+
+    def test_shared_between_threads(self):
+        """Test one collector observing several generators concurrently."""
+        metrics = MetricsCollector()
+
+        def work():
+            generator = QRCodeGenerator(output_folder=None, observer=metrics)
+            for index in range(20):
+                generator.generate_qr_bytes(f"item-{index}")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["codes"] == 80
+        assert snapshot["stages"]["make"]["count"] == 80
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,148 @@
+"""
+Tests for the per-version matrix templates.
+"""
+
+import random
+import string
+import sys
+from pathlib import Path
+import pytest
+import qrcode
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import masks
+from qrcodegenpy_shankonduru.reed_solomon import create_data, create_data_batch
+from qrcodegenpy_shankonduru.segments import segment_for_version
+from qrcodegenpy_shankonduru.templates import VersionTemplate, get_template
+
+numpy = pytest.importorskip("numpy")
+
+
+def reference_qr(data_list, version, error_correction, mask_pattern):
+    """Build the matrix with qrcode's own makeImpl()."""
+    qr = qrcode.QRCode(version=version, error_correction=error_correction,
+                       mask_pattern=mask_pattern)
+    qr.data_list = data_list
+    qr.make(fit=False)
+    return qr
+
+
+class TestVersionTemplate:
+    """Test class for VersionTemplate."""
+
+    @pytest.mark.parametrize("version", range(1, 41))
+    def test_layout_matches_qrcode(self, version):
+        """Test the data area and module count against qrcode's map_data()."""
+        template = get_template(version)
+        qr = qrcode.QRCode(version=version)
+        qr.add_data("")
+        qr.makeImpl(True, 0)
+
+        assert template.size == qr.modules_count
+        codewords = len(qr.data_cache)
+        assert codewords * 8 <= template.data_capacity < codewords * 8 + 8
+        assert template.data_area.sum() == template.data_capacity
+        assert not template.modules[template.data_area].any()
+
+    @pytest.mark.parametrize("version", [1, 2, 6, 7, 14, 27, 40])
+    def test_place_matches_map_data(self, version):
+        """Test that placing codewords and masking equals makeImpl() for each mask."""
+        rng = random.Random(version)
+        template = get_template(version)
+        for error_correction in range(4):
+            text = "".join(rng.choice(string.ascii_letters) for _ in range(version * 3))
+            data_list, _ = segment_for_version(text, error_correction, version)
+            codewords = create_data(version, error_correction, data_list)
+            mask_pattern = rng.randrange(8)
+
+            matrix = template.place(codewords)
+            matrix ^= masks._mask_stack(template.size)[mask_pattern] & template.data_area
+            template.finish(matrix, error_correction, mask_pattern)
+
+            reference = reference_qr(data_list, version, error_correction, mask_pattern)
+            assert matrix.tolist() == reference.modules
+
+    def test_place_does_not_modify_template(self):
+        """Test that placing returns a copy and the template is read-only."""
+        template = get_template(3)
+        before = template.modules.copy()
+        template.place([255] * 70)
+        assert (template.modules == before).all()
+        with pytest.raises(ValueError):
+            template.modules[0, 0] = False
+
+    def test_place_batch(self):
+        """Test that place_batch() equals placing each code separately."""
+        template = get_template(8)
+        rng = random.Random(4)
+        codeword_lists = [[rng.randrange(256) for _ in range(242)] for _ in range(6)]
+        matrices = template.place_batch(codeword_lists)
+        assert matrices.shape == (6, template.size, template.size)
+        for matrix, codewords in zip(matrices, codeword_lists):
+            assert (matrix == template.place(codewords)).all()
+
+    def test_templates_are_cached(self):
+        """Test that get_template() returns one shared instance per version."""
+        assert get_template(12) is get_template(12)
+        assert get_template(12) is not get_template(13)
+
+    @pytest.mark.parametrize("version", [0, 41])
+    def test_invalid_version(self, version):
+        """Test that versions outside 1-40 are rejected."""
+        with pytest.raises(ValueError):
+            VersionTemplate(version)
+
+
+class TestMakeMatrices:
+    """Test class for make_with_mask() and make_matrices()."""
+
+    @pytest.mark.parametrize("mask_pattern", range(8))
+    def test_make_with_mask(self, mask_pattern):
+        """Test that a pinned mask gives qrcode's matrix."""
+        qr = qrcode.QRCode(version=9, error_correction=qrcode.constants.ERROR_CORRECT_Q)
+        qr.add_data("https://example.com/pinned")
+        assert masks.make_with_mask(qr, mask_pattern) == mask_pattern
+
+        reference = reference_qr(qr.data_list, 9, qrcode.constants.ERROR_CORRECT_Q,
+                                 mask_pattern)
+        assert qr.modules == reference.modules
+        assert qr.modules_count == reference.modules_count
+
+    @pytest.mark.parametrize("mask_pattern", [None, 6])
+    def test_batch_matches_qrcode(self, mask_pattern):
+        """Test that a batch of same-version codes equals qrcode, code by code."""
+        version, error_correction = 10, qrcode.constants.ERROR_CORRECT_M
+        data_lists = [segment_for_version(f"https://example.com/item/{i * 7919}",
+                                          error_correction, version)[0] for i in range(30)]
+        codeword_lists = create_data_batch(version, error_correction, data_lists)
+
+        matrices, patterns = masks.make_matrices(version, error_correction, codeword_lists,
+                                                 mask_pattern)
+
+        assert len(patterns) == 30
+        for data_list, matrix, pattern in zip(data_lists, matrices, patterns):
+            reference = reference_qr(data_list, version, error_correction, mask_pattern)
+            assert matrix.tolist() == reference.modules
+            if mask_pattern is not None:
+                assert pattern == mask_pattern
+
+    def test_batch_scored_in_chunks(self, monkeypatch):
+        """Test that scoring the candidates chunk by chunk picks each code's own mask."""
+        version, error_correction = 4, qrcode.constants.ERROR_CORRECT_L
+        data_lists = [segment_for_version(f"chunk-{i * 31}", error_correction, version)[0]
+                      for i in range(25)]
+        codeword_lists = create_data_batch(version, error_correction, data_lists)
+        monkeypatch.setattr(masks, "_CANDIDATE_MODULES", 8 * 33 * 33 * 4)
+
+        matrices, patterns = masks.make_matrices(version, error_correction, codeword_lists)
+
+        assert len(patterns) == 25
+        for data_list, matrix in zip(data_lists, matrices):
+            reference = reference_qr(data_list, version, error_correction, None)
+            assert matrix.tolist() == reference.modules
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,157 @@
+"""
+Tests for the SVG and PDF vector writers and the image_format option.
+"""
+
+import os
+import re
+import sys
+import tempfile
+import shutil
+import xml.etree.ElementTree as ET
+from io import StringIO
+from unittest.mock import patch
+import pytest
+import qrcode
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from qrcodegenpy_shankonduru import QRCodeGenerator, RenderCache
+from qrcodegenpy_shankonduru.cli import cli
+from qrcodegenpy_shankonduru.vector import dark_runs, render_pdf, render_svg
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+def make_modules(data):
+    qr = qrcode.QRCode()
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.modules
+
+
+def modules_from_svg_path(d, size, border):
+    """Rebuild the module matrix from the merged SVG path."""
+    matrix = [[False] * size for _ in range(size)]
+    for x, y, length in re.findall(r"M(\d+) (\d+)h(\d+)v1h-\3z", d):
+        for col in range(int(x) - border, int(x) - border + int(length)):
+            matrix[int(y) - border][col] = True
+    return matrix
+
+
+class TestVectorWriters:
+    """Test class for dark_runs(), render_svg() and render_pdf()."""
+
+    def test_dark_runs(self):
+        """Test horizontal run-length merging."""
+        modules = [
+            [True, True, False, True],
+            [False, False, False, False],
+            [False, True, True, True],
+        ]
+        assert list(dark_runs(modules)) == [(0, 0, 2), (0, 3, 1), (2, 1, 3)]
+
+    @pytest.mark.parametrize("data", ["A", "https://www.example.com", "Z" * 300])
+    def test_svg_path_reproduces_modules(self, data):
+        """Test that the merged path covers exactly the dark modules."""
+        modules = make_modules(data)
+        root = ET.fromstring(render_svg(modules, box_size=10, border=4))
+
+        size = len(modules) + 8
+        assert root.get("viewBox") == f"0 0 {size} {size}"
+        assert root.get("width") == str(size * 10)
+        paths = root.findall(f"{SVG_NS}path")
+        assert len(paths) == 1
+        assert modules_from_svg_path(paths[0].get("d"), len(modules), 4) == modules
+
+    def test_svg_is_smaller_than_per_module_output(self):
+        """Test that run merging emits fewer rectangles than dark modules."""
+        modules = make_modules("https://www.example.com/" * 10)
+        dark = sum(map(sum, modules))
+        svg = render_svg(modules)
+        assert svg.count("M") < dark
+
+    def test_svg_colors_and_transparency(self):
+        """Test custom colors and a transparent background."""
+        modules = make_modules("colors")
+        root = ET.fromstring(render_svg(modules, fill_color=(255, 0, 0),
+                                        back_color="transparent"))
+        assert root.find(f"{SVG_NS}rect") is None
+        assert root.find(f"{SVG_NS}path").get("fill") == "rgb(255,0,0)"
+
+    def test_pdf_structure(self):
+        """Test that the PDF has a valid header, xref offset and page size."""
+        modules = make_modules("pdf")
+        pdf = render_pdf(modules, box_size=2, border=4)
+
+        assert pdf.startswith(b"%PDF-1.4")
+        assert pdf.rstrip().endswith(b"%%EOF")
+        startxref = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+        assert pdf[startxref:startxref + 4] == b"xref"
+        page = (len(modules) + 8) * 2
+        assert f"/MediaBox [0 0 {page} {page}]".encode() in pdf
+        assert pdf.count(b" re\n") + pdf.count(b" re f") >= 1
+
+    def test_pdf_rects_match_runs(self):
+        """Test that every dark run becomes one rectangle."""
+        modules = make_modules("runs")
+        pdf = render_pdf(modules, back_color="transparent")
+        assert pdf.count(b" re") == len(list(dark_runs(modules)))
+
+
+class TestVectorFormatOption:
+    """Test class for image_format on QRCodeGenerator and the CLI."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.test_dir = tempfile.mkdtemp()
+        self.test_output_folder = os.path.join(self.test_dir, "vector_output")
+
+    def teardown_method(self):
+        """Clean up after each test method."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    @pytest.mark.parametrize("image_format, extension, signature", [
+        ("svg", ".svg", b"<?xml"),
+        ("PDF", ".pdf", b"%PDF"),
+        ("png", ".png", b"\x89PNG"),
+    ])
+    def test_generate_qr_code_formats(self, image_format, extension, signature):
+        """Test that the chosen format drives file extension and content."""
+        generator = QRCodeGenerator("vec", self.test_output_folder, image_format=image_format)
+        path = generator.generate_qr_code("https://www.example.com")
+
+        assert path.endswith(extension)
+        with open(path, "rb") as file:
+            assert file.read().startswith(signature)
+
+    def test_generate_qr_bytes_svg(self):
+        """Test in-memory SVG output through the cache."""
+        cache = RenderCache()
+        generator = QRCodeGenerator("vec", self.test_output_folder, image_format="SVG",
+                                    cache=cache)
+        first = generator.generate_qr_bytes("cached svg")
+        assert first == generator.generate_qr_bytes("cached svg")
+        assert first.startswith(b"<?xml")
+        assert cache.stats().hits == 1
+
+    def test_unsupported_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError):
+            QRCodeGenerator("vec", self.test_output_folder, image_format="gif")
+
+    def test_cli_format_flag(self):
+        """Test qrgen --format svg."""
+        captured_output = StringIO()
+        with patch('sys.stdout', captured_output):
+            cli(["hello", "--output", self.test_output_folder, "--format", "svg"])
+
+        files = os.listdir(self.test_output_folder)
+        assert len(files) == 1 and files[0].endswith(".svg")
+
+
+if __name__ == "__main__":
+    # Run the tests if this file is executed directly
+    pytest.main([__file__, "-v"])